@@ -0,0 +1,262 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import record_cache_lookup
+
+# media types worth compressing, everything else (images, archives, ...) is passed through
+COMPRESSIBLE_MEDIA_TYPES = {
+    "application/json",
+    "application/ld+json",
+    "application/n-triples",
+    "application/xml",
+    "application/msgpack",
+    "application/cbor",
+    "application/javascript",
+    "application/graphql-response+json",
+}
+
+
+class GzipCompressor:
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        # flushed per chunk so streamed concepts reach the client without waiting for the next one
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int = 4):
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int = 3):
+        import zstandard
+
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# content coding -> (compressor, module it depends on)
+COMPRESSORS = {
+    "gzip": (GzipCompressor, None),
+    "br": (BrotliCompressor, "brotli"),
+    "zstd": (ZstdCompressor, "zstandard"),
+}
+
+
+def available_encodings(preferred: Iterable[str]) -> List[str]:
+    """Filters the preferred content codings down to the ones whose compression library is installed."""
+    encodings = []
+    for encoding in preferred:
+        encoding = encoding.strip().lower()
+        if encoding not in COMPRESSORS:
+            continue
+        _, module = COMPRESSORS[encoding]
+        if module is not None:
+            try:
+                __import__(module)
+            except ImportError:
+                continue
+        encodings.append(encoding)
+    return encodings
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    compressor = COMPRESSORS[encoding][0]()
+    return compressor.compress(data) + compressor.finish()
+
+
+def parse_accept_encoding(accept_encoding: Optional[str]) -> Dict[str, float]:
+    weights = {}
+    for part in (accept_encoding or "").split(","):
+        coding, *params = [token.strip() for token in part.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding.lower()] = quality
+    return weights
+
+
+def select_content_encoding(accept_encoding: Optional[str], encodings: List[str]) -> Optional[str]:
+    """Picks the content coding with the highest client quality, ties are broken by the server preference."""
+    weights = parse_accept_encoding(accept_encoding)
+    selected, selected_quality = None, 0.0
+    for encoding in encodings:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > selected_quality:
+            selected, selected_quality = encoding, quality
+    return selected
+
+
+class CompressionCache:
+    """
+    Content addressed LRU cache of compressed bodies. Hashing a body is much cheaper than compressing it,
+    so hot representations are compressed once and then served from memory.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[Tuple[str, bytes], bytes] = OrderedDict()
+
+    def get_or_compress(self, body: bytes, encoding: str) -> bytes:
+        if self.max_bytes <= 0:
+            return compress(body, encoding)
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self._entries.get(key)
+        record_cache_lookup("compression", compressed is not None)
+        if compressed is not None:
+            self._entries.move_to_end(key)
+            return compressed
+        compressed = compress(body, encoding)
+        if len(compressed) > self.max_bytes:
+            return compressed
+        self._entries[key] = compressed
+        self.size += len(compressed)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+        return compressed
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_MEDIA_TYPES
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with gzip, brotli or zstd depending on the Accept-Encoding of the request.
+    Complete bodies below `minimum_size` are sent as they are, streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Iterable[str] = ("br", "zstd", "gzip"),
+        cache_bytes: int = 0,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings(encodings)
+        self.cache = CompressionCache(cache_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_content_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(send, encoding, self.minimum_size, self.cache)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int, cache: CompressionCache):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            # held back until the first body chunk tells whether the response is worth compressing
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        if self.compressor is not None:
+            body = self.compressor.compress(message.get("body", b""))
+            if not message.get("more_body", False):
+                body += self.compressor.finish()
+            await self._send({"type": "http.response.body", "body": body, "more_body": message.get("more_body", False)})
+            return
+
+        headers = MutableHeaders(scope=self.start_message)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if "content-encoding" in headers or not is_compressible(headers.get("content-type")):
+            self.passthrough = True
+        elif not more_body and len(body) < self.minimum_size:
+            self.passthrough = True
+        if self.passthrough:
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+            self.compressor = COMPRESSORS[self.encoding][0]()
+            body = self.compressor.compress(body)
+        else:
+            body = self.cache.get_or_compress(body, self.encoding)
+            headers["Content-Length"] = str(len(body))
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
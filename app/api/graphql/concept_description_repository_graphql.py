@@ -2,6 +2,7 @@ import json
 
 from ariadne import QueryType, make_executable_schema
 from ariadne.asgi import GraphQL
+from ariadne.asgi.handlers import GraphQLHTTPHandler
 from ariadne.explorer import ExplorerGraphiQL
 from fastapi import FastAPI
 from ariadne import ObjectType, make_executable_schema
@@ -11,6 +12,7 @@ import os
 
 from app.models.response import APIException
 from app.repository import get_repository
+from app.tracing import graphql_extensions
 from app.models import base_64_url_encode
 
 type_defs = """
@@ -334,5 +336,6 @@ default_graphql_query = """# AAS Brain Concept Description GraphQL Endpoint
 router = GraphQL(
     schema,
     debug=True,
+    http_handler=GraphQLHTTPHandler(extensions=graphql_extensions),
     explorer=ExplorerGraphiQL(title="AAS Brain GraphQL", default_query=default_graphql_query),
 )
@@ -0,0 +1,44 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import importlib
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class LazyApp:
+    """
+    Imports the ASGI app `module:attribute` with its first request, so that mounting it does not delay the startup
+    of the process by the imports and the setup of the app.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.app: ASGIApp = None
+
+    def load(self) -> ASGIApp:
+        if self.app is None:
+            module, _, attribute = self.path.partition(":")
+            self.app = getattr(importlib.import_module(module), attribute)
+        return self.app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await self.load()(scope, receive, send)
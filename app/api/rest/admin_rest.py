@@ -0,0 +1,67 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import hmac
+import threading
+from typing import Optional
+
+import fastapi
+from fastapi import APIRouter, Depends, Header, Query
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_config
+from app.models.response import OperationNotAllowedException, ProfilingInProgressException
+from app.profiler import SamplingProfiler
+
+
+async def require_admin(authorization: Optional[str] = Header(None)):
+    token = get_config().admin_token
+    if not token or not authorization or not hmac.compare_digest(authorization, f"Bearer {token}"):
+        raise OperationNotAllowedException()
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+# the stacks of all threads are sampled, so parallel profiles would count each other
+_profiling = threading.Lock()
+
+
+@router.get(
+    "/profile",
+    description="Samples the stacks of all threads for the given seconds and returns them in the collapsed stack "
+    "format of flamegraph.pl and speedscope. Requires the admin token as bearer token.",
+)
+async def record_profile(
+    seconds: float = Query(10.0, gt=0), interval: float = Query(0.005, ge=0.001, le=1.0)
+) -> fastapi.Response:
+    if not _profiling.acquire(blocking=False):
+        raise ProfilingInProgressException()
+    try:
+        profiler = SamplingProfiler(interval)
+        profiler.start()
+        await asyncio.sleep(min(seconds, get_config().profiler_max_seconds))
+        collapsed = await run_in_threadpool(profiler.stop)
+    finally:
+        _profiling.release()
+    return fastapi.Response(
+        content=collapsed, media_type="text/plain", headers={"X-Profile-Samples": str(profiler.samples)}
+    )
@@ -30,6 +30,7 @@
 #   to the following conditions:
 #
 #
+import asyncio
 import json
 from typing import Optional, List
 
@@ -40,35 +41,137 @@ from fastapi.openapi.docs import get_redoc_html
 from rdflib import Graph
 
 from app.models.aas_namespace import AASNameSpace
-from app.models.asset_administraion_shell import AssetAdministrationShell
 from app.models.concept_description import ConceptDescription
 from app.models.response import (
     GetConceptDescriptionsResult,
+    GetConceptDescriptionVersionsResult,
+    GetChangeEventsResult,
+    ChangeEvent,
     Result,
     ServiceDescription,
     DatabaseConnectionException,
     ConceptNotFoundException,
 )
-from app.models.submodel import Submodel
 from app.repository import ConceptDescriptionRepository, get_repository
 from fastapi import Depends, FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 router = APIRouter()
 
 
-@router.get("/concept-descriptions/{cdIdentifier}/history", tags=["Extra"])
+@router.get(
+    "/concept-descriptions/{cdIdentifier}/history",
+    response_model=GetConceptDescriptionVersionsResult,
+    response_model_exclude_none=True,
+    tags=["Extra"],
+)
 async def get_concept_description_history_metadata(
+    cdIdentifier: str = fastapi.Path(..., description="The Concept Description’s unique id (UTF8-BASE64-URL-encoded)"),
+    limit: Optional[int] = fastapi.Query(100, description="The maximum number of elements in the response array", ge=1),
+    cursor: Optional[str] = fastapi.Query(
+        None,
+        description="A server-generated identifier retrieved from pagingMetadata"
+        " that specifies from which position the result listing should continue",
+    ),
     cd_repository: ConceptDescriptionRepository = Depends(get_repository),
 ):
-    raise NotImplementedError("History endpoint not implemented.")
+    return await cd_repository.get_concept_description_versions(cdIdentifier, cursor=cursor, limit=limit)
 
 
-@router.get("/concept-descriptions/{cdIdentifier}/history/{version}", tags=["Extra"])
+@router.get(
+    "/concept-descriptions/{cdIdentifier}/history/{version}",
+    response_model=ConceptDescription,
+    response_model_exclude_none=True,
+    tags=["Extra"],
+)
 async def get_concept_description_history(
+    cdIdentifier: str = fastapi.Path(..., description="The Concept Description’s unique id (UTF8-BASE64-URL-encoded)"),
+    version: int = fastapi.Path(..., description="The version as listed in the history", ge=0),
+    cd_repository: ConceptDescriptionRepository = Depends(get_repository),
+):
+    return await cd_repository.get_concept_description_version(cdIdentifier, version)
+
+
+CHANGE_CURSOR_DESCRIPTION = "The sequence of the last event already seen, omitted to start at the oldest event retained"
+
+
+@router.get(
+    "/concept-descriptions:changes",
+    response_model=GetChangeEventsResult,
+    description="Pages through the change feed. The returned cursor is the sequence to continue after, it is"
+    " returned even if no events are available yet.",
+    tags=["Extra"],
+)
+async def get_concept_description_changes(
+    limit: Optional[int] = fastapi.Query(100, description="The maximum number of elements in the response array", ge=1),
+    cursor: Optional[str] = fastapi.Query(None, description=CHANGE_CURSOR_DESCRIPTION),
+    cd_repository: ConceptDescriptionRepository = Depends(get_repository),
+):
+    events = cd_repository.get_change_feed().read(cursor, limit)
+    next_cursor = events[-1].sequence if events else cursor or ""
+    return GetChangeEventsResult(paging_metadata={"cursor": next_cursor}, result=events)
+
+
+def _server_sent_event(event: ChangeEvent) -> bytes:
+    return f"id: {event.sequence}\nevent: {event.type.value}\ndata: {event.model_dump_json()}\n\n".encode("utf-8")
+
+
+@router.get(
+    "/concept-descriptions:stream",
+    response_class=StreamingResponse,
+    description="Streams the change feed as server-sent events. Reconnecting clients resume after the"
+    " `Last-Event-ID` header.",
+    tags=["Extra"],
+)
+async def stream_concept_description_changes(
+    request: fastapi.Request,
+    cursor: Optional[str] = fastapi.Query(None, description=CHANGE_CURSOR_DESCRIPTION),
+    last_event_id: Optional[str] = Header(None),
+    cd_repository: ConceptDescriptionRepository = Depends(get_repository),
+):
+    # backends without a change feed refuse before the stream starts
+    feed = cd_repository.get_change_feed()
+
+    async def events():
+        async for batch in feed.follow(last_event_id or cursor, is_closed=request.is_disconnected):
+            if not batch:
+                # comment line, keeps proxies from closing an idle connection
+                yield b": keep-alive\n\n"
+            for event in batch:
+                yield _server_sent_event(event)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.websocket("/concept-descriptions:watch")
+async def watch_concept_description_changes(
+    websocket: fastapi.WebSocket,
+    cursor: Optional[str] = None,
     cd_repository: ConceptDescriptionRepository = Depends(get_repository),
 ):
-    raise NotImplementedError("History endpoint not implemented.")
+    """Sends every event of the change feed as a JSON text message."""
+    feed = cd_repository.get_change_feed()
+    await websocket.accept()
+    closed = asyncio.Event()
+
+    async def receive_until_closed():
+        # clients do not send anything, but a disconnect is only noticed while receiving
+        try:
+            while True:
+                await websocket.receive_text()
+        except fastapi.WebSocketDisconnect:
+            closed.set()
+
+    async def is_closed() -> bool:
+        return closed.is_set()
+
+    receiver = asyncio.create_task(receive_until_closed())
+    try:
+        async for batch in feed.follow(cursor, is_closed=is_closed):
+            for event in batch:
+                await websocket.send_text(event.model_dump_json())
+    finally:
+        receiver.cancel()
 
 
 @router.get("/concept-descriptions/metadata", tags=["Extra"])
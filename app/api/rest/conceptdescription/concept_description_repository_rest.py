@@ -19,7 +19,6 @@
 #  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
 #  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-import json
 from typing import Optional
 
 import rdflib
@@ -39,11 +38,53 @@ from app.models.response import (
 )
 from app.repository import ConceptDescriptionRepository, get_repository
 from fastapi import Depends, FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.api.rest.content_negotiation import (
+    DOCUMENT_MEDIA_TYPES,
+    RDF_MEDIA_TYPES,
+    XML_MEDIA_TYPE,
+    ContentNegotiationRoute,
+    document_response,
+    get_accepted_media_type,
+    next_page_link,
+    serialize_rdf,
+    stream_concept_descriptions_as_rdf,
+)
+from app.metrics import observe_serialization
+from app.models.codec import BINARY_MEDIA_TYPES, encode_document
+from app.models.projection import parse_fields
+from app.models.xml_serializer import concept_description_to_xml, stream_concept_descriptions_as_xml
+from app.profiler import TimedRoute
+from app.tracing import span
 
 # TODO: Toooo long, refactor and break
 
-router = APIRouter()
+FIELDS_DESCRIPTION = (
+    "Comma separated paths of the properties to return, e.g. `id,embeddedDataSpecifications/dataSpecificationContent/unit`."
+    " Lists are traversed transparently. Only applies to JSON, MessagePack and CBOR representations."
+)
+
+
+class ConceptDescriptionRoute(TimedRoute, ContentNegotiationRoute):
+    # the timing wraps the content negotiation, so decoding XML, MessagePack and CBOR bodies counts as validation
+    pass
+
+
+router = APIRouter(route_class=ConceptDescriptionRoute)
+
+# Concept descriptions may also be posted as AAS XML or as MessagePack/CBOR encoded JSON documents,
+# they are validated against the JSON schema after decoding.
+CONCEPT_DESCRIPTION_REQUEST_BODY = {
+    "requestBody": {
+        "content": {
+            media_type: {"schema": {"$ref": "#/components/schemas/ConceptDescription"}}
+            for media_type in [XML_MEDIA_TYPE, *BINARY_MEDIA_TYPES]
+        },
+    }
+}
+
+BINARY_RESPONSE_CONTENT = {media_type: {} for media_type in BINARY_MEDIA_TYPES}
 
 
 @router.get(
@@ -51,8 +92,16 @@ router = APIRouter()
     summary="Returns all Concept Descriptions",
     responses={
         200: {
-            "description": "Requested Concept Descriptions",
+            "description": "Requested Concept Descriptions. RDF representations contain the concepts of the requested"
+            ' page, the cursor of the next page is provided in the `Link` header with `rel="next"`.',
             "model": GetConceptDescriptionsResult,
+            "content": {
+                **BINARY_RESPONSE_CONTENT,
+                XML_MEDIA_TYPE: {},
+                "text/turtle": {},
+                "application/n-triples": {},
+                "application/ld+json": {},
+            },
         },
         400: {
             "model": Result,
@@ -76,6 +125,7 @@ router = APIRouter()
     tags=["Concept Description API"],
 )
 async def get_concept_descriptions(
+    request: fastapi.Request,
     idShort: Optional[str] = fastapi.Query(None, description="The Concept Description’s IdShort"),
     isCaseOf: Optional[str] = fastapi.Query(None, description="IsCaseOf reference (UTF8-BASE64-URL-encoded)"),
     dataSpecificationRef: Optional[str] = fastapi.Query(
@@ -87,14 +137,25 @@ async def get_concept_descriptions(
         description="A server-generated identifier retrieved from pagingMetadata"
         " that specifies from which position the result listing should continue",
     ),
+    fields: Optional[str] = fastapi.Query(None, description=FIELDS_DESCRIPTION),
     cd_repository: ConceptDescriptionRepository = Depends(get_repository),
 ):
-    result = await cd_repository.get_concept_descriptions(
-        query={"idShort": idShort, "isCaseOf": isCaseOf, "dataSpecificationRef": dataSpecificationRef},
-        cursor=cursor,
-        limit=limit,
-    )
-    return JSONResponse(json.loads(result.model_dump_json(exclude_none=True)), status_code=200)
+    query = {"idShort": idShort, "isCaseOf": isCaseOf, "dataSpecificationRef": dataSpecificationRef}
+    media_type = get_accepted_media_type(request, [*DOCUMENT_MEDIA_TYPES, XML_MEDIA_TYPE, *RDF_MEDIA_TYPES])
+    if fields and media_type in DOCUMENT_MEDIA_TYPES:
+        result = await cd_repository.get_concept_descriptions_projected(
+            query=query, projection=parse_fields(fields), cursor=cursor, limit=limit
+        )
+        return document_response(result, media_type)
+    result = await cd_repository.get_concept_descriptions(query=query, cursor=cursor, limit=limit)
+    if media_type in DOCUMENT_MEDIA_TYPES:
+        return document_response(result, media_type)
+    if media_type == XML_MEDIA_TYPE:
+        content = stream_concept_descriptions_as_xml(result.result or [])
+    else:
+        content = stream_concept_descriptions_as_rdf(result.result or [], media_type)
+    link = next_page_link(request, result.paging_metadata.cursor)
+    return StreamingResponse(content, media_type=media_type, headers={"Link": link} if link else None, status_code=200)
 
 
 @router.post(
@@ -104,6 +165,7 @@ async def get_concept_descriptions(
         201: {
             "model": ConceptDescription,
             "description": "Concept Description created successfully",
+            "content": BINARY_RESPONSE_CONTENT,
         },
         400: {
             "model": Result,
@@ -120,17 +182,21 @@ async def get_concept_descriptions(
             "description": "Default error handling for unmentioned status codes",
         },
     },
-    openapi_extra={"x-semanticIds": ["https://admin-shell.io/aas/API/PostConceptDescription/3/0"]},
+    openapi_extra={
+        "x-semanticIds": ["https://admin-shell.io/aas/API/PostConceptDescription/3/0"],
+        **CONCEPT_DESCRIPTION_REQUEST_BODY,
+    },
     tags=["Concept Description API"],
 )
 async def post_concept_description(
+    request: fastapi.Request,
     concept_description: ConceptDescription = fastapi.Body(
         ..., description="Concept Description object", examples=[{"id": "MyConcept", "modelType": "ConceptDescription"}]
     ),
     cd_repository: ConceptDescriptionRepository = Depends(get_repository),
 ):
     result = await cd_repository.add_concept_description(concept_description)
-    return JSONResponse(json.loads(result.model_dump_json(exclude_none=True)), status_code=201)
+    return document_response(result, get_accepted_media_type(request, DOCUMENT_MEDIA_TYPES), status_code=201)
 
 
 @router.get(
@@ -142,6 +208,7 @@ async def post_concept_description(
             "description": "Requested Concept Description",
             "content": {
                 "application/json": {"example": ConceptDescription(id="something_8ccad77f")},
+                **BINARY_RESPONSE_CONTENT,
                 "application/ld+json": {
                     "example": [
                         {
@@ -161,8 +228,7 @@ async def post_concept_description(
                 """,
                     "schema": {"type": "object", "format": "xml", "xml": {"name": "conceptDescription"}},
                 },
-                "text/turtle": {
-                    "example": """@prefix aas: <https://admin-shell.io/aas/3/0/> .
+                "text/turtle": {"example": """@prefix aas: <https://admin-shell.io/aas/3/0/> .
 @prefix owl: <http://www.w3.org/2002/07/owl#> .
 @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
 @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
@@ -171,8 +237,7 @@ async def post_concept_description(
 <something_8ccad77f> rdf:type aas:ConceptDescription ;
     <https://admin-shell.io/aas/3/0/Identifiable/id> "something_8ccad77f"^^xs:string ;
 .
-                    """
-                },
+                    """},
             },
         },
         400: {
@@ -193,24 +258,25 @@ async def post_concept_description(
 async def get_concept_description(
     request: fastapi.Request,
     cdIdentifier: str = fastapi.Path(..., description="The Concept Description’s unique id (UTF8-BASE64-URL-encoded)"),
+    fields: Optional[str] = fastapi.Query(None, description=FIELDS_DESCRIPTION),
     cd_repository: ConceptDescriptionRepository = Depends(get_repository),
 ):
-    content_type = request.headers.get("accept")
-    result = await cd_repository.get_concept_description(cdIdentifier)
-    if content_type == "application/ld+json":
-        g, _ = result.to_rdf()
-        return fastapi.Response(
-            content=g.serialize(format="json-ld", encoding="utf-8"), media_type="application/ld+json", status_code=200
-        )
-    if content_type == "text/turtle":
-        g, _ = result.to_rdf()
+    content_type = get_accepted_media_type(request, [*DOCUMENT_MEDIA_TYPES, XML_MEDIA_TYPE, *RDF_MEDIA_TYPES])
+    if fields and content_type in DOCUMENT_MEDIA_TYPES:
+        document = await cd_repository.get_concept_description_projected(cdIdentifier, parse_fields(fields))
         return fastapi.Response(
-            content=g.serialize(format="turtle_custom", encoding="utf-8"), media_type="text/turtle", status_code=200
+            content=encode_document(document, content_type), media_type=content_type, status_code=200
         )
-    if content_type == "application/xml":
-        raise NotImplementedError("XML serialization not supported")
-    result = result.model_dump_json(exclude_none=True)
-    return JSONResponse(json.loads(result), status_code=200)
+    if content_type in DOCUMENT_MEDIA_TYPES:
+        # served as stored where possible, without validating the document again
+        content = await cd_repository.get_concept_description_encoded(cdIdentifier, content_type)
+        return fastapi.Response(content=content, media_type=content_type, status_code=200)
+    result = await cd_repository.get_concept_description(cdIdentifier)
+    if content_type in RDF_MEDIA_TYPES:
+        return fastapi.Response(content=serialize_rdf(result, content_type), media_type=content_type, status_code=200)
+    with observe_serialization(XML_MEDIA_TYPE), span("serialize", media_type=XML_MEDIA_TYPE):
+        content = concept_description_to_xml(result)
+    return fastapi.Response(content=content, media_type=XML_MEDIA_TYPE, status_code=200)
 
 
 @router.put(
@@ -231,7 +297,10 @@ async def get_concept_description(
             "description": "Default error handling for unmentioned status codes",
         },
     },
-    openapi_extra={"x-semanticIds": ["https://admin-shell.io/aas/API/PutConceptDescriptionById/3/0"]},
+    openapi_extra={
+        "x-semanticIds": ["https://admin-shell.io/aas/API/PutConceptDescriptionById/3/0"],
+        **CONCEPT_DESCRIPTION_REQUEST_BODY,
+    },
     tags=["Concept Description API"],
 )
 async def update_concept_description(
@@ -239,7 +308,8 @@ async def update_concept_description(
     concept_description: ConceptDescription = fastapi.Body(..., description="Concept Description object"),
     cd_repository: ConceptDescriptionRepository = Depends(get_repository),
 ):
-    return cd_repository.update_concept_description(cdIdentifier, concept_description)
+    await cd_repository.update_concept_description(cdIdentifier, concept_description)
+    return fastapi.Response(status_code=204)
 
 
 @router.delete(
@@ -0,0 +1,180 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from typing import Iterable, Iterator, List, Optional
+
+import fastapi
+from fastapi.routing import APIRoute
+
+from pydantic import BaseModel
+
+from app.config import get_config
+from app.metrics import observe_serialization
+from app.models.codec import (
+    BINARY_MEDIA_TYPES,
+    CBOR_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    decode_cbor,
+    decode_msgpack,
+    encode_model,
+)
+from app.models.concept_description import ConceptDescription
+from app.models.response import InvalidPayloadException
+from app.models.serializer import write_rdf
+from app.models.xml_serializer import concept_description_document_from_xml
+from app.tracing import span
+
+XML_MEDIA_TYPE = "application/xml"
+
+# media types of plain documents, i.e. the JSON document and its binary encodings
+DOCUMENT_MEDIA_TYPES = [JSON_MEDIA_TYPE, *BINARY_MEDIA_TYPES]
+
+# media type -> rdflib serializer plugin name
+RDF_MEDIA_TYPES = {
+    "text/turtle": "turtle_custom",
+    "application/n-triples": "nt",
+    "application/ld+json": "json-ld",
+}
+
+# media type -> RDFWriter format
+RDF_WRITER_FORMATS = {"text/turtle": "turtle", "application/n-triples": "nt"}
+
+
+def parse_accept_header(accept: Optional[str]) -> List[str]:
+    """Returns the media types of an Accept header ordered by their quality value."""
+    if not accept:
+        return []
+    weighted = []
+    for position, part in enumerate(accept.split(",")):
+        media_range, *params = [token.strip() for token in part.split(";")]
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            weighted.append((-quality, position, media_range.lower()))
+    return [media_range for _, _, media_range in sorted(weighted)]
+
+
+def get_accepted_media_type(request: fastapi.Request, supported: Iterable[str], default: str = JSON_MEDIA_TYPE) -> str:
+    """Picks the best supported media type for the request, `default` for wildcards or a missing header."""
+    accepted = parse_accept_header(request.headers.get("accept"))
+    if not accepted:
+        return default
+    supported = list(supported)
+    for media_range in accepted:
+        if media_range in supported:
+            return media_range
+        if media_range in ("*/*", "application/*") and default in supported:
+            return default
+    return default
+
+
+def document_response(model: BaseModel, media_type: str, status_code: int = 200) -> fastapi.Response:
+    with observe_serialization(media_type), span("serialize", media_type=media_type):
+        content = encode_model(model, media_type)
+    return fastapi.Response(content=content, media_type=media_type, status_code=status_code)
+
+
+def serialize_rdf(concept: ConceptDescription, media_type: str, bnode_prefix: str = "b") -> bytes:
+    # N-Triples has no relative IRIs, so the concept is minted in the configured semantic namespace.
+    base_uri = get_config().semantic_namespace if media_type == "application/n-triples" else ""
+    with observe_serialization(media_type), span("serialize", media_type=media_type):
+        if media_type in RDF_WRITER_FORMATS and get_config().rdf_serializer == "direct":
+            return write_rdf(concept, RDF_WRITER_FORMATS[media_type], bnode_prefix, base_uri=base_uri)
+        with span("to_rdf"):
+            graph, _ = concept.to_rdf(base_uri=base_uri)
+        return graph.serialize(format=RDF_MEDIA_TYPES[media_type], encoding="utf-8")
+
+
+def stream_concept_descriptions_as_rdf(concepts: Iterable[ConceptDescription], media_type: str) -> Iterator[bytes]:
+    """
+    Serializes every concept into its own small graph and yields the chunks one after another.
+    Concatenated Turtle and N-Triples documents are still valid documents, JSON-LD node objects
+    are collected into one top level array.
+    """
+    if media_type != "application/ld+json":
+        # every chunk labels its blank nodes apart, otherwise the nodes of different concepts would be merged
+        for index, concept in enumerate(concepts):
+            yield serialize_rdf(concept, media_type, f"c{index}b")
+        return
+
+    separator = b""
+    yield b"["
+    for concept in concepts:
+        for node in json.loads(serialize_rdf(concept, media_type)):
+            yield separator + json.dumps(node).encode("utf-8")
+            separator = b","
+    yield b"]"
+
+
+def next_page_link(request: fastapi.Request, cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    return f'<{request.url.include_query_params(cursor=cursor)}>; rel="next"'
+
+
+# media type -> decoder of a request body into its JSON document
+BODY_DECODERS = {
+    XML_MEDIA_TYPE: concept_description_document_from_xml,
+    MSGPACK_MEDIA_TYPE: decode_msgpack,
+    CBOR_MEDIA_TYPE: decode_cbor,
+}
+
+
+async def transcode_request_body(request: fastapi.Request, decoder) -> fastapi.Request:
+    body = await request.body()
+    try:
+        document = decoder(body)
+    except Exception:
+        raise InvalidPayloadException()
+    scope = dict(request.scope)
+    scope["headers"] = [(name, value) for name, value in request.scope["headers"] if name != b"content-type"]
+    scope["headers"].append((b"content-type", JSON_MEDIA_TYPE.encode("latin-1")))
+    transcoded = fastapi.Request(scope, request.receive)
+    # FastAPI reads the cached document instead of parsing the body again
+    transcoded._body = body
+    transcoded._json = document
+    return transcoded
+
+
+class ContentNegotiationRoute(APIRoute):
+    """Decodes request bodies of the supported non JSON media types into their JSON document before validation."""
+
+    def get_route_handler(self):
+        route_handler = super().get_route_handler()
+
+        async def negotiated_route_handler(request: fastapi.Request):
+            content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+            decoder = BODY_DECODERS.get(content_type)
+            if decoder is not None:
+                request = await transcode_request_body(request, decoder)
+            return await route_handler(request)
+
+        return negotiated_route_handler
@@ -0,0 +1,110 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import List, Optional
+
+from app.config import get_config
+
+
+def _conversions():
+    # the Submodel and shell models take long to import, they are loaded with the first conversion
+    from app.models import rdf_conversion
+
+    return rdf_conversion
+
+
+class ConversionPool:
+    """
+    Runs RDF conversions in a bounded pool of worker processes, so large payloads neither block the event loop
+    nor hold the GIL of the API process. With zero workers conversions run inline, which is handy for debugging.
+    Submodels with more than `chunk_size` submodel elements are split and their chunks converted in parallel.
+    """
+
+    def __init__(self, workers: int, chunk_size: int = 500):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers > 0 and self._executor is None:
+            # spawned workers do not inherit the sockets and threads of the API process
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def run(self, func, *args):
+        if self.workers <= 0:
+            return func(*args)
+        executor = self.executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # a broken pool refuses all further work, the next conversion starts a new one
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    async def to_turtle(self, kind: str, payload: dict, bnode_prefix: str = "b") -> bytes:
+        elements = payload.get("submodelElements") if kind == "submodel" else None
+        if not elements or len(elements) <= self.chunk_size or self.workers <= 0:
+            return await self.run(_conversions().json_to_turtle, kind, payload, bnode_prefix)
+        header = {key: value for key, value in payload.items() if key != "submodelElements"}
+        chunks = [
+            self.run(
+                _conversions().submodel_elements_to_turtle,
+                payload.get("id"),
+                elements[start : start + self.chunk_size],
+                start,
+                f"{bnode_prefix}c{chunk}",
+            )
+            for chunk, start in enumerate(range(0, len(elements), self.chunk_size))
+        ]
+        # concatenated Turtle documents are one document as long as their blank node labels are distinct
+        return b"".join(
+            await asyncio.gather(self.run(_conversions().json_to_turtle, kind, header, bnode_prefix), *chunks)
+        )
+
+    async def to_json(self, kind: str, data: str) -> dict:
+        return await self.run(_conversions().turtle_to_json, kind, data)
+
+    async def batch_to_turtle(self, kind: str, payloads: List[dict]) -> bytes:
+        conversions = [self.to_turtle(kind, payload, f"d{idx}b") for idx, payload in enumerate(payloads)]
+        return b"".join(await asyncio.gather(*conversions))
+
+    async def batch_to_json(self, kind: str, documents: List[str]) -> List[dict]:
+        return list(await asyncio.gather(*[self.to_json(kind, data) for data in documents]))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+@lru_cache()
+def get_conversion_pool() -> ConversionPool:
+    config = get_config()
+    return ConversionPool(config.rdf_conversion_workers, config.rdf_conversion_chunk_size)
@@ -28,9 +28,6 @@ import fastapi
 from fastapi.openapi.docs import get_redoc_html
 from rdflib import Graph
 
-from app.models.aas_namespace import AASNameSpace
-from app.models.asset_administraion_shell import AssetAdministrationShell
-from app.models.concept_description import ConceptDescription
 from app.models.response import (
     GetConceptDescriptionsResult,
     Result,
@@ -38,23 +35,22 @@ from app.models.response import (
     DatabaseConnectionException,
     ConceptNotFoundException,
 )
-from app.models.submodel import Submodel
 from app.repository import ConceptDescriptionRepository, get_repository
 from fastapi import Depends, FastAPI
 from fastapi.responses import JSONResponse
 
+from app.api.rest.conversion_pool import ConversionPool, get_conversion_pool
+
 router = APIRouter()
 
 
 @router.post("/submodel:jsontordf", tags=["RDF"])
 async def convert_submodel_to_rdf(
     submodel=fastapi.Body(..., examples=[{"id": "MySubmodel", "modelType": "Submodel"}]),
+    pool: ConversionPool = Depends(get_conversion_pool),
 ):
-    payload = Submodel(**submodel)
-    graph, _ = payload.to_rdf()
-    return fastapi.Response(
-        content=graph.serialize(format="turtle_custom", encoding="utf-8"), media_type="text/turtle", status_code=200
-    )
+    content = await pool.to_turtle("submodel", submodel)
+    return fastapi.Response(content=content, media_type="text/turtle", status_code=200)
 
 
 @router.post("/submodel:rdftojson", tags=["RDF"])
@@ -66,24 +62,18 @@ async def convert_submodel_to_json(
             '@prefix aas: <https://admin-shell.io/aas/3/0/> . \n\n[] a aas:Submodel ;\n    <https://admin-shell.io/aas/3/0/Identifiable/id> "MySubmodel" .'
         ],
     ),
+    pool: ConversionPool = Depends(get_conversion_pool),
 ):
-    graph = rdflib.Graph().parse(data=submodel, format="turtle")
-    # Only consider the instance of ConceptDescription.
-    target: rdflib.URIRef = next(graph.subjects(predicate=rdflib.Graph, object=AASNameSpace.AAS["Submodel"]), None)
-    payload = Submodel.from_rdf(graph, target)
-    result = payload.model_dump_json(exclude_none=True)
-    return JSONResponse(json.loads(result), status_code=200)
+    return JSONResponse(await pool.to_json("submodel", submodel), status_code=200)
 
 
 @router.post("/concept-description:jsontordf", tags=["RDF"])
 async def convert_concept_description_to_rdf(
     concept=fastapi.Body(..., examples=[{"id": "MyConcept", "modelType": "ConceptDescription"}]),
+    pool: ConversionPool = Depends(get_conversion_pool),
 ):
-    payload = ConceptDescription(**concept)
-    graph, _ = payload.to_rdf()
-    return fastapi.Response(
-        content=graph.serialize(format="turtle_custom", encoding="utf-8"), media_type="text/turtle", status_code=200
-    )
+    content = await pool.to_turtle("concept-description", concept)
+    return fastapi.Response(content=content, media_type="text/turtle", status_code=200)
 
 
 @router.post("/concept-description:rdftojson", tags=["RDF"])
@@ -95,16 +85,9 @@ async def convert_concept_description_to_json(
             '@prefix aas: <https://admin-shell.io/aas/3/0/> . \n\n<TXlDb25jZXB0> a aas:ConceptDescription ; \n    <https://admin-shell.io/aas/3/0/Identifiable/id> "MyConcept" .'
         ],
     ),
+    pool: ConversionPool = Depends(get_conversion_pool),
 ):
-    graph = rdflib.Graph().parse(data=concept, format="turtle")
-    print(graph.serialize(format="turtle"))
-    # Only consider the instance of ConceptDescription.
-    target: rdflib.URIRef = next(
-        graph.subjects(predicate=rdflib.Graph, object=AASNameSpace.AAS["ConceptDescription"]), None
-    )
-    payload = ConceptDescription.from_rdf(graph, target)
-    result = payload.model_dump_json(exclude_none=True)
-    return JSONResponse(json.loads(result), status_code=200)
+    return JSONResponse(await pool.to_json("concept-description", concept), status_code=200)
 
 
 @router.post("/shell:jsontordf", tags=["RDF"])
@@ -115,12 +98,10 @@ async def convert_shell_to_rdf(
             {"id": "MyShell", "assetInformation": {"assetKind": "Instance"}, "modelType": "AssetAdministrationShell"}
         ],
     ),
+    pool: ConversionPool = Depends(get_conversion_pool),
 ):
-    payload = AssetAdministrationShell(**shell)
-    graph, _ = payload.to_rdf()
-    return fastapi.Response(
-        content=graph.serialize(format="turtle_custom", encoding="utf-8"), media_type="text/turtle", status_code=200
-    )
+    content = await pool.to_turtle("shell", shell)
+    return fastapi.Response(content=content, media_type="text/turtle", status_code=200)
 
 
 @router.post("/shell:rdftojson", tags=["RDF"])
@@ -132,12 +113,67 @@ async def convert_shell_to_json(
             '@prefix aas: <https://admin-shell.io/aas/3/0/> . \n\n<https://example.com/shell/1> a aas:AssetAdministrationShell ;\n    <https://admin-shell.io/aas/3/0/Identifiable/id> "MyShell";\n    <https://admin-shell.io/aas/3/0/AssetAdministrationShell/assetInformation> [ a aas:AssetInformation ;\n        <https://admin-shell.io/aas/3/0/AssetInformation/assetKind> <https://admin-shell.io/aas/3/0/AssetKind/Instance> ] .'
         ],
     ),
+    pool: ConversionPool = Depends(get_conversion_pool),
+):
+    return JSONResponse(await pool.to_json("shell", shell), status_code=200)
+
+
+@router.post("/submodels:jsontordf", summary="Converts many Submodels into one Turtle document", tags=["RDF"])
+async def convert_submodels_to_rdf(
+    submodels: List[dict] = fastapi.Body(..., examples=[[{"id": "MySubmodel", "modelType": "Submodel"}]]),
+    pool: ConversionPool = Depends(get_conversion_pool),
+):
+    content = await pool.batch_to_turtle("submodel", submodels)
+    return fastapi.Response(content=content, media_type="text/turtle", status_code=200)
+
+
+@router.post("/submodels:rdftojson", summary="Converts Turtle documents of one Submodel each", tags=["RDF"])
+async def convert_submodels_to_json(
+    submodels: List[str] = fastapi.Body(...),
+    pool: ConversionPool = Depends(get_conversion_pool),
+):
+    return JSONResponse(await pool.batch_to_json("submodel", submodels), status_code=200)
+
+
+@router.post(
+    "/concept-descriptions:jsontordf",
+    summary="Converts many Concept Descriptions into one Turtle document",
+    tags=["RDF"],
+)
+async def convert_concept_descriptions_to_rdf(
+    concepts: List[dict] = fastapi.Body(..., examples=[[{"id": "MyConcept", "modelType": "ConceptDescription"}]]),
+    pool: ConversionPool = Depends(get_conversion_pool),
+):
+    content = await pool.batch_to_turtle("concept-description", concepts)
+    return fastapi.Response(content=content, media_type="text/turtle", status_code=200)
+
+
+@router.post(
+    "/concept-descriptions:rdftojson", summary="Converts Turtle documents of one Concept Description each", tags=["RDF"]
+)
+async def convert_concept_descriptions_to_json(
+    concepts: List[str] = fastapi.Body(...),
+    pool: ConversionPool = Depends(get_conversion_pool),
+):
+    return JSONResponse(await pool.batch_to_json("concept-description", concepts), status_code=200)
+
+
+@router.post(
+    "/shells:jsontordf", summary="Converts many Asset Administration Shells into one Turtle document", tags=["RDF"]
+)
+async def convert_shells_to_rdf(
+    shells: List[dict] = fastapi.Body(...),
+    pool: ConversionPool = Depends(get_conversion_pool),
+):
+    content = await pool.batch_to_turtle("shell", shells)
+    return fastapi.Response(content=content, media_type="text/turtle", status_code=200)
+
+
+@router.post(
+    "/shells:rdftojson", summary="Converts Turtle documents of one Asset Administration Shell each", tags=["RDF"]
+)
+async def convert_shells_to_json(
+    shells: List[str] = fastapi.Body(...),
+    pool: ConversionPool = Depends(get_conversion_pool),
 ):
-    graph = rdflib.Graph().parse(data=shell, format="turtle")
-    # Only consider the instance of ConceptDescription.
-    target: rdflib.URIRef = next(
-        graph.subjects(predicate=rdflib.Graph, object=AASNameSpace.AAS["AssetAdministrationShell"]), None
-    )
-    payload = AssetAdministrationShell.from_rdf(graph, target)
-    result = payload.model_dump_json(exclude_none=True)
-    return JSONResponse(json.loads(result), status_code=200)
+    return JSONResponse(await pool.batch_to_json("shell", shells), status_code=200)
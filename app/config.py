@@ -19,24 +19,100 @@
 #  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
 #  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import json
 import os
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 
+class RepositorySettings(BaseModel):
+    # name of a registered backend, see app.repository.registry
+    backend: str
+    # defaults to the db_uri of the Config for the primary, caches and mirrors need a database of their own
+    db_uri: Optional[str] = None
+    # read replicas of the db_uri, reads are balanced over them and writes go to the db_uri
+    replica_uris: List[str] = []
+    # "primary" serves all reads and writes, a "cache" is read through and invalidated on writes, a "mirror" such as
+    # a search index only receives the writes
+    role: str = "primary"
+    # seconds a cache keeps an entry, which bounds how long it may serve a value that was changed meanwhile
+    cache_ttl_seconds: float = 60.0
+    # backend specific settings passed to connect_to_database next to DB_URI, e.g. {"GRAPHDB_REPO": "aas"}
+    settings: Dict[str, Any] = {}
+
+
 class Config(BaseSettings):
     app_name: str = "AAS Brain Concept Description Repository API"
     db_backend: str = os.getenv("BACKEND", "redis")
     db_uri: str = os.getenv("DB_URI", "redis://127.0.0.1:6019")
+    # comma separated read replicas of the db_uri
+    db_replica_uris: str = os.getenv("DB_REPLICA_URIS", "")
+    # seconds the reads of a client stay on the primary after it wrote, so it reads its own writes
+    replica_sticky_seconds: float = os.getenv("REPLICA_STICKY_SECONDS", 5.0)
+    # seconds a replica is skipped after it failed
+    replica_retry_seconds: float = os.getenv("REPLICA_RETRY_SECONDS", 10.0)
     debug: bool = os.getenv("DEBUG", False)
+    # Named repositories composed at startup as a JSON object of RepositorySettings, e.g.
+    # {"primary": {"backend": "graphdb"}, "cache": {"backend": "redis", "role": "cache"}}.
+    # By default the only repository is the db_backend at db_uri.
+    repositories: Dict[str, RepositorySettings] = json.loads(os.getenv("REPOSITORIES", "{}"))
+    # Concept descriptions loaded at startup from a JSON, JSON lines, XML or AASX file, no seed data by default.
+    # The file is skipped if the backend already holds its seed_version, by default the hash of the file.
+    seed_file: Optional[str] = os.getenv("SEED_FILE", None)
+    seed_version: Optional[str] = os.getenv("SEED_VERSION", None)
+    seed_batch_size: int = os.getenv("SEED_BATCH_SIZE", 500)
+    # Prometheus metrics on /metrics, set PROMETHEUS_MULTIPROC_DIR when running several worker processes
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", True)
+    # OpenTelemetry traces, exported with "otlp" (configured by the OTEL_EXPORTER_OTLP_* variables), "console", "file"
+    # as JSON lines to tracing_file, or "none". Needs the packages of tracing-requirements.txt.
+    tracing_exporter: str = os.getenv("TRACING_EXPORTER", "none")
+    tracing_service_name: str = os.getenv("TRACING_SERVICE_NAME", "aasbrain-concept-description-repository")
+    tracing_file: str = os.getenv("TRACING_FILE", "traces.jsonl")
+    # bearer token of the /admin endpoints, e.g. the sampling profiler. The endpoints are disabled without a token.
+    admin_token: Optional[str] = os.getenv("ADMIN_TOKEN", None)
+    profiler_max_seconds: float = os.getenv("PROFILER_MAX_SECONDS", 60.0)
+    # Server-Timing header with the time spent in validation, repository calls and serialization
+    server_timing_enabled: bool = os.getenv("SERVER_TIMING_ENABLED", False)
+    # seconds the readiness probe waits for the backend and keeps its result
+    health_check_timeout: float = os.getenv("HEALTH_CHECK_TIMEOUT", 1.0)
+    health_check_cache_seconds: float = os.getenv("HEALTH_CHECK_CACHE_SECONDS", 2.0)
+    # Response compression, codings are listed in server preference order. br and zstd need the packages of
+    # compression-requirements.txt and are skipped without them.
+    compression_encodings: str = os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip")
+    compression_minimum_size: int = os.getenv("COMPRESSION_MINIMUM_SIZE", 1024)
+    # memory used for precompressed response bodies, 0 disables the cache
+    compression_cache_bytes: int = os.getenv("COMPRESSION_CACHE_BYTES", 16 * 1024 * 1024)
+    # "direct" writes Turtle and N-Triples without building an rdflib Graph, "rdflib" uses the rdflib serializers
+    rdf_serializer: str = os.getenv("RDF_SERIALIZER", "direct")
+    # worker processes of the RDF conversion endpoints, 0 converts inline on the event loop
+    rdf_conversion_workers: int = os.getenv("RDF_CONVERSION_WORKERS", os.cpu_count() or 1)
+    # submodels with more submodel elements are converted in chunks of this size
+    rdf_conversion_chunk_size: int = os.getenv("RDF_CONVERSION_CHUNK_SIZE", 500)
+    # events kept in the change feed and the interval in seconds in which followers poll it
+    change_feed_max_events: int = os.getenv("CHANGE_FEED_MAX_EVENTS", 100_000)
+    change_feed_poll_interval: float = os.getenv("CHANGE_FEED_POLL_INTERVAL", 1.0)
+    # connections of the Redis pool of every process, commands beyond it fail with "Too many connections".
+    # The blocking Redis calls run in the threadpool of 40 threads, so the pool is a little larger.
+    redis_max_connections: int = os.getenv("REDIS_MAX_CONNECTIONS", 50)
+    # concept descriptions kept in a local cache per process, 0 disables the cache. The caches of all processes are
+    # invalidated over Redis pub/sub, by default on the Redis of the db_uri.
+    local_cache_entries: int = os.getenv("LOCAL_CACHE_ENTRIES", 0)
+    local_cache_invalidation_uri: Optional[str] = os.getenv("LOCAL_CACHE_INVALIDATION_URI", None)
+    local_cache_verify_interval: float = os.getenv("LOCAL_CACHE_VERIFY_INTERVAL", 5.0)
     # Options for GraphDB
+    graphdb_endpoint: str = os.getenv("GRAPHDB_ENDPOINT", "http://127.0.0.1:7200")
     semantic_namespace: Optional[str] = os.getenv("SEMANTIC_NAMESPACE", "https://aasbrain/")
     semantic_graphdb_repo: Optional[str] = os.getenv("SEMANTIC_GRAPHDB_REPO", "aas")
     # Options for MongoDB
     mongo_db_name: str = os.getenv("MONGO_DB_NAME", "concept_description_db")
     # Options for Redis
+    # json, msgpack or cbor. Binary formats are served without transcoding when the client asks for them.
+    redis_storage_format: str = os.getenv("REDIS_STORAGE_FORMAT", "json")
+    # the history stores a full snapshot at least every that many versions and JSON patches in between
+    redis_history_snapshot_interval: int = os.getenv("REDIS_HISTORY_SNAPSHOT_INTERVAL", 16)
 
     # Options for Neo4j
 
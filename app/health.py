@@ -0,0 +1,89 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from loguru import logger
+from starlette.concurrency import run_in_threadpool
+
+from app.models.response import HealthResponse, OperationNotAllowedException, ReadinessResponse
+from app.repository.concept_description_repository import ConceptDescriptionRepository
+
+STARTED_AT = time.monotonic()
+
+
+def uptime() -> str:
+    return str(timedelta(seconds=int(time.monotonic() - STARTED_AT)))
+
+
+def liveness() -> HealthResponse:
+    # Liveness only tells whether the process can serve requests, a failing database must not restart the pod.
+    return HealthResponse(status="UP", uptime=uptime())
+
+
+class ReadinessCheck:
+    """
+    Pings the backend of the repository and keeps the result for `cache_seconds`,
+    so frequent probes of several orchestrators do not reach the database.
+    """
+
+    def __init__(self, backend: str, timeout: float, cache_seconds: float):
+        self.backend = backend
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+        self.result: Optional[ReadinessResponse] = None
+        self.expires_at = 0.0
+
+    async def check(self, repository: ConceptDescriptionRepository) -> ReadinessResponse:
+        if self.result is not None and time.monotonic() < self.expires_at:
+            return self.result
+        self.result = await self._check(repository)
+        self.expires_at = time.monotonic() + self.cache_seconds
+        return self.result
+
+    @staticmethod
+    def _last_write(repository: ConceptDescriptionRepository) -> Optional[str]:
+        try:
+            last_event = repository.get_change_feed().last()
+        except OperationNotAllowedException:
+            # backends without a change feed
+            return None
+        return last_event.timestamp if last_event is not None else None
+
+    async def _check(self, repository: ConceptDescriptionRepository) -> ReadinessResponse:
+        readiness = {"backend": self.backend, "uptime": uptime()}
+        started = time.perf_counter()
+        try:
+            pool = await asyncio.wait_for(repository.ping(self.timeout), self.timeout)
+            readiness["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            readiness["pool"] = pool
+            readiness["last_write"] = await run_in_threadpool(self._last_write, repository)
+            readiness["status"] = "UP"
+        except asyncio.TimeoutError:
+            readiness.update(status="DOWN", error=f"No response within {self.timeout}s")
+        except Exception as e:
+            logger.warning(f"Readiness check of {self.backend} failed: {e}")
+            readiness.update(status="DOWN", error=str(e))
+        readiness["checked_at"] = datetime.now(timezone.utc).isoformat()
+        return ReadinessResponse(**readiness)
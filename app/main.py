@@ -20,29 +20,37 @@
 #  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 import json
-import os
 from contextlib import asynccontextmanager
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.responses import JSONResponse
 import uvicorn
+from typing import Optional
 from datetime import datetime, timezone
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from loguru import logger
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, Response
 from starlette.staticfiles import StaticFiles
 
-from app.api.graphql import concept_description_repository_graphql
 from app.api.rest.conceptdescription import (
     concept_description_repository_rest,
     concept_description_repository_extra_rest,
 )
-from app.api.rest import rdf_utility_rest
+from app.api.rest import admin_rest, rdf_utility_rest
+from app.api.rest.conversion_pool import get_conversion_pool
+from app.api.compression import CompressionMiddleware
+from app.api.lazy import LazyApp
 from app.config import get_config
-from app.models.concept_description import ConceptDescription
-from app.models.response import HealthResponse, Result, MessageType, APIException
-from app.repository import get_repository
+from app.health import ReadinessCheck, liveness
+from app.metrics import METRICS_MEDIA_TYPE, MetricsMiddleware, metrics_payload
+from app.profiler import ServerTimingMiddleware
+from app.models.response import HealthResponse, ReadinessResponse, Result, MessageType, APIException
+from app.repository import cd_backend, cd_db_setting, get_repository
+from app.repository.registry import has_replicas
+from app.repository.replicated_repository import ReadRoutingMiddleware
+from app.repository.seed import seed_repository
+from app.tracing import TracingMiddleware, configure_tracing
 from fastapi.encoders import jsonable_encoder
 
 
@@ -52,21 +60,15 @@ async def lifespan(app: FastAPI):
     config = get_config()
     logger.info(f"Startup with Config: {config}")
     repo = await get_repository()
-    await repo.connect_to_database({"DB_URI": config.db_uri})
-    script_dir = os.path.dirname(__file__)
-    with open(os.path.join(script_dir, "repository", "mock_concepts.json"), encoding="utf-8") as mock:
-        cds = json.load(mock)
-        cd_repo = await get_repository()
-        for cd in cds:
-            try:
-                await cd_repo.add_concept_description(ConceptDescription(**cd))
-            except:
-                pass
+    await repo.connect_to_database(cd_db_setting)
+    if config.seed_file:
+        await seed_repository(repo, config.seed_file, config.seed_version, config.seed_batch_size)
 
     yield
     # Shutdown
     repo = await get_repository()
     await repo.close_database_connection()
+    get_conversion_pool().shutdown()
 
 
 app = FastAPI(
@@ -96,6 +98,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=get_config().compression_minimum_size,
+    encodings=get_config().compression_encodings.split(","),
+    cache_bytes=get_config().compression_cache_bytes,
+)
+
+if configure_tracing(get_config().tracing_exporter, get_config().tracing_service_name, get_config().tracing_file):
+    app.add_middleware(TracingMiddleware)
+
+if get_config().server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware)
+
+if has_replicas(get_config()):
+    app.add_middleware(ReadRoutingMiddleware, sticky_seconds=get_config().replica_sticky_seconds)
+
+if get_config().metrics_enabled:
+    # added last, so the duration includes all other middlewares
+    app.add_middleware(MetricsMiddleware)
+
 # Include Official Concept Description REST API Endpoints
 app.include_router(concept_description_repository_rest.router)
 
@@ -105,17 +127,48 @@ app.include_router(rdf_utility_rest.router)
 # Include Extra Features
 app.include_router(concept_description_repository_extra_rest.router)
 
+# Include Admin Endpoints
+app.include_router(admin_rest.router)
+
 # Include Concept Description GraphQL Endpoints
+# Ariadne and the schema are loaded with the first GraphQL request
 app.mount(
     "/graphql/",
-    concept_description_repository_graphql.router,
+    LazyApp("app.api.graphql.concept_description_repository_graphql:router"),
     name="GraphQL",
 )
 
 
-@app.get("/health", response_model=HealthResponse, description="Health checking endpoint", tags=["Extra"])
+readiness_check = ReadinessCheck(cd_backend, get_config().health_check_timeout, get_config().health_check_cache_seconds)
+
+
+@app.get("/health", response_model=HealthResponse, description="Liveness probe", tags=["Extra"])
 async def check_health() -> HealthResponse:
-    return HealthResponse(**{"status": "Obviously UP!", "uptime": "Who knows?!"})
+    return liveness()
+
+
+@app.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    response_model_exclude_none=True,
+    description="Readiness probe, answers 503 while the database is not reachable",
+    tags=["Extra"],
+)
+async def check_readiness(response: Response, repository=Depends(get_repository)) -> ReadinessResponse:
+    readiness = await readiness_check.check(repository)
+    if readiness.status != "UP":
+        response.status_code = 503
+    return readiness
+
+
+@app.get("/metrics", description="Prometheus metrics", tags=["Extra"], include_in_schema=False)
+async def metrics() -> Response:
+    return Response(content=metrics_payload(), media_type=METRICS_MEDIA_TYPE)
+
+
+def correlation_id(request) -> Optional[str]:
+    # the trace id of the request, if tracing is enabled
+    return getattr(request.state, "trace_id", None)
 
 
 @app.exception_handler(RequestValidationError)
@@ -131,6 +184,7 @@ async def validation_exception_handler(request, exc):
             "messages": [
                 {
                     "code": "409",
+                    "correlationId": correlation_id(request),
                     "messageType": "Error",
                     "text": f"Invalid payload with {number_of_errors} errors. Reasons {', '.join(error_type)}.",
                     "timestamp": str(datetime.now(timezone.utc).isoformat()),
@@ -149,6 +203,7 @@ async def exception_handler(request, exc):
                 "messages": [
                     {
                         "code": str(exc.error_code),
+                        "correlationId": correlation_id(request),
                         "messageType": "Error",
                         "text": str(exc.message),
                         "timestamp": str(datetime.now(timezone.utc).isoformat()),
@@ -162,6 +217,7 @@ async def exception_handler(request, exc):
                 "messages": [
                     {
                         "code": "500",
+                        "correlationId": correlation_id(request),
                         "messageType": "Error",
                         "text": str(exc),
                         "timestamp": str(datetime.now(timezone.utc).isoformat()),
@@ -178,6 +234,7 @@ async def method_not_allowed(request, exc):
             "messages": [
                 {
                     "code": "405",
+                    "correlationId": correlation_id(request),
                     "messageType": MessageType.Exception,
                     "text": f"This method is not allowed on requested endpoint.",
                     "timestamp": str(datetime.now(timezone.utc).isoformat()),
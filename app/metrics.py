@@ -0,0 +1,170 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.profiler import add_server_timing
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status", ["method", "route", "status"])
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response was sent completely",
+    ["method", "route", "status"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently processed", ["method"], multiprocess_mode="livesum"
+)
+REPOSITORY_DURATION = Histogram(
+    "repository_call_duration_seconds",
+    "Duration of the repository calls by backend and method",
+    ["backend", "method", "outcome"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+SERIALIZATION_DURATION = Histogram(
+    "serialization_duration_seconds",
+    "Time spent encoding responses by media type",
+    ["media_type"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and result", ["cache", "result"])
+REPOSITORY_READS = Counter("repository_reads_total", "Repository reads by the instance that served them", ["target"])
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_repository_read(target: str):
+    REPOSITORY_READS.labels(target).inc()
+
+
+@contextmanager
+def observe_serialization(media_type: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        SERIALIZATION_DURATION.labels(media_type).observe(elapsed)
+        add_server_timing("serialization", elapsed)
+
+
+_in_repository_call: ContextVar[bool] = ContextVar("in_repository_call", default=False)
+
+
+def instrument_repository(repository, backend: str):
+    """Wraps the coroutine methods of the repository instance to record their duration."""
+    for name, method in inspect.getmembers(repository, inspect.iscoroutinefunction):
+        if name.startswith("_"):
+            continue
+
+        def instrumented(method, name):
+            @functools.wraps(method)
+            async def call(*args, **kwargs):
+                started = time.perf_counter()
+                outcome = "error"
+                nested = _in_repository_call.get()
+                token = _in_repository_call.set(True)
+                try:
+                    result = await method(*args, **kwargs)
+                    outcome = "ok"
+                    return result
+                finally:
+                    _in_repository_call.reset(token)
+                    elapsed = time.perf_counter() - started
+                    REPOSITORY_DURATION.labels(backend, name, outcome).observe(elapsed)
+                    if not nested:
+                        # methods calling other methods of the repository would count their time twice
+                        add_server_timing("repository", elapsed)
+
+            return call
+
+        setattr(repository, name, instrumented(method, name))
+    return repository
+
+
+def route_label(scope: Scope) -> str:
+    # the path template keeps the cardinality bounded, e.g. /concept-descriptions/{cdIdentifier}
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope and scope.get("root_path"):
+        # mounted applications like the GraphQL endpoint
+        return scope["root_path"]
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = [500]
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            labels = (method, route_label(scope), str(status[0]))
+            REQUESTS.labels(*labels).inc()
+            REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - started)
+
+
+def metrics_payload() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # several worker processes, see the multiprocess mode of prometheus_client
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+METRICS_MEDIA_TYPE = CONTENT_TYPE_LATEST
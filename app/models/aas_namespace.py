@@ -19,11 +19,50 @@
 #  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
 #  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+from enum import Enum
+from typing import Dict
+
 import rdflib
 from rdflib.namespace import DefinedNamespace, Namespace
 
 
+class InternedNamespace(Namespace):
+    """Namespace which creates every term once, so `AAS["Reference/keys"]` is a dict lookup instead of a new URIRef."""
+
+    def __new__(cls, value):
+        namespace = super().__new__(cls, value)
+        namespace.__dict__["_terms"] = {}
+        return namespace
+
+    def term(self, name: str) -> rdflib.URIRef:
+        term = self._terms.get(name)
+        if term is None:
+            term = self._terms[name] = super().term(name)
+        return term
+
+
+# Literals of the list positions written as aas:index, larger lists fall back to new literals
+INDEX_LITERALS = tuple(rdflib.Literal(idx) for idx in range(256))
+
+_ENUM_URIS: Dict[Enum, rdflib.URIRef] = {}
+
+
 class AASNameSpace:
-    AAS = Namespace("https://admin-shell.io/aas/3/0/")
+    AAS = InternedNamespace("https://admin-shell.io/aas/3/0/")
     CD_TYPE = rdflib.URIRef(AAS["ConceptDescription"])
     ID = rdflib.URIRef(AAS["Identifiable/id"])
+    INDEX = AAS["index"]
+
+    @staticmethod
+    def index_literal(idx: int) -> rdflib.Literal:
+        if 0 <= idx < len(INDEX_LITERALS):
+            return INDEX_LITERALS[idx]
+        return rdflib.Literal(idx)
+
+    @staticmethod
+    def enum_uri(member: Enum) -> rdflib.URIRef:
+        """URI of an enum member, e.g. aas:KeyTypes/Submodel for KeyTypes.Submodel."""
+        uri = _ENUM_URIS.get(member)
+        if uri is None:
+            uri = _ENUM_URIS[member] = AASNameSpace.AAS[f"{type(member).__name__}/{member.name}"]
+        return uri
@@ -70,7 +70,7 @@ class AnnotatedRelationshipElement(RelationshipElementAbstract):
                     prefix_uri=prefix_uri + self.idShort + ".",
                     id_strategy=id_strategy,
                 )
-                created_graph.add((created_sub_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                created_graph.add((created_sub_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 created_graph.add(
                     (created_node, AASNameSpace.AAS["AnnotatedRelationshipElement/annotations"], created_sub_node)
                 )
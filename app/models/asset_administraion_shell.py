@@ -85,7 +85,7 @@ class AssetAdministrationShell(Identifiable, HasDataSpecification, RDFiable):
                 _, created_ref_node = submodel_ref.to_rdf(
                     graph, node, base_uri=base_uri, prefix_uri=prefix_uri, id_strategy=id_strategy
                 )
-                graph.add((created_ref_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_ref_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((node, AASNameSpace.AAS["AssetAdministrationShell/submodels"], created_ref_node))
 
         return graph, node
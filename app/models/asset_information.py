@@ -81,7 +81,7 @@ class AssetInformation(BaseModel, RDFiable):
             (
                 node,
                 rdflib.URIRef(AASNameSpace.AAS["AssetInformation/assetKind"]),
-                rdflib.URIRef(AASNameSpace.AAS[f"AssetKind/{self.assetKind.value}"]),
+                AASNameSpace.enum_uri(self.assetKind),
             )
         )
         if self.globalAssetId:
@@ -116,7 +116,7 @@ class AssetInformation(BaseModel, RDFiable):
         if self.specificAssetIds and len(self.specificAssetIds) > 0:
             for idx, specific_asset_id_ref in enumerate(self.specificAssetIds):
                 _, created_node = specific_asset_id_ref.to_rdf(graph, node, prefix_uri, base_uri, id_strategy)
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((node, AASNameSpace.AAS["AssetInformation/specificAssetIds"], created_node))
         return graph, node
 
@@ -86,14 +86,14 @@ class BasicEventElement(EventElement):
             (
                 created_node,
                 AASNameSpace.AAS["BasicEventElement/direction"],
-                AASNameSpace.AAS[f"Direction/{self.direction.name}"],
+                AASNameSpace.enum_uri(self.direction),
             )
         )
         created_graph.add(
             (
                 created_node,
                 AASNameSpace.AAS["BasicEventElement/state"],
-                AASNameSpace.AAS[f"StateOfEvent/{self.state.name}"],
+                AASNameSpace.enum_uri(self.state),
             )
         )
         if self.messageTopic:
@@ -0,0 +1,97 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+
+from pydantic import BaseModel
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+CBOR_MEDIA_TYPE = "application/cbor"
+
+
+def encode_json(document) -> bytes:
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(data: bytes):
+    return json.loads(data)
+
+
+def encode_msgpack(document) -> bytes:
+    import msgpack
+
+    return msgpack.packb(document, use_bin_type=True)
+
+
+def decode_msgpack(data: bytes):
+    import msgpack
+
+    return msgpack.unpackb(data, raw=False)
+
+
+def encode_cbor(document) -> bytes:
+    import cbor2
+
+    return cbor2.dumps(document)
+
+
+def decode_cbor(data: bytes):
+    import cbor2
+
+    return cbor2.loads(data)
+
+
+# media type -> (encoder, decoder) of JSON compatible documents
+CODECS = {
+    JSON_MEDIA_TYPE: (encode_json, decode_json),
+    MSGPACK_MEDIA_TYPE: (encode_msgpack, decode_msgpack),
+    CBOR_MEDIA_TYPE: (encode_cbor, decode_cbor),
+}
+
+BINARY_MEDIA_TYPES = [MSGPACK_MEDIA_TYPE, CBOR_MEDIA_TYPE]
+
+# short names used in the configuration
+STORAGE_FORMATS = {"json": JSON_MEDIA_TYPE, "msgpack": MSGPACK_MEDIA_TYPE, "cbor": CBOR_MEDIA_TYPE}
+
+
+def encode_document(document, media_type: str) -> bytes:
+    encoder, _ = CODECS[media_type]
+    return encoder(document)
+
+
+def decode_document(data: bytes, media_type: str):
+    _, decoder = CODECS[media_type]
+    return decoder(data)
+
+
+def encode_model(model: BaseModel, media_type: str) -> bytes:
+    if media_type == JSON_MEDIA_TYPE:
+        return model.model_dump_json(exclude_none=True).encode("utf-8")
+    return encode_document(model.model_dump(mode="json", exclude_none=True), media_type)
+
+
+def decode_stored_document(data: bytes, media_type: str):
+    # Stored documents are always maps. A JSON object starts with "{", which is neither a msgpack nor
+    # a CBOR map header, so documents written before the storage format was changed are still readable.
+    if data[:1] == b"{":
+        return decode_json(data)
+    return decode_document(data, media_type)
@@ -34,6 +34,7 @@ from app.models.identifiable import Identifiable
 from app.models.model_type import ModelType
 from app.models.rdfiable import RDFiable
 from app.models.reference import Reference
+from app.models.skolem import SKOLEM_ID_STRATEGY, skolemize
 from app.models import base_64_url_encode, url_encode
 
 
@@ -54,6 +55,13 @@ class ConceptDescription(Identifiable, HasDataSpecification, RDFiable):
             graph.bind("aas", AASNameSpace.AAS)
             graph.bind("myaas", base_uri)
 
+        if id_strategy == SKOLEM_ID_STRATEGY:
+            # blank nodes are replaced by stable IRIs below the concept, see skolemize
+            staged, node = self.to_rdf(prefix_uri=prefix_uri, base_uri=base_uri, id_strategy="base64-url-encode")
+            for triple in skolemize(staged, node):
+                graph.add(triple)
+            return graph, node
+
         if id_strategy == "base64-url-encode":
             node = rdflib.URIRef(f"{base_uri}{base_64_url_encode(self.id)}")
         else:
@@ -70,7 +78,7 @@ class ConceptDescription(Identifiable, HasDataSpecification, RDFiable):
         if self.isCaseOf and len(self.isCaseOf) > 0:
             for idx, is_case in enumerate(self.isCaseOf):
                 _, created_node = is_case.to_rdf(graph, node, prefix_uri, base_uri, id_strategy)
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((node, AASNameSpace.AAS["ConceptDescription/isCaseOf"], created_node))
         return graph, node
 
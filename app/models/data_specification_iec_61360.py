@@ -243,7 +243,7 @@ class DataSpecificationIec61360(BaseModel, RDFiable):
             _, created_node = preferredName.to_rdf(
                 graph=graph, parent_node=node, prefix_uri=prefix_uri, base_uri=base_uri, id_strategy=id_strategy
             )
-            graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+            graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
             graph.add((node, AASNameSpace.AAS["DataSpecificationIec61360/preferredName"], created_node))
 
         if self.shortName:
@@ -251,7 +251,7 @@ class DataSpecificationIec61360(BaseModel, RDFiable):
                 _, created_node = shortName.to_rdf(
                     graph=graph, parent_node=node, prefix_uri=prefix_uri, base_uri=base_uri, id_strategy=id_strategy
                 )
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add(
                     (
                         node,
@@ -289,14 +289,14 @@ class DataSpecificationIec61360(BaseModel, RDFiable):
                 (
                     node,
                     AASNameSpace.AAS["DataSpecificationIec61360/dataType"],
-                    AASNameSpace.AAS[f"DataTypeIec61360/{self.dataType.name}"],
+                    AASNameSpace.enum_uri(self.dataType),
                 )
             )
 
         if self.definition:
             for idx, definition_lang_text in enumerate(self.definition):
                 _, created_node = definition_lang_text.to_rdf(graph=graph, parent_node=node)
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add(
                     (
                         node,
@@ -27,7 +27,7 @@ from pydantic import BaseModel, Field, constr
 
 from app.models.aas_namespace import AASNameSpace
 from app.models.data_specification_iec_61360 import DataSpecificationIec61360
-from app.models.rdfiable import RDFiable
+from app.models.rdfiable import RDFiable, from_typed_rdf
 from app.models.reference import Reference
 
 
@@ -67,8 +67,6 @@ class EmbeddedDataSpecification(BaseModel, RDFiable):
 
     @staticmethod
     def from_rdf(graph: rdflib.Graph, subject: rdflib.IdentifiedNode):
-        # TODO: use type as discriminator
-
         data_specification_ref: rdflib.URIRef = next(
             graph.objects(subject=subject, predicate=AASNameSpace.AAS["EmbeddedDataSpecification/dataSpecification"]),
             None,
@@ -81,10 +79,6 @@ class EmbeddedDataSpecification(BaseModel, RDFiable):
             ),
             None,
         )
-        content_ref_type: rdflib.URIRef = next(
-            graph.objects(subject=content_ref, predicate=rdflib.RDF.type),
-            None,
-        )
-        if content_ref_type == AASNameSpace.AAS["DataSpecificationIec61360"]:
-            content = DataSpecificationIec61360.from_rdf(graph, content_ref)
+        if content_ref is not None:
+            content = from_typed_rdf(graph, content_ref, DataSpecificationIec61360)
         return EmbeddedDataSpecification(dataSpecification=data_specification, dataSpecificationContent=content)
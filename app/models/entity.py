@@ -65,7 +65,7 @@ class Entity(SubmodelElement):
             (
                 created_node,
                 AASNameSpace.AAS["Entity/entityType"],
-                AASNameSpace.AAS[f"EntityType/{self.entityType.name}"],
+                AASNameSpace.enum_uri(self.entityType),
             )
         )
         if self.statements:
@@ -77,7 +77,7 @@ class Entity(SubmodelElement):
                     base_uri=base_uri,
                     id_strategy=id_strategy,
                 )
-                graph.add((created_sub_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_sub_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((created_node, AASNameSpace.AAS["Entity/statements"], created_sub_node))
         if self.globalAssetId:
             created_graph.add(
@@ -91,7 +91,7 @@ class Entity(SubmodelElement):
         if self.specificAssetIds:
             for idx, specific_asset_id in enumerate(self.specificAssetIds):
                 _, created_sub_node = specific_asset_id.to_rdf(graph, created_node, prefix_uri=str(created_node) + ".")
-                graph.add((created_sub_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_sub_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((created_node, AASNameSpace.AAS["Entity/specificAssetIds"], created_sub_node))
         return created_graph, created_node
 
@@ -61,7 +61,7 @@ class Extension(HasSemantics, RDFiable):
                 (
                     node,
                     AASNameSpace.AAS["Extension/valueType"],
-                    AASNameSpace.AAS[f"DataTypeDefXsd/{self.valueType.name}"],
+                    AASNameSpace.enum_uri(self.valueType),
                 )
             )
 
@@ -71,7 +71,7 @@ class Extension(HasSemantics, RDFiable):
         if self.refersTo and len(self.refersTo) > 0:
             for idx, refer in enumerate(self.refersTo):
                 _, created_node = refer.to_rdf(graph=graph, parent_node=node)
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((node, AASNameSpace.AAS["Extension/refersTo"], created_node))
 
         return graph, node
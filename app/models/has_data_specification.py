@@ -39,7 +39,7 @@ class HasDataSpecification(BaseModel):
                 _, created_node = data_specification.to_rdf(
                     graph,
                 )
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add(
                     (parent_node, AASNameSpace.AAS["HasDataSpecification/embeddedDataSpecifications"], created_node)
                 )
@@ -40,7 +40,7 @@ class HasExtensions(BaseModel):
         if instance.extensions and len(instance.extensions) > 0:
             for idx, extension in enumerate(instance.extensions):
                 _, created_node = extension.to_rdf(graph, parent_node)
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((parent_node, AASNameSpace.AAS["HasExtensions/extensions"], created_node))
 
     @staticmethod
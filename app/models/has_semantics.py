@@ -42,7 +42,7 @@ class HasSemantics(BaseModel):
         if instance.supplementalSemanticIds and len(instance.supplementalSemanticIds) > 0:
             for idx, supplementalSemanticId in enumerate(instance.supplementalSemanticIds):
                 _, created_node = supplementalSemanticId.to_rdf(graph=graph, parent_node=parent_node)
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((parent_node, AASNameSpace.AAS["HasSemantics/supplementalSemanticIds"], created_node))
 
     @staticmethod
@@ -0,0 +1,70 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import rdflib
+from rdflib.term import Node
+
+
+class IndexedGraph:
+    """
+    Read only view of a graph for the `from_rdf` methods. All triples are grouped by subject and predicate
+    in a single pass, so the many `graph.objects(subject=..., predicate=...)` lookups of the decoders are plain
+    dictionary accesses instead of store queries.
+    """
+
+    def __init__(self, triples: Iterable[Tuple[Node, Node, Node]]):
+        self._index: Dict[Node, Dict[Node, List[Node]]] = {}
+        self._length = 0
+        for subject, predicate, obj in triples:
+            self._index.setdefault(subject, {}).setdefault(predicate, []).append(obj)
+            self._length += 1
+
+    @classmethod
+    def parse(cls, data, format: str = "turtle") -> "IndexedGraph":
+        return cls(rdflib.Graph().parse(data=data, format=format))
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self) -> Iterator[Tuple[Node, Node, Node]]:
+        for subject, predicates in self._index.items():
+            for predicate, objects in predicates.items():
+                for obj in objects:
+                    yield subject, predicate, obj
+
+    def objects(self, subject: Optional[Node] = None, predicate: Optional[Node] = None) -> Iterator[Node]:
+        if subject is not None:
+            predicates = self._index.get(subject)
+            if not predicates:
+                return iter(())
+            if predicate is not None:
+                return iter(predicates.get(predicate, ()))
+            return (obj for objects in predicates.values() for obj in objects)
+        return (obj for _, p, obj in self if predicate is None or p == predicate)
+
+    def predicate_objects(self, subject: Node) -> Iterator[Tuple[Node, List[Node]]]:
+        """Yields every predicate of the subject with all of its objects."""
+        return iter(self._index.get(subject, {}).items())
+
+    def subjects(self, predicate: Optional[Node] = None, object: Optional[Node] = None) -> Iterator[Node]:
+        return (s for s, p, o in self if (predicate is None or p == predicate) and (object is None or o == object))
@@ -0,0 +1,93 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import copy
+from typing import List
+
+
+def _escape(segment) -> str:
+    return str(segment).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(segment: str) -> str:
+    return segment.replace("~1", "/").replace("~0", "~")
+
+
+def _differs(old, new) -> bool:
+    # True == 1 in Python, but not in JSON
+    return type(old) is not type(new) or old != new
+
+
+def diff_documents(old, new, path: str = "") -> List[dict]:
+    """
+    Computes a JSON patch (RFC 6902) turning `old` into `new`. Objects and list items are compared recursively,
+    lists of different length only add or remove their trailing items.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch = []
+        for key in old:
+            if key not in new:
+                patch.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            if key not in old:
+                patch.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+            else:
+                patch.extend(diff_documents(old[key], value, f"{path}/{_escape(key)}"))
+        return patch
+    if isinstance(old, list) and isinstance(new, list):
+        patch = []
+        for idx in range(min(len(old), len(new))):
+            patch.extend(diff_documents(old[idx], new[idx], f"{path}/{idx}"))
+        for idx in range(len(old) - 1, len(new) - 1, -1):
+            patch.append({"op": "remove", "path": f"{path}/{idx}"})
+        for idx in range(len(old), len(new)):
+            patch.append({"op": "add", "path": f"{path}/{idx}", "value": new[idx]})
+        return patch
+    if _differs(old, new):
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def apply_patch(document, patch: List[dict]):
+    """Applies the add, remove and replace operations of a JSON patch to a copy of the document."""
+    document = copy.deepcopy(document)
+    for operation in patch:
+        if operation["path"] == "":
+            document = copy.deepcopy(operation["value"])
+            continue
+        *parents, last = [_unescape(segment) for segment in operation["path"].split("/")[1:]]
+        target = document
+        for segment in parents:
+            target = target[int(segment)] if isinstance(target, list) else target[segment]
+        value = copy.deepcopy(operation.get("value"))
+        if isinstance(target, list):
+            idx = len(target) if last == "-" else int(last)
+            if operation["op"] == "add":
+                target.insert(idx, value)
+            elif operation["op"] == "remove":
+                del target[idx]
+            else:
+                target[idx] = value
+        elif operation["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = value
+    return document
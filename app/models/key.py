@@ -55,7 +55,7 @@ class Key(BaseModel, RDFiable):
             (
                 node,
                 AASNameSpace.AAS["Key/type"],
-                AASNameSpace.AAS[f"KeyTypes/{self.type.value}"],
+                AASNameSpace.enum_uri(self.type),
             )
         )
         graph.add(
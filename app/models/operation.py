@@ -90,18 +90,18 @@ class Operation(SubmodelElement):
         if self.inputVariables:
             for idx, input_variable in enumerate(self.inputVariables):
                 _, created_sub_node = input_variable.to_rdf(created_graph, created_node)
-                created_graph.add((created_sub_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                created_graph.add((created_sub_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 created_graph.add((created_node, AASNameSpace.AAS["Operation/inputVariables"], created_sub_node))
 
         if self.outputVariables:
             for idx, input_variable in enumerate(self.outputVariables):
                 _, created_sub_node = input_variable.to_rdf(created_graph, created_node)
-                created_graph.add((created_sub_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                created_graph.add((created_sub_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 created_graph.add((created_node, AASNameSpace.AAS["Operation/outputVariables"], created_sub_node))
         if self.inoutputVariables:
             for idx, input_variable in enumerate(self.inoutputVariables):
                 _, created_sub_node = input_variable.to_rdf(created_graph, created_node)
-                created_graph.add((created_sub_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                created_graph.add((created_sub_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 created_graph.add((created_node, AASNameSpace.AAS["Operation/inoutputVariables"], created_sub_node))
 
         return created_graph, created_node
@@ -0,0 +1,72 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import Dict, Optional
+
+# property -> nested projection, None selects the whole value
+Projection = Dict[str, Optional["Projection"]]
+
+
+def parse_fields(fields: str) -> Projection:
+    """
+    Parses a comma separated list of JSON pointer like paths, e.g. `id,embeddedDataSpecifications/dataSpecificationContent/unit`.
+    Lists are traversed transparently, so paths never contain array indices.
+    """
+    projection = {}
+    for path in fields.split(","):
+        segments = [
+            segment.replace("~1", "/").replace("~0", "~") for segment in path.strip().strip("/").split("/") if segment
+        ]
+        node = projection
+        for position, segment in enumerate(segments):
+            if segment in node and node[segment] is None:
+                break
+            if position == len(segments) - 1:
+                node[segment] = None
+            else:
+                node = node.setdefault(segment, {})
+    return projection
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == {} or value == []
+
+
+def project_document(document, projection: Optional[Projection]):
+    """
+    Keeps only the selected paths of a JSON document, values without any selected content are dropped. List items
+    without selected content remain as empty placeholders, so the indices match the ones of the document.
+    """
+    if projection is None:
+        return document
+    if isinstance(document, list):
+        items = [project_document(item, projection) for item in document]
+        return [] if all(_is_empty(item) for item in items) else items
+    if not isinstance(document, dict):
+        return None
+    projected = {}
+    for prop, nested in projection.items():
+        if prop not in document:
+            continue
+        value = project_document(document[prop], nested)
+        if not _is_empty(value):
+            projected[prop] = value
+    return projected
@@ -60,7 +60,7 @@ class Property(DataElement):
             (
                 created_node,
                 AASNameSpace.AAS["Property/valueType"],
-                AASNameSpace.AAS[f"DataTypeDefXsd/{self.valueType.name}"],
+                AASNameSpace.enum_uri(self.valueType),
             )
         )
         if self.value != None:
@@ -53,7 +53,7 @@ class Qualifier(HasSemantics):
                 (
                     parent_node,
                     AASNameSpace.AAS["Qualifier/kind"],
-                    AASNameSpace.AAS[f"QualifierKind/{instance.kind.value}"],
+                    AASNameSpace.enum_uri(instance.kind),
                 )
             )
         graph.add((parent_node, AASNameSpace.AAS["Qualifier/type"], rdflib.Literal(instance.type)))
@@ -61,7 +61,7 @@ class Qualifier(HasSemantics):
             (
                 parent_node,
                 AASNameSpace.AAS["Qualifier/valueType"],
-                AASNameSpace.AAS[f"DataTypeDefXsd/{instance.valueType.name}"],
+                AASNameSpace.enum_uri(instance.valueType),
             )
         )
         if instance.value:
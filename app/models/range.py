@@ -55,7 +55,7 @@ class Range(DataElement):
             (
                 created_node,
                 AASNameSpace.AAS["Range/valueType"],
-                AASNameSpace.AAS[f"DataTypeDefXsd/{self.valueType.name}"],
+                AASNameSpace.enum_uri(self.valueType),
             )
         )
         if self.min != None:
@@ -0,0 +1,85 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Conversions between the JSON and Turtle representations of the AAS models. The functions only take and return
+# plain, picklable values, so they can run in worker processes.
+from typing import List
+
+import rdflib
+from pydantic import ValidationError
+
+from app.config import get_config
+from app.models.aas_namespace import AASNameSpace
+from app.models.asset_administraion_shell import AssetAdministrationShell
+from app.models.concept_description import ConceptDescription
+from app.models.indexed_graph import IndexedGraph
+from app.models.response import InvalidPayloadException
+from app.models.serializer import RDFWriter, write_rdf
+from app.models.submodel import Submodel
+
+RDF_CONVERSION_MODELS = {
+    "submodel": Submodel,
+    "concept-description": ConceptDescription,
+    "shell": AssetAdministrationShell,
+}
+
+
+def _validate(model, payload: dict):
+    # validation errors of pydantic cannot be unpickled in the API process, so they are raised as API exceptions
+    try:
+        return model(**payload)
+    except ValidationError:
+        raise InvalidPayloadException()
+
+
+def json_to_turtle(kind: str, payload: dict, bnode_prefix: str = "b") -> bytes:
+    model = _validate(RDF_CONVERSION_MODELS[kind], payload)
+    if get_config().rdf_serializer == "direct":
+        return write_rdf(model, bnode_prefix=bnode_prefix)
+    graph, _ = model.to_rdf()
+    return graph.serialize(format="turtle_custom", encoding="utf-8")
+
+
+def turtle_to_json(kind: str, data: str) -> dict:
+    model = RDF_CONVERSION_MODELS[kind]
+    try:
+        graph = IndexedGraph.parse(data)
+    except (SyntaxError, ValueError, AssertionError):
+        # BadSyntax is a SyntaxError, the Turtle parser asserts some of its expectations
+        raise InvalidPayloadException()
+    # Only consider the instance of the requested model.
+    target = next(graph.subjects(predicate=rdflib.RDF.type, object=AASNameSpace.AAS[model.__name__]), None)
+    if target is None:
+        raise InvalidPayloadException()
+    try:
+        return model.from_rdf(graph, target).model_dump(mode="json", exclude_none=True)
+    except (ValueError, AttributeError, KeyError, TypeError):
+        # besides the ValidationError of pydantic, from_rdf fails on missing or unexpected nodes
+        raise InvalidPayloadException()
+
+
+def submodel_elements_to_turtle(submodel_id: str, elements: List[dict], start: int, bnode_prefix: str) -> bytes:
+    """Writes a slice of the submodel elements of a submodel, `start` being the index of the first element."""
+    submodel = _validate(Submodel, {"id": submodel_id, "submodelElements": elements})
+    writer = RDFWriter("turtle", bnode_prefix=bnode_prefix)
+    writer.bind("aas", AASNameSpace.AAS)
+    submodel.append_submodel_elements_as_rdf(writer, submodel.rdf_node(), start=start)
+    return writer.serialize(encoding="utf-8")
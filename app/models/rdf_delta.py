@@ -0,0 +1,80 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import Iterable, NamedTuple, Optional, Set, Tuple
+
+import rdflib
+
+Triple = Tuple[rdflib.term.Node, rdflib.term.Node, rdflib.term.Node]
+
+
+def _statement(triple: Triple) -> str:
+    return " ".join(term.n3() for term in triple) + " ."
+
+
+def triples_to_text(triples: Iterable[Triple]) -> str:
+    """Writes the triples one statement per line, sorted so that equal sets give equal text."""
+    return "\n".join(sorted(_statement(triple) for triple in triples))
+
+
+def triples_from_text(text: str) -> Set[Triple]:
+    if not text:
+        return set()
+    # Literal.n3() may use long string quotes, which Turtle reads but N-Triples does not
+    return set(rdflib.Graph().parse(data=text, format="turtle"))
+
+
+class RDFDelta(NamedTuple):
+    added: Set[Triple]
+    removed: Set[Triple]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+    def has_blank_nodes(self) -> bool:
+        return any(isinstance(term, rdflib.BNode) for triple in self.added | self.removed for term in triple)
+
+    def inverted(self) -> "RDFDelta":
+        return RDFDelta(added=self.removed, removed=self.added)
+
+    def apply(self, triples: Set[Triple]) -> Set[Triple]:
+        return (triples - self.removed) | self.added
+
+    def to_sparql_update(self, graph: Optional[rdflib.URIRef] = None) -> str:
+        """Renders the delta as DELETE DATA / INSERT DATA operations, optionally inside a named graph."""
+        operations = []
+        for keyword, triples in (("DELETE DATA", self.removed), ("INSERT DATA", self.added)):
+            if not triples:
+                continue
+            body = triples_to_text(triples)
+            if graph is not None:
+                body = f"GRAPH {graph.n3()} {{\n{body}\n}}"
+            operations.append(f"{keyword} {{\n{body}\n}}")
+        return " ;\n".join(operations)
+
+
+def diff_triples(old: Iterable[Triple], new: Iterable[Triple]) -> RDFDelta:
+    """
+    Computes the triples to remove from and add to `old` to get `new`. Both sides have to be skolemized,
+    blank nodes never compare equal between two graphs.
+    """
+    old, new = set(old), set(new)
+    return RDFDelta(added=new - old, removed=old - new)
@@ -20,11 +20,22 @@
 #  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 from abc import ABC, abstractmethod
+from typing import Dict, Optional
 
 import rdflib
 
+from app.models.aas_namespace import AASNameSpace
+
+# rdf:type -> model class, every RDFiable implementing from_rdf registers itself under aas:<class name>
+RDF_TYPES: Dict[rdflib.URIRef, type] = {}
+
 
 class RDFiable(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "from_rdf" in cls.__dict__:
+            RDF_TYPES[rdflib.URIRef(AASNameSpace.AAS[cls.__name__])] = cls
+
     @abstractmethod
     def to_rdf(
         self,
@@ -40,3 +51,12 @@ class RDFiable(ABC):
     @abstractmethod
     def from_rdf(graph: rdflib.Graph, subject: rdflib.IdentifiedNode):
         pass
+
+
+def from_typed_rdf(graph: rdflib.Graph, subject: rdflib.IdentifiedNode, base: type = RDFiable) -> Optional[RDFiable]:
+    """Decodes the subject with the model registered for its rdf:type, None if it is unknown or not a `base`."""
+    type_ref = next(graph.objects(subject=subject, predicate=rdflib.RDF.type), None)
+    model = RDF_TYPES.get(type_ref)
+    if model is None or not issubclass(model, base):
+        return None
+    return model.from_rdf(graph, subject)
@@ -55,7 +55,7 @@ class Referable(HasExtensions):
             for idx, display_name_lan in enumerate(instance.displayName):
                 lang_node = rdflib.BNode()
                 graph.add((lang_node, rdflib.RDF.type, AASNameSpace.AAS["LangStringNameType"]))
-                graph.add((lang_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((lang_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add(
                     (
                         lang_node,
@@ -72,7 +72,7 @@ class Referable(HasExtensions):
             for idx, description_lan in enumerate(instance.description):
                 lang_node = rdflib.BNode()
                 graph.add((lang_node, rdflib.RDF.type, AASNameSpace.AAS["LangStringNameType"]))
-                graph.add((lang_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((lang_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add(
                     (
                         lang_node,
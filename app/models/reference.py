@@ -53,10 +53,10 @@ class Reference(BaseModel, RDFiable):
         node = rdflib.BNode()
         graph.add((node, rdflib.RDF.type, AASNameSpace.AAS["Reference"]))
 
-        graph.add((node, AASNameSpace.AAS["Reference/type"], AASNameSpace.AAS[f"ReferenceTypes/{self.type.value}"]))
+        graph.add((node, AASNameSpace.AAS["Reference/type"], AASNameSpace.enum_uri(self.type)))
         for idx, key in enumerate(self.keys):
             sub_graph, created_key_node = key.to_rdf(graph=graph, parent_node=node)
-            graph.add((created_key_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+            graph.add((created_key_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
             graph.add((node, AASNameSpace.AAS["Reference/keys"], created_key_node))
         if self.referredSemanticId:
             sub_graph, created_reference_node = self.referredSemanticId.to_rdf(graph=graph, parent_node=node)
@@ -76,7 +76,7 @@ class Reference(BaseModel, RDFiable):
         keys = {}
         for key in keys_content:
             created_key: Key = Key.from_rdf(graph, key)
-            key_index_ref: rdflib.Literal = next(graph.objects(subject=key, predicate=AASNameSpace.AAS["index"]), None)
+            key_index_ref: rdflib.Literal = next(graph.objects(subject=key, predicate=AASNameSpace.INDEX), None)
             keys[key_index_ref.value] = created_key
             # TODO: make sure about the order
         referred_semantic_id: rdflib.IdentifiedNode = next(
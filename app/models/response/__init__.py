@@ -36,6 +36,40 @@ class GetConceptDescriptionsResult(BaseModel):
     result: Optional[List[ConceptDescription]] = None
 
 
+class GetProjectedConceptDescriptionsResult(BaseModel):
+    paging_metadata: PagingMetadata
+    result: Optional[List[dict]] = None
+
+
+class ConceptDescriptionVersion(BaseModel):
+    version: int
+    timestamp: str
+    deleted: Optional[bool] = None
+
+
+class GetConceptDescriptionVersionsResult(BaseModel):
+    paging_metadata: PagingMetadata
+    result: Optional[List[ConceptDescriptionVersion]] = None
+
+
+class ChangeEventType(Enum):
+    Created = "Created"
+    Updated = "Updated"
+    Deleted = "Deleted"
+
+
+class ChangeEvent(BaseModel):
+    sequence: str
+    type: ChangeEventType
+    id: str
+    timestamp: str
+
+
+class GetChangeEventsResult(BaseModel):
+    paging_metadata: PagingMetadata
+    result: Optional[List[ChangeEvent]] = None
+
+
 class MessageType(Enum):
     Undefined = "Undefined"
     Info = "Info"
@@ -95,6 +129,22 @@ class HealthResponse(BaseModel):
     uptime: str
 
 
+class ConnectionPoolStatus(BaseModel):
+    max_connections: int
+    created: int
+    in_use: int
+    saturation: float
+
+
+class ReadinessResponse(HealthResponse):
+    backend: str
+    latency_ms: Optional[float] = None
+    pool: Optional[ConnectionPoolStatus] = None
+    last_write: Optional[str] = None
+    checked_at: str
+    error: Optional[str] = None
+
+
 class APIException(Exception):
     message = """Unknown Error"""
     error_code = 500
@@ -130,6 +180,11 @@ class OperationNotAllowedException(APIException):
     error_code = 403
 
 
+class ProfilingInProgressException(APIException):
+    message = """A profile is already being recorded."""
+    error_code = 409
+
+
 class InvalidBase64URLIdentifier(APIException):
     message = """The provided identifier is not a valid base64url."""
     error_code = 403
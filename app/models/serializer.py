@@ -18,9 +18,15 @@
 #  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
 #  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
 #  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import re
+from typing import Dict, List, Optional, Tuple
+
+import rdflib
 from rdflib import URIRef
 from rdflib.plugins.serializers.turtle import TurtleSerializer
 
+from app.models.aas_namespace import AASNameSpace
+
 
 class TurtleSerializerCustom(TurtleSerializer):
     def getQName(self, uri, gen_prefix=True):
@@ -52,3 +58,116 @@ class TurtleSerializerCustom(TurtleSerializer):
         prefix = self.addNamespace(prefix, namespace)
 
         return "%s:%s" % (prefix, local)
+
+
+_LOCAL_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+
+
+class RDFWriter:
+    """
+    Graph like sink for the `to_rdf` methods of the models which writes Turtle or N-Triples text directly,
+    without building and indexing an rdflib Graph first. Blank nodes are labelled in order of appearance,
+    so the same model always produces the same document.
+    N-Triples are written while the triples are added, Turtle is grouped by subject and blank nodes that
+    are referenced exactly once are written inline.
+    """
+
+    def __init__(self, format: str = "turtle", bnode_prefix: str = "b"):
+        if format not in ("turtle", "nt"):
+            raise ValueError(f"Unsupported format {format}")
+        self.format = format
+        # documents which are concatenated later need distinct blank node labels
+        self.bnode_prefix = bnode_prefix
+        self.namespaces: Dict[str, str] = {}
+        self._seen = set()
+        self._terms: Dict[rdflib.term.Node, str] = {}
+        self._bnode_labels: Dict[rdflib.BNode, str] = {}
+        self._lines: List[str] = []
+        self._subjects: Dict[rdflib.term.Node, List[Tuple[rdflib.term.Node, rdflib.term.Node]]] = {}
+        self._references: Dict[rdflib.BNode, int] = {}
+
+    def bind(self, prefix: str, namespace, *args, **kwargs):
+        namespace = str(namespace)
+        # an empty namespace would turn every local name into a prefixed name
+        if namespace and prefix:
+            self.namespaces[prefix] = namespace
+            self._terms.clear()
+
+    def add(self, triple):
+        if triple in self._seen:
+            return self
+        self._seen.add(triple)
+        subject, predicate, obj = triple
+        if self.format == "nt":
+            self._lines.append(f"{self._term(subject)} {self._term(predicate)} {self._term(obj)} .\n")
+            return self
+        self._subjects.setdefault(subject, []).append((predicate, obj))
+        if isinstance(obj, rdflib.BNode):
+            self._references[obj] = self._references.get(obj, 0) + 1
+        return self
+
+    def __len__(self):
+        return len(self._seen)
+
+    def _term(self, term) -> str:
+        rendered = self._terms.get(term)
+        if rendered is not None:
+            return rendered
+        if isinstance(term, rdflib.BNode):
+            rendered = self._bnode_labels.setdefault(term, f"_:{self.bnode_prefix}{len(self._bnode_labels)}")
+            return rendered
+        if isinstance(term, URIRef):
+            rendered = term.n3()
+            if self.format == "turtle":
+                rendered = self._qname(term) or rendered
+        else:
+            rendered = term.n3()
+        self._terms[term] = rendered
+        return rendered
+
+    def _qname(self, uri: URIRef) -> Optional[str]:
+        if uri == rdflib.RDF.type:
+            return "a"
+        for prefix, namespace in self.namespaces.items():
+            if uri.startswith(namespace) and _LOCAL_NAME.match(uri[len(namespace) :]):
+                return f"{prefix}:{uri[len(namespace):]}"
+        return None
+
+    def _inline(self, node) -> bool:
+        return isinstance(node, rdflib.BNode) and self._references.get(node) == 1
+
+    def _write_properties(self, parts: List[str], subject, indent: str):
+        separator = ""
+        for predicate, obj in self._subjects.get(subject, []):
+            parts.append(f"{separator}{indent}{self._term(predicate)} ")
+            if self._inline(obj):
+                parts.append("[\n")
+                self._write_properties(parts, obj, indent + "    ")
+                parts.append(f"\n{indent}]")
+            else:
+                parts.append(self._term(obj))
+            separator = " ;\n"
+
+    def serialize(self, destination=None, format=None, encoding: Optional[str] = None, **kwargs):
+        if self.format == "nt":
+            text = "".join(self._lines)
+        else:
+            parts = [f"@prefix {prefix}: <{namespace}> .\n" for prefix, namespace in self.namespaces.items()]
+            if parts:
+                parts.append("\n")
+            for subject in self._subjects:
+                if self._inline(subject):
+                    continue
+                parts.append(f"{self._term(subject)}\n")
+                self._write_properties(parts, subject, "    ")
+                parts.append(" .\n\n")
+            text = "".join(parts)
+        return text.encode(encoding) if encoding else text
+
+
+def write_rdf(model, format: str = "turtle", bnode_prefix: str = "b", **kwargs) -> bytes:
+    """Serializes an RDFiable model with the RDFWriter, keyword arguments are passed to its `to_rdf`."""
+    writer = RDFWriter(format, bnode_prefix)
+    writer.bind("aas", AASNameSpace.AAS)
+    model.to_rdf(graph=writer, **kwargs)
+    return writer.serialize(encoding="utf-8")
@@ -0,0 +1,79 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import hashlib
+from collections import deque
+from typing import Dict
+
+import rdflib
+
+from app.models.aas_namespace import AASNameSpace
+from app.models.indexed_graph import IndexedGraph
+
+SKOLEM_ID_STRATEGY = "skolem"
+
+
+def _content_key(graph: IndexedGraph, node: rdflib.BNode) -> str:
+    # stable name for list members without aas:index, derived from their own non blank statements
+    statements = sorted(
+        f"{predicate.n3()} {obj.n3()}"
+        for predicate, objects in graph.predicate_objects(node)
+        for obj in objects
+        if not isinstance(obj, rdflib.BNode)
+    )
+    return hashlib.sha1("\n".join(statements).encode("utf-8")).hexdigest()[:12]
+
+
+def skolemize(graph: rdflib.Graph, root: rdflib.URIRef) -> rdflib.Graph:
+    """
+    Replaces the blank nodes reachable from `root` by IRIs derived from their parent IRI, the local name of the
+    predicate and the aas:index of list members, e.g. `<root>/isCaseOf/0/keys/0`. The same model therefore always
+    produces the same triples, which allows updating a triplestore by diffing the old and the new graph.
+    """
+    indexed = graph if isinstance(graph, IndexedGraph) else IndexedGraph(graph)
+    names: Dict[rdflib.BNode, rdflib.URIRef] = {}
+    used = set()
+    queue = deque([root])
+    while queue:
+        subject = queue.popleft()
+        parent = names.get(subject, subject)
+        for predicate, objects in indexed.predicate_objects(subject):
+            blank_objects = [obj for obj in objects if isinstance(obj, rdflib.BNode) and obj not in names]
+            for obj in blank_objects:
+                name = f"{parent}/{predicate[predicate.rfind('/') + 1:]}"
+                position = next(indexed.objects(subject=obj, predicate=AASNameSpace.INDEX), None)
+                if position is not None:
+                    name = f"{name}/{position}"
+                elif len(blank_objects) > 1:
+                    name = f"{name}/{_content_key(indexed, obj)}"
+                candidate, suffix = name, 1
+                while candidate in used:
+                    candidate, suffix = f"{name}-{suffix}", suffix + 1
+                used.add(candidate)
+                names[obj] = rdflib.URIRef(candidate)
+                queue.append(obj)
+
+    skolemized = rdflib.Graph()
+    for prefix, namespace in graph.namespaces() if isinstance(graph, rdflib.Graph) else []:
+        skolemized.bind(prefix, namespace)
+    for subject, predicate, obj in indexed:
+        skolemized.add((names.get(subject, subject), predicate, names.get(obj, obj)))
+    return skolemized
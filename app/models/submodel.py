@@ -68,10 +68,7 @@ class Submodel(Identifiable, HasKind, HasSemantics, Qualifiable, HasDataSpecific
             graph.bind("aas", AASNameSpace.AAS)
             graph.bind("myaas", base_uri)
 
-        if id_strategy == "base64-url-encode":
-            node = rdflib.URIRef(f"{base_uri}{base_64_url_encode(self.id)}")
-        else:
-            node = rdflib.URIRef(f"{base_uri}{url_encode(self.id)}")
+        node = self.rdf_node(base_uri, id_strategy)
         graph.add((node, RDF.type, AASNameSpace.AAS["Submodel"]))
         # Identifiable
         Identifiable.append_as_rdf(self, graph, node)
@@ -88,7 +85,7 @@ class Submodel(Identifiable, HasKind, HasSemantics, Qualifiable, HasDataSpecific
                 (
                     node,
                     AASNameSpace.AAS["HasKind/kind"],
-                    rdflib.URIRef(AASNameSpace.AAS[f"ModellingKind/{self.kind.value}"]),
+                    AASNameSpace.enum_uri(self.kind),
                 )
             )
         # Qualifiable
@@ -96,27 +93,41 @@ class Submodel(Identifiable, HasKind, HasSemantics, Qualifiable, HasDataSpecific
             for idx, qualifier_ref in enumerate(self.qualifiers):
                 created_node = rdflib.BNode()
                 graph.add((created_node, RDF.type, AASNameSpace.AAS["Qualifier"]))
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 Qualifier.append_as_rdf(qualifier_ref, graph, created_node)
                 graph.add((node, AASNameSpace.AAS["Qualifiable/qualifiers"], created_node))
         # submodelElements
-        if self.submodelElements:
-            for idx, submodel_element in enumerate(self.submodelElements):
-                # headache
-
-                common_pref = ""
-                if id_strategy == "base64-url-encode":
-                    common_pref = f"{base_64_url_encode(self.id)}/submodel-elements/"
-                else:
-                    common_pref = f"{url_encode(self.id+'/submodel-elements/')}"
-
-                _, created_node = submodel_element.to_rdf(
-                    graph, node, prefix_uri=common_pref, base_uri=base_uri, id_strategy=id_strategy
-                )
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
-                graph.add((node, AASNameSpace.AAS["Submodel/submodelElements"], created_node))
+        self.append_submodel_elements_as_rdf(graph, node, base_uri=base_uri, id_strategy=id_strategy)
         return graph, node
 
+    def rdf_node(self, base_uri: str = "", id_strategy: str = "") -> rdflib.URIRef:
+        if id_strategy == "base64-url-encode":
+            return rdflib.URIRef(f"{base_uri}{base_64_url_encode(self.id)}")
+        return rdflib.URIRef(f"{base_uri}{url_encode(self.id)}")
+
+    def append_submodel_elements_as_rdf(
+        self,
+        graph: rdflib.Graph,
+        node: rdflib.IdentifiedNode,
+        base_uri: str = "",
+        id_strategy: str = "",
+        start: int = 0,
+    ):
+        # start is the index of the first element, so the elements of a large submodel can be written in chunks
+        if not self.submodelElements:
+            return
+        # headache
+        if id_strategy == "base64-url-encode":
+            common_pref = f"{base_64_url_encode(self.id)}/submodel-elements/"
+        else:
+            common_pref = f"{url_encode(self.id+'/submodel-elements/')}"
+        for idx, submodel_element in enumerate(self.submodelElements, start):
+            _, created_node = submodel_element.to_rdf(
+                graph, node, prefix_uri=common_pref, base_uri=base_uri, id_strategy=id_strategy
+            )
+            graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
+            graph.add((node, AASNameSpace.AAS["Submodel/submodelElements"], created_node))
+
     @staticmethod
     def from_rdf(graph: rdflib.Graph, subject: rdflib.IdentifiedNode) -> "Submodel":
         # HasSemantics
@@ -61,7 +61,7 @@ class SubmodelElement(Referable, HasSemantics, Qualifiable, HasDataSpecification
             for idx, qualifier_ref in enumerate(self.qualifiers):
                 created_node = rdflib.BNode()
                 graph.add((created_node, RDF.type, AASNameSpace.AAS["Qualifier"]))
-                graph.add((created_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 Qualifier.append_as_rdf(qualifier_ref, graph, created_node)
                 graph.add((node, AASNameSpace.AAS["Qualifiable/qualifiers"], created_node))
         # HasDataSpecification
@@ -63,7 +63,7 @@ class SubmodelElementCollection(SubmodelElement):
                     base_uri=base_uri,
                     id_strategy=id_strategy,
                 )
-                graph.add((created_sub_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_sub_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((created_node, AASNameSpace.AAS["SubmodelElementCollection/value"], created_sub_node))
         return created_graph, created_node
 
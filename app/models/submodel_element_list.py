@@ -94,7 +94,7 @@ class SubmodelElementList(SubmodelElement):
             (
                 created_node,
                 AASNameSpace.AAS["SubmodelElementList/typeValueListElement"],
-                AASNameSpace.AAS[f"AasSubmodelElements/{self.typeValueListElement.name}"],
+                AASNameSpace.enum_uri(self.typeValueListElement),
             )
         )
         if self.valueTypeListElement:
@@ -102,7 +102,7 @@ class SubmodelElementList(SubmodelElement):
                 (
                     created_node,
                     AASNameSpace.AAS["SubmodelElementList/valueTypeListElement"],
-                    AASNameSpace.AAS[f"DataTypeDefXsd/{self.valueTypeListElement.name}"],
+                    AASNameSpace.enum_uri(self.valueTypeListElement),
                 )
             )
         if self.value:
@@ -114,7 +114,7 @@ class SubmodelElementList(SubmodelElement):
                     base_uri=base_uri,
                     id_strategy=id_strategy,
                 )
-                graph.add((created_sub_node, AASNameSpace.AAS["index"], rdflib.Literal(idx)))
+                graph.add((created_sub_node, AASNameSpace.INDEX, AASNameSpace.index_literal(idx)))
                 graph.add((created_node, AASNameSpace.AAS["SubmodelElementList/value"], created_sub_node))
 
         return created_graph, created_node
@@ -20,9 +20,7 @@
 #  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 import rdflib
-from rdflib import RDF
 
-from app.models.aas_namespace import AASNameSpace
 from app.models.annotated_relationship_element import AnnotatedRelationshipElement
 from app.models.basic_event_element import BasicEventElement
 from app.models.blob import Blob
@@ -33,6 +31,7 @@ from app.models.multi_language_property import MultiLanguageProperty
 from app.models.operation import Operation
 from app.models.property import Property
 from app.models.range import Range
+from app.models.rdfiable import from_typed_rdf
 from app.models.reference_element import ReferenceElement
 from app.models.relationship_element import RelationshipElement
 from app.models.submodel_element import SubmodelElement
@@ -41,37 +40,5 @@ from app.models.submodel_element_list import SubmodelElementList
 
 
 def from_unknown_rdf(graph: rdflib.Graph, subject: rdflib.IdentifiedNode) -> SubmodelElement:
-    # use modeltype as discriminator
-    # This is my worst code ever :)
-    type_ref: rdflib.URIRef = next(
-        graph.objects(subject=subject, predicate=RDF.type),
-        None,
-    )
-    if type_ref == AASNameSpace.AAS["AnnotatedRelationshipElement"]:
-        return AnnotatedRelationshipElement.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["RelationshipElement"]:
-        return RelationshipElement.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["BasicEventElement"]:
-        return BasicEventElement.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["Blob"]:
-        return Blob.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["File"]:
-        return File.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["MultiLanguageProperty"]:
-        return MultiLanguageProperty.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["Property"]:
-        return Property.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["Range"]:
-        return Range.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["ReferenceElement"]:
-        return ReferenceElement.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["SubmodelElementCollection"]:
-        return SubmodelElementCollection.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["SubmodelElementList"]:
-        return SubmodelElementList.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["Entity"]:
-        return Entity.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["Capability"]:
-        return Capability.from_rdf(graph, subject)
-    if type_ref == AASNameSpace.AAS["Operation"]:
-        return Operation.from_rdf(graph, subject)
+    # rdf:type is the discriminator, the imports above register every submodel element type
+    return from_typed_rdf(graph, subject, SubmodelElement)
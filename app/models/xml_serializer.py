@@ -0,0 +1,208 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Iterable, Iterator, List
+from xml.sax.saxutils import escape
+
+from app.models.concept_description import ConceptDescription
+
+AAS_XML_NAMESPACE = "https://admin-shell.io/aas/3/0"
+
+# The XML mapping of AAS V3 is driven by the element order of AAS.xsd, so every type lists its
+# properties in schema order as (property, nested type, list item element).
+# A nested type of None is a plain text element, "bool" is an xs:boolean.
+XML_SCHEMA = {
+    "conceptDescription": [
+        ("extensions", "extension", "extension"),
+        ("category", None, None),
+        ("idShort", None, None),
+        ("displayName", "langString", "langStringNameType"),
+        ("description", "langString", "langStringTextType"),
+        ("administration", "administrativeInformation", None),
+        ("id", None, None),
+        ("embeddedDataSpecifications", "embeddedDataSpecification", "embeddedDataSpecification"),
+        ("isCaseOf", "reference", "reference"),
+    ],
+    "extension": [
+        ("semanticId", "reference", None),
+        ("supplementalSemanticIds", "reference", "reference"),
+        ("name", None, None),
+        ("valueType", None, None),
+        ("value", None, None),
+        ("refersTo", "reference", "reference"),
+    ],
+    "administrativeInformation": [
+        ("embeddedDataSpecifications", "embeddedDataSpecification", "embeddedDataSpecification"),
+        ("version", None, None),
+        ("revision", None, None),
+        ("creator", "reference", None),
+        ("templateId", None, None),
+    ],
+    "embeddedDataSpecification": [
+        ("dataSpecification", "reference", None),
+        ("dataSpecificationContent", "dataSpecificationContent", None),
+    ],
+    "dataSpecificationIec61360": [
+        ("preferredName", "langString", "langStringPreferredNameTypeIec61360"),
+        ("shortName", "langString", "langStringShortNameTypeIec61360"),
+        ("unit", None, None),
+        ("unitId", "reference", None),
+        ("sourceOfDefinition", None, None),
+        ("symbol", None, None),
+        ("dataType", None, None),
+        ("definition", "langString", "langStringDefinitionTypeIec61360"),
+        ("valueFormat", None, None),
+        ("valueList", "valueList", None),
+        ("value", None, None),
+        ("levelType", "levelType", None),
+    ],
+    "valueList": [("valueReferencePairs", "valueReferencePair", "valueReferencePair")],
+    "valueReferencePair": [("value", None, None), ("valueId", "reference", None)],
+    "levelType": [("min", "bool", None), ("nom", "bool", None), ("typ", "bool", None), ("max", "bool", None)],
+    "reference": [("type", None, None), ("referredSemanticId", "reference", None), ("keys", "key", "key")],
+    "key": [("type", None, None), ("value", None, None)],
+    "langString": [("language", None, None), ("text", None, None)],
+}
+
+# Choice elements wrap their content in an element named after the modelType.
+XML_CHOICES = {"dataSpecificationContent": {"DataSpecificationIec61360": "dataSpecificationIec61360"}}
+
+# Text elements holding enumeration values or language tags, which may be surrounded by whitespace. All other text
+# is kept verbatim.
+XML_TOKENS = {"type", "valueType", "dataType", "language"}
+
+# Types that carry a modelType in JSON but not in XML.
+XML_MODEL_TYPES = {"conceptDescription": "ConceptDescription", "dataSpecificationIec61360": "DataSpecificationIec61360"}
+
+
+def _write_element(parts: List[str], name: str, xml_type: str, value):
+    if xml_type is None:
+        parts.append(f"<{name}>{escape(str(value))}</{name}>")
+        return
+    if xml_type == "bool":
+        parts.append(f"<{name}>{'true' if value else 'false'}</{name}>")
+        return
+    parts.append(f"<{name}>")
+    if xml_type in XML_CHOICES:
+        choice = XML_CHOICES[xml_type][value["modelType"]]
+        _write_element(parts, choice, choice, value)
+    else:
+        for prop, nested_type, item in XML_SCHEMA[xml_type]:
+            prop_value = value.get(prop)
+            if prop_value is None:
+                continue
+            if item is None:
+                _write_element(parts, prop, nested_type, prop_value)
+                continue
+            parts.append(f"<{prop}>")
+            for entry in prop_value:
+                _write_element(parts, item, nested_type, entry)
+            parts.append(f"</{prop}>")
+    parts.append(f"</{name}>")
+
+
+def _concept_description_parts(concept: ConceptDescription) -> List[str]:
+    parts = []
+    _write_element(
+        parts, "conceptDescription", "conceptDescription", concept.model_dump(mode="json", exclude_none=True)
+    )
+    return parts
+
+
+def concept_description_to_xml(concept: ConceptDescription) -> bytes:
+    parts = _concept_description_parts(concept)
+    parts[0] = f'<conceptDescription xmlns="{AAS_XML_NAMESPACE}">'
+    return "".join(parts).encode("utf-8")
+
+
+def stream_concept_descriptions_as_xml(concepts: Iterable[ConceptDescription]) -> Iterator[bytes]:
+    """Writes the concepts as an AAS environment, one chunk per concept description."""
+    yield f'<?xml version="1.0" encoding="UTF-8"?><environment xmlns="{AAS_XML_NAMESPACE}"><conceptDescriptions>'.encode(
+        "utf-8"
+    )
+    for concept in concepts:
+        yield "".join(_concept_description_parts(concept)).encode("utf-8")
+    yield b"</conceptDescriptions></environment>"
+
+
+def _local_name(element: ET.Element) -> str:
+    return element.tag.rsplit("}", 1)[-1]
+
+
+def _read_element(element: ET.Element, xml_type: str):
+    if xml_type is None:
+        text = element.text or ""
+        # pretty printed documents may wrap enumeration values in whitespace
+        return text.strip() if _local_name(element) in XML_TOKENS else text
+    if xml_type == "bool":
+        return (element.text or "").strip() == "true"
+    if xml_type in XML_CHOICES:
+        choices = {name: model_type for model_type, name in XML_CHOICES[xml_type].items()}
+        child = next(iter(element), None)
+        if child is None or _local_name(child) not in choices:
+            raise ValueError(f"Unsupported content in {_local_name(element)}")
+        return _read_element(child, _local_name(child))
+
+    schema = {prop: (nested_type, item) for prop, nested_type, item in XML_SCHEMA[xml_type]}
+    document = {}
+    if xml_type in XML_MODEL_TYPES:
+        document["modelType"] = XML_MODEL_TYPES[xml_type]
+    for child in element:
+        prop = _local_name(child)
+        if prop not in schema:
+            raise ValueError(f"Unexpected element {prop} in {_local_name(element)}")
+        nested_type, item = schema[prop]
+        if item is None:
+            document[prop] = _read_element(child, nested_type)
+        else:
+            document[prop] = [_read_element(entry, nested_type) for entry in child]
+    return document
+
+
+def concept_description_document_from_xml(data: bytes) -> dict:
+    """Parses a conceptDescription XML element into its JSON document."""
+    root = ET.fromstring(data)
+    if _local_name(root) != "conceptDescription":
+        raise ValueError(f"Expected conceptDescription but got {_local_name(root)}")
+    return _read_element(root, "conceptDescription")
+
+
+def iter_concept_description_documents_from_xml(source: BinaryIO) -> Iterator[dict]:
+    """
+    Reads the conceptDescription elements of an AAS environment one after another. Elements are dropped as soon as
+    they were read, so large environments are never held in memory as a whole.
+    """
+    inside = False
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        name = _local_name(element)
+        if event == "start":
+            inside = inside or name == "conceptDescription"
+        elif name == "conceptDescription":
+            yield _read_element(element, "conceptDescription")
+            inside = False
+            element.clear()
+        elif not inside:
+            element.clear()
+
+
+def concept_description_from_xml(data: bytes) -> ConceptDescription:
+    return ConceptDescription(**concept_description_document_from_xml(data))
@@ -0,0 +1,180 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _frame_label(code) -> str:
+    # the first line keeps the functions apart without splitting them by the line currently executed
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads every `interval` seconds from a background thread and counts them in the
+    collapsed stack format of flamegraph.pl and speedscope, one "outermost;...;innermost count" line per stack.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stopped.set()
+        self._thread.join()
+        return self.collapsed()
+
+    def _run(self):
+        own_thread = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                self.sample(frame)
+            self.samples += 1
+
+    def sample(self, frame):
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        self.stacks[";".join(reversed(labels))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# durations in seconds of the current request by Server-Timing metric name, None outside a timed request
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("server_timings", default=None)
+# start of the route handler and end of the endpoint of the current request
+_route_started: ContextVar[float] = ContextVar("route_started", default=0.0)
+_endpoint_finished: ContextVar[float] = ContextVar("endpoint_finished", default=0.0)
+
+
+def add_server_timing(name: str, duration: float):
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + duration
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={duration * 1000:.3f}" for name, duration in timings.items())
+
+
+def _timed_endpoint(call):
+    # everything FastAPI does between the start of the route handler and the endpoint, i.e. reading and
+    # decoding the body, resolving dependencies and validating the payload, is reported as validation
+    def started():
+        add_server_timing("validation", time.perf_counter() - _route_started.get())
+
+    if inspect.iscoroutinefunction(call):
+
+        @functools.wraps(call)
+        async def timed(*args, **kwargs):
+            started()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _endpoint_finished.set(time.perf_counter())
+
+    else:
+
+        @functools.wraps(call)
+        def timed(*args, **kwargs):
+            started()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                _endpoint_finished.set(time.perf_counter())
+
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """Reports the validation before the endpoint and the encoding of its return value in the Server-Timing header."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # the request handler looks the endpoint up on the dependant at request time
+        self.dependant.call = _timed_endpoint(self.dependant.call)
+
+    def get_route_handler(self):
+        route_handler = super().get_route_handler()
+
+        async def timed_route_handler(request):
+            if _timings.get() is None:
+                return await route_handler(request)
+            _route_started.set(time.perf_counter())
+            response = await route_handler(request)
+            # endpoints returning models are validated and encoded by FastAPI after the endpoint returned
+            add_server_timing("serialization", time.perf_counter() - _endpoint_finished.get())
+            return response
+
+        return timed_route_handler
+
+
+class ServerTimingMiddleware:
+    """
+    Reports where the time of a request went in a Server-Timing header: the validation before the endpoint runs,
+    the repository calls, the serialization and the total time until the response started.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = {}
+        token = _timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_with_timings(message: Message):
+            if message["type"] == "http.response.start":
+                timings["total"] = time.perf_counter() - started
+                MutableHeaders(scope=message).append("Server-Timing", format_server_timing(timings))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            _timings.reset(token)
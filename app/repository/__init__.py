@@ -25,22 +25,33 @@ import os
 from base64 import urlsafe_b64encode, urlsafe_b64decode
 
 from app.config import get_config
+from app.metrics import instrument_repository
 from app.models.concept_description import ConceptDescription
 from app.repository.concept_description_repository import ConceptDescriptionRepository
-from app.repository.impl.graphdb_cd_repository import GraphDBConceptDescriptionRepository
-from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
-
-
-if get_config().db_backend == "redis":
-    cd_repository = RedisConceptDescriptionRepository()
-elif get_config().db_backend == "neo4j":
-    raise NotImplemented()
-elif get_config().db_backend == "mongodb":
-    raise NotImplemented()
-elif get_config().db_backend == "graphdb":
-    cd_repository = GraphDBConceptDescriptionRepository()
-else:
-    raise Exception("Invalid backend provided: redis, neo4j, mongodb")
+from app.repository.caching_repository import CachingConceptDescriptionRepository
+from app.repository.registry import compose_repository, db_setting, primary_repository_settings
+from app.tracing import trace_repository
+
+# only the modules of the configured backends are imported, the GraphDB backend pulls in requests for example
+_, primary_settings = primary_repository_settings(get_config())
+cd_backend = primary_settings.backend
+# passed to connect_to_database of the repository, the other named repositories connect with their own settings
+cd_db_setting = db_setting(primary_settings, get_config())
+cd_repository = compose_repository(get_config())
+
+if get_config().local_cache_entries > 0:
+    cd_repository = CachingConceptDescriptionRepository(
+        cd_repository,
+        get_config().local_cache_entries,
+        get_config().local_cache_invalidation_uri,
+        get_config().local_cache_verify_interval,
+    )
+
+if get_config().metrics_enabled or get_config().server_timing_enabled:
+    instrument_repository(cd_repository, cd_backend)
+
+if get_config().tracing_exporter not in ("", "none"):
+    trace_repository(cd_repository, cd_backend)
 
 
 async def get_repository() -> ConceptDescriptionRepository:
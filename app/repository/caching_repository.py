@@ -0,0 +1,171 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import List, Optional
+
+import redis
+from starlette.concurrency import run_in_threadpool
+
+from app.metrics import record_cache_lookup
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.models.projection import Projection
+from app.models.response import (
+    GetConceptDescriptionsResult,
+    GetConceptDescriptionVersionsResult,
+    GetProjectedConceptDescriptionsResult,
+)
+from app.repository.change_feed import ChangeFeed
+from app.repository.concept_description_repository import ConceptDescriptionRepository
+from app.repository.local_cache import CacheInvalidator, LocalCache
+from app.repository.replicated_repository import primary_reads
+
+MODEL_VARIANT = "model"
+
+
+class CachingConceptDescriptionRepository(ConceptDescriptionRepository):
+    """
+    Keeps the concept descriptions read through this process in a local cache in front of another repository.
+    Writes of any process invalidate the cached entries over Redis pub/sub, see CacheInvalidator.
+    """
+
+    def __init__(
+        self,
+        repository: ConceptDescriptionRepository,
+        max_entries: int = 1024,
+        invalidation_uri: str = None,
+        verify_interval: float = 5.0,
+    ):
+        self.repository = repository
+        self.cache = LocalCache(max_entries)
+        self.invalidation_uri = invalidation_uri
+        self.verify_interval = verify_interval
+        self.invalidator: CacheInvalidator = None
+
+    async def connect_to_database(self, db_setting: dict):
+        await self.repository.connect_to_database(db_setting)
+        client = redis.Redis.from_url(self.invalidation_uri or db_setting["DB_URI"])
+        self.start_invalidation(client)
+
+    def start_invalidation(self, client: redis.Redis):
+        self.invalidator = CacheInvalidator(client, self.verify_interval)
+        self.invalidator.register(self.cache)
+        self.invalidator.start()
+
+    async def close_database_connection(self):
+        if self.invalidator is not None:
+            self.invalidator.stop()
+        await self.repository.close_database_connection()
+
+    async def _cached(self, key: str, variant: str, load):
+        if self.invalidator is None or not self.invalidator.verify():
+            return await load()
+        value = self.cache.get(key, variant)
+        record_cache_lookup("local", value is not None)
+        if value is None:
+            epoch = self.invalidator.epoch
+            # the invalidation of a write may arrive before the replicas caught up
+            with primary_reads():
+                value = await load()
+            # an invalidation received while loading may refer to an older value
+            if self.invalidator.epoch == epoch:
+                self.cache.put(key, variant, value)
+        return value
+
+    async def get_concept_description(self, cd_id_base64url_encoded: str) -> ConceptDescription:
+        return await self._cached(
+            cd_id_base64url_encoded,
+            MODEL_VARIANT,
+            lambda: self.repository.get_concept_description(cd_id_base64url_encoded),
+        )
+
+    async def get_concept_description_encoded(self, cd_id_base64url_encoded: str, media_type: str) -> bytes:
+        return await self._cached(
+            cd_id_base64url_encoded,
+            media_type,
+            lambda: self.repository.get_concept_description_encoded(cd_id_base64url_encoded, media_type),
+        )
+
+    async def _written(self, cd_id_base64url_encoded: str):
+        if self.invalidator is not None:
+            await run_in_threadpool(self.invalidator.publish, cd_id_base64url_encoded)
+
+    async def add_concept_description(self, concept_description: ConceptDescription) -> ConceptDescription:
+        result = await self.repository.add_concept_description(concept_description)
+        await self._written(base_64_url_encode(concept_description.id))
+        return result
+
+    async def add_concept_descriptions(self, concept_descriptions: List[ConceptDescription]) -> List[str]:
+        added = await self.repository.add_concept_descriptions(concept_descriptions)
+        for cd_id_base64url_encoded in added:
+            await self._written(cd_id_base64url_encoded)
+        return added
+
+    async def update_concept_description(
+        self, cd_id_base64url_encoded: str, concept_description: ConceptDescription
+    ) -> bool:
+        result = await self.repository.update_concept_description(cd_id_base64url_encoded, concept_description)
+        await self._written(cd_id_base64url_encoded)
+        return result
+
+    async def delete_concept_description(self, cd_id_base64url_encoded: str) -> bool:
+        result = await self.repository.delete_concept_description(cd_id_base64url_encoded)
+        await self._written(cd_id_base64url_encoded)
+        return result
+
+    async def get_concept_descriptions(self, query: dict, cursor=None, limit=100) -> GetConceptDescriptionsResult:
+        return await self.repository.get_concept_descriptions(query, cursor=cursor, limit=limit)
+
+    async def get_concept_descriptions_projected(
+        self, query: dict, projection: Projection, cursor=None, limit=100
+    ) -> GetProjectedConceptDescriptionsResult:
+        return await self.repository.get_concept_descriptions_projected(query, projection, cursor=cursor, limit=limit)
+
+    async def get_concept_description_projected(self, cd_id_base64url_encoded: str, projection: Projection) -> dict:
+        return await self.repository.get_concept_description_projected(cd_id_base64url_encoded, projection)
+
+    async def get_concept_description_history(
+        self, cd_id_base64url_encoded: str, cursor=None, limit=100
+    ) -> GetConceptDescriptionsResult:
+        return await self.repository.get_concept_description_history(cd_id_base64url_encoded, cursor, limit)
+
+    async def get_concept_description_versions(
+        self, cd_id_base64url_encoded: str, cursor=None, limit=100
+    ) -> GetConceptDescriptionVersionsResult:
+        return await self.repository.get_concept_description_versions(cd_id_base64url_encoded, cursor, limit)
+
+    async def get_concept_description_version(self, cd_id_base64url_encoded: str, version: int) -> ConceptDescription:
+        return await self.repository.get_concept_description_version(cd_id_base64url_encoded, version)
+
+    async def ping(self, timeout: float):
+        return await self.repository.ping(timeout)
+
+    async def get_seed_version(self) -> Optional[str]:
+        return await self.repository.get_seed_version()
+
+    async def set_seed_version(self, version: str):
+        await self.repository.set_seed_version(version)
+
+    def get_change_feed(self) -> ChangeFeed:
+        return self.repository.get_change_feed()
+
+    def get_repository_metadata(self):
+        return self.repository.get_repository_metadata()
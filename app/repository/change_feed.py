@@ -0,0 +1,111 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import re
+from abc import abstractmethod
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, List, Optional
+
+import redis
+from starlette.concurrency import run_in_threadpool
+
+from app.models.response import ChangeEvent, ChangeEventType, InvalidPayloadException
+
+
+class ChangeFeed(object):
+    """
+    Ordered log of the mutations of the concept descriptions. Events carry the base64url encoded id only, consumers
+    read the concept itself if they need it. The sequence of an event is an opaque cursor to resume after it.
+    """
+
+    poll_interval: float = 1.0
+
+    @abstractmethod
+    def append(self, event_type: ChangeEventType, cd_id_base64url_encoded: str) -> str:
+        pass
+
+    @abstractmethod
+    def read(self, after: Optional[str] = None, limit: int = 100) -> List[ChangeEvent]:
+        pass
+
+    @abstractmethod
+    def last(self) -> Optional[ChangeEvent]:
+        pass
+
+    async def follow(
+        self, after: Optional[str] = None, limit: int = 100, is_closed: Callable = None
+    ) -> AsyncIterator[List[ChangeEvent]]:
+        """Yields the new events in batches, an empty batch whenever a poll found nothing."""
+        while is_closed is None or not await is_closed():
+            # a blocking request to the backend, kept off the event loop
+            events = await run_in_threadpool(self.read, after, limit)
+            if events:
+                after = events[-1].sequence
+            yield events
+            if len(events) < limit:
+                await asyncio.sleep(self.poll_interval)
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+STREAM_ID_PATTERN = re.compile(r"\d+(-\d+)?")
+
+
+class RedisChangeFeed(ChangeFeed):
+    """Change feed on a Redis stream, the stream entry ids are the sequences."""
+
+    key = "changes:concept-descriptions"
+
+    def __init__(self, client: redis.Redis, max_events: int = 100_000, poll_interval: float = 1.0):
+        self.client = client
+        self.max_events = max_events
+        self.poll_interval = poll_interval
+
+    def append(self, event_type: ChangeEventType, cd_id_base64url_encoded: str, pipe=None) -> Optional[str]:
+        """Appends the event, queued on `pipe` if given so that it is written in the same transaction."""
+        return (pipe or self.client).xadd(
+            self.key,
+            {"type": event_type.value, "id": cd_id_base64url_encoded, "timestamp": _timestamp()},
+            maxlen=self.max_events,
+            approximate=True,
+        )
+
+    @staticmethod
+    def _event(entry_id: bytes, fields: dict) -> ChangeEvent:
+        return ChangeEvent(
+            sequence=entry_id.decode(),
+            type=fields[b"type"].decode(),
+            id=fields[b"id"].decode(),
+            timestamp=fields[b"timestamp"].decode(),
+        )
+
+    def read(self, after: Optional[str] = None, limit: int = 100) -> List[ChangeEvent]:
+        if after and not STREAM_ID_PATTERN.fullmatch(after):
+            raise InvalidPayloadException()
+        entries = self.client.xrange(self.key, min=f"({after}" if after else "-", count=limit)
+        return [self._event(entry_id, fields) for entry_id, fields in entries]
+
+    def last(self) -> Optional[ChangeEvent]:
+        entries = self.client.xrevrange(self.key, count=1)
+        return self._event(*entries[0]) if entries else None
@@ -21,13 +21,38 @@
 
 from abc import abstractmethod
 
-from typing import List, Union
+from typing import List, Optional, Union
 
+from app.config import get_config
+from app.models import base_64_url_decode, base_64_url_encode
+from app.models.codec import encode_model
 from app.models.concept_description import ConceptDescription
-from app.models.response import GetConceptDescriptionsResult, Result, RepositoryMetadata
+from app.models.projection import Projection, project_document
+from app.models.response import (
+    ConnectionPoolStatus,
+    DuplicateConceptException,
+    GetConceptDescriptionsResult,
+    GetConceptDescriptionVersionsResult,
+    GetProjectedConceptDescriptionsResult,
+    OperationNotAllowedException,
+    Result,
+    RepositoryMetadata,
+)
+from app.repository.change_feed import ChangeFeed
+
+
+def encode_history_cursor(start: Optional[int]) -> str:
+    """The cursor of a history page starting at version `start`, empty if there is none."""
+    return base_64_url_encode(str(start)) if start else ""
+
+
+def decode_history_cursor(cursor: Optional[str]) -> int:
+    return int(base_64_url_decode(cursor)) if cursor else 0
 
 
 class ConceptDescriptionRepository(object):
+    change_feed: ChangeFeed = None
+
     @abstractmethod
     async def connect_to_database(self, db_setting: dict):
         pass
@@ -36,18 +61,66 @@ class ConceptDescriptionRepository(object):
     async def close_database_connection(self):
         pass
 
+    async def connect_as_cache(self, db_setting: dict, ttl: float):
+        """
+        Connects the repository as a cache tier, see TieredConceptDescriptionRepository. Entries expire after `ttl`
+        seconds and writes record neither history nor change events. Only backends with expiring entries can do so.
+        """
+        raise ValueError(f"{type(self).__name__} can not be used as a cache")
+
     @abstractmethod
     async def get_concept_descriptions(self, query: dict, cursor=None, limit=100) -> GetConceptDescriptionsResult:
         pass
 
+    async def get_concept_descriptions_projected(
+        self, query: dict, projection: Projection, cursor=None, limit=100
+    ) -> GetProjectedConceptDescriptionsResult:
+        # Backends that can select fields while reading override this to skip model validation.
+        result = await self.get_concept_descriptions(query=query, cursor=cursor, limit=limit)
+        return GetProjectedConceptDescriptionsResult(
+            paging_metadata=result.paging_metadata,
+            result=[
+                project_document(concept.model_dump(mode="json", exclude_none=True), projection)
+                for concept in result.result or []
+            ],
+        )
+
     @abstractmethod
     async def get_concept_description(self, cd_id_base64url_encoded: str) -> ConceptDescription:
         pass
 
+    async def get_concept_description_projected(self, cd_id_base64url_encoded: str, projection: Projection) -> dict:
+        concept = await self.get_concept_description(cd_id_base64url_encoded)
+        return project_document(concept.model_dump(mode="json", exclude_none=True), projection)
+
+    async def get_concept_description_encoded(self, cd_id_base64url_encoded: str, media_type: str) -> bytes:
+        # Backends that keep the encoded document override this to skip validation and transcoding.
+        concept = await self.get_concept_description(cd_id_base64url_encoded)
+        return encode_model(concept, media_type)
+
     @abstractmethod
     async def add_concept_description(self, concept_description: ConceptDescription) -> ConceptDescription:
         pass
 
+    async def add_concept_descriptions(self, concept_descriptions: List[ConceptDescription]) -> List[str]:
+        """Adds the concept descriptions that do not exist yet and returns the base64url encoded ids of the added ones."""
+        # Backends override this to write the whole batch at once.
+        added = []
+        for concept_description in concept_descriptions:
+            try:
+                await self.add_concept_description(concept_description)
+                added.append(base_64_url_encode(concept_description.id))
+            except DuplicateConceptException:
+                pass
+        return added
+
+    async def get_seed_version(self) -> Optional[str]:
+        """The version of the seed data loaded into the backend, None if no seed data was loaded."""
+        return None
+
+    async def set_seed_version(self, version: str):
+        pass
+
     @abstractmethod
     async def update_concept_description(
         self, cd_id_base64url_encoded: str, concept_description: ConceptDescription
@@ -58,6 +131,17 @@ class ConceptDescriptionRepository(object):
     async def delete_concept_description(self, cd_id_base64url_encoded: str) -> bool:
         pass
 
+    async def ping(self, timeout: float) -> Optional[ConnectionPoolStatus]:
+        """Checks the connection to the backend and returns the usage of the connection pool, if there is one."""
+        return None
+
+    def get_change_feed(self) -> ChangeFeed:
+        # A feed of this process only would give cursors that other processes do not know and miss their writes,
+        # so backends without a log shared by all processes have no change feed.
+        if self.change_feed is None:
+            raise OperationNotAllowedException()
+        return self.change_feed
+
     def get_repository_metadata(self) -> RepositoryMetadata:
         pass
 
@@ -66,3 +150,12 @@ class ConceptDescriptionRepository(object):
         self, cd_id_base64url_encoded: str, cursor=None, limit=100
     ) -> GetConceptDescriptionsResult:
         pass
+
+    async def get_concept_description_versions(
+        self, cd_id_base64url_encoded: str, cursor=None, limit=100
+    ) -> GetConceptDescriptionVersionsResult:
+        # Only backends with a versioned history store support addressing single versions.
+        raise OperationNotAllowedException()
+
+    async def get_concept_description_version(self, cd_id_base64url_encoded: str, version: int) -> ConceptDescription:
+        raise OperationNotAllowedException()
@@ -19,23 +19,37 @@
 #  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
 #  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 import json
+import re
 import urllib
-from typing import Union
+from typing import List, Optional, Tuple, Union
 from itertools import zip_longest
 
 import rdflib
 
+from app.config import get_config
 from app.models.concept_description import ConceptDescription
+from app.models.indexed_graph import IndexedGraph
+from app.models.rdf_delta import RDFDelta, diff_triples, triples_from_text, triples_to_text
+from app.models.skolem import SKOLEM_ID_STRATEGY
 from app.models.response import (
+    ConceptDescriptionVersion,
     GetConceptDescriptionsResult,
+    GetConceptDescriptionVersionsResult,
     Result,
     ConceptNotFoundException,
     DuplicateConceptException,
     UpdatePayloadIDMismatchException,
+    ChangeEvent,
+    ChangeEventType,
+    InvalidPayloadException,
 )
 from app.repository import ConceptDescriptionRepository
+from app.repository.change_feed import ChangeFeed
+from app.repository.concept_description_repository import decode_history_cursor, encode_history_cursor
+from app.tracing import span
 from datetime import datetime, timezone
 import requests
+from starlette.concurrency import run_in_threadpool
 from app.models import (
     base_64_url_encode,
     base_64_url_decode,
@@ -47,11 +61,163 @@ def sanitize_for_turtle(input_str: str) -> str:
     return input_str.replace('"', '\\"')
 
 
+# version of the history record and base64url encoded concept id
+SEQUENCE_PATTERN = re.compile(r"\d+-[A-Za-z0-9_-]+")
+
+
+class GraphDBChangeFeed(ChangeFeed):
+    """
+    Change feed on the history records of the GraphDB backend, so all processes share it. The sequence of an event
+    is the version of its record, a timestamp in microseconds, and the concept id. Records are read once they are
+    `settle_seconds` old, otherwise followers could skip a write of another process that committed after a write
+    with a later timestamp.
+    """
+
+    def __init__(self, repository: "GraphDBConceptDescriptionRepository", poll_interval=1.0, settle_seconds=1.0):
+        self.repository = repository
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+
+    def append(self, event_type: ChangeEventType, cd_id_base64url_encoded: str) -> Optional[str]:
+        # the repository writes the event together with the history record
+        return None
+
+    def _events(self, filters: str, order: str, limit: int) -> List[ChangeEvent]:
+        history = self.repository.HISTORY
+        rows = self.repository._select(
+            f"SELECT ?record ?concept ?version ?timestamp ?type WHERE {{ "
+            f"GRAPH {self.repository.history_graph.n3()} {{ ?record {history.concept.n3()} ?concept ; "
+            f"{history.version.n3()} ?version ; {history.timestamp.n3()} ?timestamp . "
+            f"OPTIONAL {{ ?record {history.type.n3()} ?type }} }} {filters} }} ORDER BY {order} LIMIT {limit}"
+        )
+        events = []
+        for row in rows:
+            identifier = row["concept"][len(self.repository.base_prefix) + 1 :]
+            events.append(
+                ChangeEvent(
+                    sequence=f"{row['version']}-{identifier}",
+                    # records written before the feed have no type
+                    type=row.get("type", ChangeEventType.Updated.value),
+                    id=identifier,
+                    timestamp=row["timestamp"],
+                )
+            )
+        return events
+
+    def read(self, after: Optional[str] = None, limit: int = 100) -> List[ChangeEvent]:
+        settled = int((datetime.now(timezone.utc).timestamp() - self.settle_seconds) * 1_000_000)
+        filters = f"FILTER(?version <= {settled})"
+        if after:
+            # the cursor comes from the client
+            if not SEQUENCE_PATTERN.fullmatch(after):
+                raise InvalidPayloadException()
+            version, _, identifier = after.partition("-")
+            record = rdflib.Literal(f"{self.repository.history_graph}/{identifier}/{version}").n3()
+            filters += f" FILTER(?version > {version} || (?version = {version} && STR(?record) > {record}))"
+        return self._events(filters, "?version STR(?record)", limit)
+
+    def last(self) -> Optional[ChangeEvent]:
+        events = self._events("", "DESC(?version)", 1)
+        return events[0] if events else None
+
+
 class GraphDBConceptDescriptionRepository(ConceptDescriptionRepository):
     graphdb_endpoint = "http://127.0.0.1:7200"  # GraphDB endpoint
     repository_name = "aas"  # GraphDB repository name
     base_url = f"{graphdb_endpoint}/repositories/{repository_name}/statements"
     base_prefix = "https://aasbrain"
+    query_url = f"{graphdb_endpoint}/repositories/{repository_name}"
+    # every change of a concept is recorded as the added and removed triples in this named graph
+    history_graph = rdflib.URIRef(f"{base_prefix}/history")
+    HISTORY = rdflib.Namespace(f"{base_prefix}/history#")
+    # records the version of the loaded seed data
+    seed_node = rdflib.URIRef(f"{base_prefix}/seed")
+    SEED = rdflib.Namespace(f"{base_prefix}/seed#")
+
+    def _concept_uri(self, cd_identifier_base64url: str) -> rdflib.URIRef:
+        return rdflib.URIRef(f"{self.base_prefix}/{cd_identifier_base64url}")
+
+    def _construct(self, query: str) -> rdflib.Graph:
+        response = requests.post(self.query_url, data={"query": query}, headers={"Accept": "application/n-triples"})
+        response.raise_for_status()
+        with span("rdf.parse", format="nt", size=len(response.content)):
+            return rdflib.Graph().parse(data=response.content, format="nt")
+
+    def _select(self, query: str) -> list:
+        response = requests.post(
+            self.query_url, data={"query": query}, headers={"Accept": "application/sparql-results+json"}
+        )
+        response.raise_for_status()
+        return [
+            {name: value["value"] for name, value in binding.items()}
+            for binding in response.json()["results"]["bindings"]
+        ]
+
+    def _update(self, update: str):
+        response = requests.post(
+            self.base_url, data=update.encode("utf-8"), headers={"Content-Type": "application/sparql-update"}
+        )
+        response.raise_for_status()
+
+    def _concept_nodes(self, uri: rdflib.URIRef) -> str:
+        # The nested nodes are walked from the bound concept subject, rdf:type links into the ontology are skipped.
+        # The prefix check keeps IRIs outside of the concept out, if a value happens to point to one, blank nodes are
+        # the nested nodes of concepts stored before skolemization.
+        return (
+            f"{uri.n3()} (!{rdflib.RDF.type.n3()})* ?s . "
+            f'FILTER(?s = {uri.n3()} || STRSTARTS(STR(?s), "{uri}/") || isBlank(?s))'
+        )
+
+    def fetch_concept_graph(self, uri: rdflib.URIRef) -> rdflib.Graph:
+        """Fetches the concept node and all skolemized or blank nodes below it."""
+        return self._construct(f"CONSTRUCT {{ ?s ?p ?o }} WHERE {{ {self._concept_nodes(uri)} ?s ?p ?o }}")
+
+    def _history_record(
+        self, uri: rdflib.URIRef, cd_identifier_base64url: str, delta: RDFDelta, event_type: ChangeEventType
+    ) -> str:
+        now = datetime.now(timezone.utc)
+        version = int(now.timestamp() * 1_000_000)
+        record = rdflib.URIRef(f"{self.history_graph}/{cd_identifier_base64url}/{version}")
+        triples = [
+            (record, self.HISTORY.concept, uri),
+            (record, self.HISTORY.version, rdflib.Literal(version)),
+            (record, self.HISTORY.timestamp, rdflib.Literal(now)),
+            # the records are the change feed as well, see GraphDBChangeFeed
+            (record, self.HISTORY.type, rdflib.Literal(event_type.value)),
+            (record, self.HISTORY.added, rdflib.Literal(triples_to_text(delta.added))),
+            (record, self.HISTORY.removed, rdflib.Literal(triples_to_text(delta.removed))),
+        ]
+        return RDFDelta(added=set(triples), removed=set()).to_sparql_update(self.history_graph)
+
+    def apply_delta(
+        self, uri: rdflib.URIRef, cd_identifier_base64url: str, delta: RDFDelta, event_type: ChangeEventType
+    ):
+        """Applies the delta and records it in the history with one SPARQL UPDATE request."""
+        self._update(" ;\n".join(self._delta_operations(uri, cd_identifier_base64url, delta, event_type)))
+
+    def _delta_operations(
+        self, uri: rdflib.URIRef, cd_identifier_base64url: str, delta: RDFDelta, event_type: ChangeEventType
+    ) -> List[str]:
+        operations = []
+        applied = delta
+        if delta.has_blank_nodes():
+            # concepts stored before skolemization, blank nodes can not be addressed in DELETE DATA, so the triples of
+            # the blank nodes below the concept are deleted by pattern
+            operations.append(
+                f"DELETE {{ ?s ?p ?o }} WHERE {{ {self._concept_nodes(uri)} ?s ?p ?o . "
+                f"FILTER(isBlank(?s) || isBlank(?o)) }}"
+            )
+            applied = RDFDelta(
+                added=delta.added,
+                removed={
+                    triple for triple in delta.removed if not any(isinstance(term, rdflib.BNode) for term in triple)
+                },
+            )
+        if applied:
+            operations.append(applied.to_sparql_update())
+        # the history keeps the removed blank nodes, so reverting the record restores them
+        operations.append(self._history_record(uri, cd_identifier_base64url, delta, event_type))
+        return operations
 
     def if_exist(self, cd_identifier: str) -> bool:
         url = f"{self.base_url}?pred=%3Chttps%3A%2F%2Fadmin-shell.io%2Faas%2F3%2F0%2FIdentifiable%2Fid%3E&obj=%22{quote(cd_identifier,safe='')}%22"
@@ -60,47 +226,45 @@ class GraphDBConceptDescriptionRepository(ConceptDescriptionRepository):
         return len(g) != 0
 
     def get_concept_description_from_triplestore(self, cd_identifier_base64url: str) -> ConceptDescription:
-        uri = f"{self.base_prefix}/{cd_identifier_base64url}"
-        url = f"{self.base_url}?subj=%3C{quote(uri,safe='')}%3E"
-        response = requests.get(url, headers={"Accept": "text/turtle"})
-        response.raise_for_status()
-        g = rdflib.Graph().parse(response.content)
+        uri = self._concept_uri(cd_identifier_base64url)
+        g = self.fetch_concept_graph(uri)
         if len(g) == 0:
             raise ConceptNotFoundException()
-        concept = ConceptDescription.from_rdf(g, rdflib.URIRef(uri))
+        with span("from_rdf", triples=len(g)):
+            concept = ConceptDescription.from_rdf(IndexedGraph(g), uri)
         return concept
 
-    def delete_concept_description_from_triplestore(self, cd_identifier_base64url: str):
-        uri = f"{self.base_prefix}/{cd_identifier_base64url}"
-        url = f"{self.base_url}?subj=%3C{quote(uri,safe='')}%3E"
-        response = requests.delete(url, headers={"Accept": "text/turtle"})
-        response.raise_for_status()
-
     def insert_rdf_into_triplestore(self, concept_description: ConceptDescription):
         if self.if_exist(concept_description.id):
             raise DuplicateConceptException()
 
-        graph, _ = concept_description.to_rdf()
-        rdf_data = graph.serialize(format="turtle_custom", base=self.base_prefix, encoding="utf-8")
-        print(rdf_data)
-        headers = {
-            "Content-Type": "application/x-turtle",
-        }
-
-        try:
-            response = requests.post(self.base_url, data=rdf_data, headers=headers)
-            response.raise_for_status()  # Raise an exception for 4xx and 5xx HTTP status codes
-            print("RDF data inserted successfully.")
-        except:
-            print(f"HTTP Error:", graph.serialize(format="turtle_custom"))
-            print(response.text)
+        # skolem IRIs instead of blank nodes, so an unchanged concept always maps to the same triples
+        graph, uri = concept_description.to_rdf(base_uri=f"{self.base_prefix}/", id_strategy=SKOLEM_ID_STRATEGY)
+        self.apply_delta(
+            uri, base_64_url_encode(concept_description.id), diff_triples([], graph), ChangeEventType.Created
+        )
 
     async def connect_to_database(self, db_setting: dict):
-        pass
+        # an http DB_URI is the endpoint, e.g. the one of a read replica
+        endpoint = db_setting.get("DB_URI", "")
+        if not endpoint.startswith(("http://", "https://")):
+            endpoint = db_setting.get("GRAPHDB_ENDPOINT", get_config().graphdb_endpoint)
+        repository_name = db_setting.get("GRAPHDB_REPO", get_config().semantic_graphdb_repo)
+        self.query_url = f"{endpoint}/repositories/{repository_name}"
+        self.base_url = f"{self.query_url}/statements"
 
     async def close_database_connection(self):
         pass
 
+    def get_change_feed(self) -> ChangeFeed:
+        if self.change_feed is None:
+            self.change_feed = GraphDBChangeFeed(self, get_config().change_feed_poll_interval)
+        return self.change_feed
+
+    async def ping(self, timeout: float) -> None:
+        response = await run_in_threadpool(requests.get, f"{self.query_url}/size", timeout=timeout)
+        response.raise_for_status()
+
     async def get_concept_descriptions(self, query: dict, cursor=None, limit=100) -> GetConceptDescriptionsResult:
         pass
 
@@ -112,15 +276,127 @@ class GraphDBConceptDescriptionRepository(ConceptDescriptionRepository):
         self.insert_rdf_into_triplestore(concept_description)
         return concept_description
 
+    async def add_concept_descriptions(self, concept_descriptions: List[ConceptDescription]) -> List[str]:
+        concepts = {base_64_url_encode(concept.id): concept for concept in concept_descriptions}
+        if not concepts:
+            return []
+        uris = " ".join(self._concept_uri(identifier).n3() for identifier in concepts)
+        existing = {row["s"] for row in self._select(f"SELECT DISTINCT ?s WHERE {{ VALUES ?s {{ {uris} }} ?s ?p ?o }}")}
+        operations = []
+        added = []
+        for identifier, concept in concepts.items():
+            if str(self._concept_uri(identifier)) in existing:
+                continue
+            graph, uri = concept.to_rdf(base_uri=f"{self.base_prefix}/", id_strategy=SKOLEM_ID_STRATEGY)
+            operations.extend(self._delta_operations(uri, identifier, diff_triples([], graph), ChangeEventType.Created))
+            added.append(identifier)
+        if operations:
+            # the whole batch in one SPARQL UPDATE request
+            self._update(" ;\n".join(operations))
+        return added
+
+    async def get_seed_version(self) -> Optional[str]:
+        rows = self._select(f"SELECT ?version WHERE {{ {self.seed_node.n3()} {self.SEED.version.n3()} ?version }}")
+        return rows[0]["version"] if rows else None
+
+    async def set_seed_version(self, version: str):
+        node, predicate = self.seed_node.n3(), self.SEED.version.n3()
+        self._update(
+            f"DELETE WHERE {{ {node} {predicate} ?version }} ;\n"
+            f"INSERT DATA {{ {node} {predicate} {rdflib.Literal(version).n3()} }}"
+        )
+
     async def update_concept_description(
         self, cd_id_base64url_encoded: str, concept_description: ConceptDescription
     ) -> bool:
-        pass
+        if base_64_url_encode(concept_description.id) != cd_id_base64url_encoded:
+            raise UpdatePayloadIDMismatchException()
+        uri = self._concept_uri(cd_id_base64url_encoded)
+        stored = self.fetch_concept_graph(uri)
+        if len(stored) == 0:
+            raise ConceptNotFoundException()
+        graph, _ = concept_description.to_rdf(base_uri=f"{self.base_prefix}/", id_strategy=SKOLEM_ID_STRATEGY)
+        delta = diff_triples(stored, graph)
+        if delta:
+            self.apply_delta(uri, cd_id_base64url_encoded, delta, ChangeEventType.Updated)
+        return True
 
     async def delete_concept_description(self, cd_id_base64url_encoded: str) -> bool:
-        pass
+        uri = self._concept_uri(cd_id_base64url_encoded)
+        stored = self.fetch_concept_graph(uri)
+        if len(stored) == 0:
+            raise ConceptNotFoundException()
+        self.apply_delta(uri, cd_id_base64url_encoded, diff_triples(stored, []), ChangeEventType.Deleted)
+        return True
+
+    def _history(
+        self, cd_id_base64url_encoded: str, stop: Optional[int] = None
+    ) -> Tuple[rdflib.URIRef, List[Tuple[str, set]], bool]:
+        """
+        Returns the timestamp and the triples of the recorded versions before stop, oldest first, the index being the
+        version, and whether later versions were recorded. Only the deltas up to stop are fetched and replayed.
+        """
+        uri = self._concept_uri(cd_id_base64url_encoded)
+        records = self._select(
+            f"SELECT ?timestamp ?type ?added ?removed WHERE {{ GRAPH {self.history_graph.n3()} {{ "
+            f"?record {self.HISTORY.concept.n3()} {uri.n3()} ; {self.HISTORY.version.n3()} ?version ; "
+            f"{self.HISTORY.timestamp.n3()} ?timestamp ; "
+            f"{self.HISTORY.added.n3()} ?added ; {self.HISTORY.removed.n3()} ?removed . "
+            f"OPTIONAL {{ ?record {self.HISTORY.type.n3()} ?type }} }} }} ORDER BY ?version"
+            + (f" LIMIT {stop + 1}" if stop is not None else "")
+        )
+        if not records:
+            raise ConceptNotFoundException()
+        more = stop is not None and len(records) > stop
+        records = records[:stop]
+        deltas = [
+            RDFDelta(added=triples_from_text(record["added"]), removed=triples_from_text(record["removed"]))
+            for record in records
+        ]
+        if records[0].get("type") == ChangeEventType.Created.value:
+            state = set()
+        elif stop is None:
+            # concepts stored before the history was recorded, the first version is rebuilt by reverting every delta
+            # from the stored concept
+            state = set(self.fetch_concept_graph(uri))
+            for delta in reversed(deltas):
+                state = delta.inverted().apply(state)
+        else:
+            uri, versions, _ = self._history(cd_id_base64url_encoded)
+            return uri, versions[:stop], len(versions) > stop
+        versions = []
+        for record, delta in zip(records, deltas):
+            state = delta.apply(state)
+            versions.append((record["timestamp"], state))
+        return uri, versions, more
 
     async def get_concept_description_history(
         self, cd_id_base64url_encoded: str, cursor=None, limit=100
     ) -> GetConceptDescriptionsResult:
-        pass
+        start = decode_history_cursor(cursor)
+        uri, versions, more = self._history(cd_id_base64url_encoded, start + limit)
+        page = versions[start:]
+        return GetConceptDescriptionsResult(
+            paging_metadata={"cursor": encode_history_cursor(start + limit if more else None)},
+            result=[ConceptDescription.from_rdf(IndexedGraph(triples), uri) for _, triples in page if triples],
+        )
+
+    async def get_concept_description_versions(
+        self, cd_id_base64url_encoded: str, cursor=None, limit=100
+    ) -> GetConceptDescriptionVersionsResult:
+        start = decode_history_cursor(cursor)
+        _, versions, more = self._history(cd_id_base64url_encoded, start + limit)
+        page = versions[start:]
+        return GetConceptDescriptionVersionsResult(
+            paging_metadata={"cursor": encode_history_cursor(start + limit if more else None)},
+            result=[
+                ConceptDescriptionVersion(version=version, timestamp=timestamp, deleted=True if not triples else None)
+                for version, (timestamp, triples) in enumerate(page, start)
+            ],
+        )
+
+    async def get_concept_description_version(self, cd_id_base64url_encoded: str, version: int) -> ConceptDescription:
+        uri, versions, _ = self._history(cd_id_base64url_encoded, version + 1)
+        if version >= len(versions) or not versions[version][1]:
+            raise ConceptNotFoundException()
+        return ConceptDescription.from_rdf(IndexedGraph(versions[version][1]), uri)
@@ -19,20 +19,37 @@
 #  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
 #  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-import json
-from typing import Union
+import asyncio
+from typing import List, Optional, Union
 from itertools import zip_longest
 import redis
+from starlette.concurrency import run_in_threadpool
 
+from app.config import get_config
+from app.models.codec import (
+    JSON_MEDIA_TYPE,
+    STORAGE_FORMATS,
+    decode_stored_document,
+    encode_document,
+)
 from app.models.concept_description import ConceptDescription
+from app.models.projection import Projection, project_document
 from app.models.response import (
     GetConceptDescriptionsResult,
+    GetConceptDescriptionVersionsResult,
+    GetProjectedConceptDescriptionsResult,
     Result,
     ConceptNotFoundException,
     DuplicateConceptException,
     UpdatePayloadIDMismatchException,
+    OperationNotAllowedException,
+    ChangeEventType,
+    ConnectionPoolStatus,
 )
 from app.repository import ConceptDescriptionRepository
+from app.repository.concept_description_repository import decode_history_cursor, encode_history_cursor
+from app.repository.change_feed import RedisChangeFeed
+from app.repository.impl.redis_history import RedisHistoryStore
 from datetime import datetime, timezone
 
 from app.models import (
@@ -40,32 +57,75 @@ from app.models import (
     base_64_url_decode,
 )
 
+# contains a ":" like the other auxiliary keys, so it is never listed as a concept
+SEED_VERSION_KEY = "seed:version"
+
 
 class RedisConceptDescriptionRepository(ConceptDescriptionRepository):
     client: redis.Redis = None
+    storage_media_type: str = JSON_MEDIA_TYPE
+    history: RedisHistoryStore = None
+    # set for a cache tier, its keys expire and its writes record neither history nor change events
+    cache_ttl: Optional[float] = None
 
     async def connect_to_database(self, db_setting: dict, history=True):
-        self.client = redis.Redis.from_url(db_setting["DB_URI"])
+        self.client = redis.Redis.from_url(db_setting["DB_URI"], max_connections=get_config().redis_max_connections)
         self.client.ping()
+        self.storage_media_type = STORAGE_FORMATS[get_config().redis_storage_format]
+        self.change_feed = RedisChangeFeed(
+            self.client, get_config().change_feed_max_events, get_config().change_feed_poll_interval
+        )
+        if history:
+            self.history = RedisHistoryStore(
+                self.client, get_config().redis_history_snapshot_interval, self.storage_media_type
+            )
+
+    async def connect_as_cache(self, db_setting: dict, ttl: float):
+        await self.connect_to_database(db_setting, history=False)
+        self.cache_ttl = ttl
+
+    def _expiry(self) -> Optional[int]:
+        return int(self.cache_ttl * 1000) if self.cache_ttl else None
 
     async def close_database_connection(self):
         self.client = None
 
-    async def get_concept_descriptions(self, query: dict, cursor=None, limit=100) -> GetConceptDescriptionsResult:
-        concepts = []
+    async def ping(self, timeout: float) -> ConnectionPoolStatus:
+        # the client is synchronous, a dead connection would block the event loop until the socket times out
+        await asyncio.wait_for(run_in_threadpool(self.client.ping), timeout)
+        pool = self.client.connection_pool
+        # private counters of the redis-py ConnectionPool (5.x to 8.x), other pool classes may lack them
+        in_use = len(getattr(pool, "_in_use_connections", ()))
+        max_connections = getattr(pool, "max_connections", None) or get_config().redis_max_connections
+        return ConnectionPoolStatus(
+            max_connections=max_connections,
+            created=getattr(pool, "_created_connections", in_use),
+            in_use=in_use,
+            saturation=in_use / max_connections,
+        )
+
+    def _scan_documents(self, cursor=None, limit=100):
+        documents = []
         if cursor is None:
             cursor = 0
         else:
             cursor = int(base_64_url_decode(cursor))
         partial_cursor, partial_keys = self.client.scan(cursor=cursor, count=limit)
         for key in partial_keys:
+            if b":" in key:
+                # auxiliary keys like the history, base64url encoded ids never contain a ":"
+                continue
             cd = self.client.get(key)
-            concepts.append(json.loads(cd))
+            documents.append(decode_stored_document(cd, self.storage_media_type))
         to_return_cursor = ""
         if partial_cursor == 0:
             to_return_cursor = ""
         else:
             to_return_cursor = base_64_url_encode(str(partial_cursor))
+        return documents, to_return_cursor
+
+    async def get_concept_descriptions(self, query: dict, cursor=None, limit=100) -> GetConceptDescriptionsResult:
+        concepts, to_return_cursor = self._scan_documents(cursor, limit)
         return GetConceptDescriptionsResult(
             **{
                 "paging_metadata": {"cursor": to_return_cursor},
@@ -73,21 +133,94 @@ class RedisConceptDescriptionRepository(ConceptDescriptionRepository):
             }
         )
 
+    async def get_concept_descriptions_projected(
+        self, query: dict, projection: Projection, cursor=None, limit=100
+    ) -> GetProjectedConceptDescriptionsResult:
+        documents, to_return_cursor = self._scan_documents(cursor, limit)
+        return GetProjectedConceptDescriptionsResult(
+            paging_metadata={"cursor": to_return_cursor},
+            result=[project_document(document, projection) for document in documents],
+        )
+
     async def get_concept_description(self, cd_id_base64url_encoded: str) -> ConceptDescription:
         result = self.client.get(cd_id_base64url_encoded)
         if result is None:
             raise ConceptNotFoundException()
-        return ConceptDescription.model_validate(json.loads(result))
+        return ConceptDescription.model_validate(decode_stored_document(result, self.storage_media_type))
+
+    async def get_concept_description_projected(self, cd_id_base64url_encoded: str, projection: Projection) -> dict:
+        result = self.client.get(cd_id_base64url_encoded)
+        if result is None:
+            raise ConceptNotFoundException()
+        return project_document(decode_stored_document(result, self.storage_media_type), projection)
+
+    async def get_concept_description_encoded(self, cd_id_base64url_encoded: str, media_type: str) -> bytes:
+        result = self.client.get(cd_id_base64url_encoded)
+        if result is None:
+            raise ConceptNotFoundException()
+        stored_media_type = JSON_MEDIA_TYPE if result[:1] == b"{" else self.storage_media_type
+        if media_type == stored_media_type:
+            return result
+        return encode_document(decode_stored_document(result, self.storage_media_type), media_type)
+
+    def get_change_feed(self) -> RedisChangeFeed:
+        if self.change_feed is None:
+            self.change_feed = RedisChangeFeed(
+                self.client, get_config().change_feed_max_events, get_config().change_feed_poll_interval
+            )
+        return self.change_feed
+
+    def _store(self, key: str, document: Optional[dict], exists: bool, event_type: ChangeEventType) -> bool:
+        feed = self.get_change_feed()
+        value = None if document is None else encode_document(document, self.storage_media_type)
+        if self.history is not None:
+            # the event is added in the transaction of the change
+            return self.history.write(key, document, value, exists, lambda pipe: feed.append(event_type, key, pipe))
+        if value is None:
+            written = self.client.delete(key) != 0
+        else:
+            # nx flag already checks, it will only works if id does not exist.
+            written = bool(self.client.set(key, value, nx=not exists, xx=exists, px=self._expiry()))
+        if written and self.cache_ttl is None:
+            feed.append(event_type, key)
+        return written
 
     async def add_concept_description(self, concept_description: ConceptDescription) -> ConceptDescription:
         base64_id = base_64_url_encode(concept_description.id)
-        # nx flag already checks, it will only works if id does not exist.
-        result = self.client.set(base64_id, concept_description.model_dump_json(exclude_none=True), nx=True)
-        if result:
+        document = concept_description.model_dump(mode="json", exclude_none=True)
+        if self._store(base64_id, document, False, ChangeEventType.Created):
             return concept_description
-
         raise DuplicateConceptException()
 
+    async def add_concept_descriptions(self, concept_descriptions: List[ConceptDescription]) -> List[str]:
+        documents = {}
+        for concept_description in concept_descriptions:
+            document = concept_description.model_dump(mode="json", exclude_none=True)
+            documents[base_64_url_encode(concept_description.id)] = (
+                document,
+                encode_document(document, self.storage_media_type),
+            )
+        if not documents:
+            return []
+        feed = self.get_change_feed()
+        if self.history is not None:
+            return self.history.write_new(documents, lambda pipe, key: feed.append(ChangeEventType.Created, key, pipe))
+        with self.client.pipeline(transaction=False) as pipe:
+            for key, (_, value) in documents.items():
+                pipe.set(key, value, nx=True, px=self._expiry())
+            added = [key for key, written in zip(documents, pipe.execute()) if written]
+        if self.cache_ttl is None:
+            for key in added:
+                feed.append(ChangeEventType.Created, key)
+        return added
+
+    async def get_seed_version(self) -> Optional[str]:
+        version = self.client.get(SEED_VERSION_KEY)
+        return None if version is None else version.decode()
+
+    async def set_seed_version(self, version: str):
+        self.client.set(SEED_VERSION_KEY, version)
+
     async def update_concept_description(
         self, cd_id_base64url_encoded: str, concept_description: ConceptDescription
     ) -> bool:
@@ -96,23 +229,48 @@ class RedisConceptDescriptionRepository(ConceptDescriptionRepository):
         if base64_id != cd_id_base64url_encoded:
             raise UpdatePayloadIDMismatchException()
 
-        result = self.client.set(base64_id, concept_description.model_dump_json(exclude_none=True), xx=True)
-        if result:
-            key = cd_id_base64url_encoded + "-history"
-            print("DIFF", key)
-
+        document = concept_description.model_dump(mode="json", exclude_none=True)
+        if self._store(base64_id, document, True, ChangeEventType.Updated):
             return True
         raise ConceptNotFoundException()
 
     async def delete_concept_description(self, cd_id_base64url_encoded: str) -> bool:
-        response = self.client.delete(cd_id_base64url_encoded)
-        if response == 0:
+        if self._store(cd_id_base64url_encoded, None, True, ChangeEventType.Deleted):
+            return True
+        raise ConceptNotFoundException()
+
+    def _history_page(self, cd_id_base64url_encoded: str, cursor=None):
+        if self.history is None:
+            raise OperationNotAllowedException()
+        start = decode_history_cursor(cursor)
+        if start == 0 and not self.client.exists(self.history.key(cd_id_base64url_encoded)):
             raise ConceptNotFoundException()
-        return True
+        return start
 
     async def get_concept_description_history(
         self, cd_id_base64url_encoded: str, cursor=None, limit=100
     ) -> GetConceptDescriptionsResult:
-        key = cd_id_base64url_encoded + "-history"
+        start = self._history_page(cd_id_base64url_encoded, cursor)
+        documents, next_start = self.history.documents(cd_id_base64url_encoded, start, limit)
+        return GetConceptDescriptionsResult(
+            paging_metadata={"cursor": encode_history_cursor(next_start)},
+            result=[document for _, document in documents],
+        )
 
-        pass
+    async def get_concept_description_versions(
+        self, cd_id_base64url_encoded: str, cursor=None, limit=100
+    ) -> GetConceptDescriptionVersionsResult:
+        start = self._history_page(cd_id_base64url_encoded, cursor)
+        records, next_start = self.history.versions(cd_id_base64url_encoded, start, limit)
+        return GetConceptDescriptionVersionsResult(
+            paging_metadata={"cursor": encode_history_cursor(next_start)},
+            result=records,
+        )
+
+    async def get_concept_description_version(self, cd_id_base64url_encoded: str, version: int) -> ConceptDescription:
+        if self.history is None:
+            raise OperationNotAllowedException()
+        document = self.history.get_version(cd_id_base64url_encoded, version)
+        if document is None:
+            raise ConceptNotFoundException()
+        return ConceptDescription.model_validate(document)
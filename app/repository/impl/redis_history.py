@@ -0,0 +1,177 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import redis
+
+from app.models.codec import JSON_MEDIA_TYPE, decode_stored_document, encode_document
+from app.models.json_patch import apply_patch, diff_documents
+
+
+class RedisHistoryStore:
+    """
+    Versioned history of the concept descriptions. Every concept has a list of records, the index of a record is its
+    version. A record either holds a full snapshot, a JSON patch against the previous version or marks a deletion.
+    A snapshot is written at least every `snapshot_interval` versions, so rebuilding any version replays fewer
+    than `snapshot_interval` patches. The keys contain a ":", which never occurs in the base64url encoded ids of
+    the concepts themselves.
+    """
+
+    def __init__(self, client: redis.Redis, snapshot_interval: int = 16, media_type: str = JSON_MEDIA_TYPE):
+        self.client = client
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.media_type = media_type
+
+    @staticmethod
+    def key(cd_id_base64url_encoded: str) -> str:
+        return f"history:{cd_id_base64url_encoded}"
+
+    def _decode(self, data: Optional[bytes]) -> Optional[dict]:
+        return None if data is None else decode_stored_document(data, self.media_type)
+
+    def _next_records(self, length: int, last: Optional[dict], previous, document) -> List[dict]:
+        records = []
+        base = None if last is None or last.get("deleted") else last["base"]
+        if previous is not None and base is None:
+            # stored before the history was enabled
+            base = length
+            records.append({"version": length, "base": base, "snapshot": previous})
+        version = length + len(records)
+        if document is None:
+            records.append({"version": version, "base": version, "deleted": True})
+        elif previous is None or version - base >= self.snapshot_interval:
+            records.append({"version": version, "base": version, "snapshot": document})
+        else:
+            patch = diff_documents(previous, document)
+            if patch:
+                records.append({"version": version, "base": base, "patch": patch})
+        timestamp = datetime.now(timezone.utc).isoformat()
+        return [{**record, "timestamp": timestamp} for record in records]
+
+    def write(
+        self, key: str, document: Optional[dict], value: Optional[bytes], exists: bool, on_change: Callable = None
+    ) -> bool:
+        """
+        Stores `value` under `key`, or deletes the key if `value` is None, and appends the new version to the history
+        in one transaction. Nothing is written and False is returned if the key does (not) exist contrary to `exists`.
+        `on_change` may queue further commands on the transaction if a new version was recorded.
+        """
+        history_key = self.key(key)
+
+        def write_version(pipe: redis.client.Pipeline) -> bool:
+            stored = pipe.get(key)
+            if (stored is not None) != exists:
+                return False
+            length = pipe.llen(history_key)
+            last = self._decode(pipe.lindex(history_key, -1)) if length else None
+            previous = self._decode(stored)
+            records = self._next_records(length, last, previous, document)
+            pipe.multi()
+            if value is None:
+                pipe.delete(key)
+            else:
+                pipe.set(key, value)
+            if records:
+                pipe.rpush(history_key, *[encode_document(record, self.media_type) for record in records])
+                if on_change is not None:
+                    on_change(pipe)
+            return True
+
+        return self.client.transaction(write_version, key, history_key, value_from_callable=True)
+
+    def write_new(self, documents: Dict[str, Tuple[dict, bytes]], on_change: Callable = None) -> List[str]:
+        """
+        Stores the values of the keys that do not exist yet and records their first versions in one transaction.
+        `documents` maps the keys to their document and encoded value, `on_change(pipe, key)` may queue further
+        commands for every added key. Returns the added keys.
+        """
+        keys = list(documents)
+
+        def write_versions(pipe: redis.client.Pipeline) -> List[str]:
+            absent = [key for key, stored in zip(keys, pipe.mget(keys)) if stored is None]
+            with self.client.pipeline(transaction=False) as reads:
+                for key in absent:
+                    # deleted concepts keep their history
+                    reads.llen(self.key(key))
+                    reads.lindex(self.key(key), -1)
+                lasts = reads.execute()
+            pipe.multi()
+            for key, length, last in zip(absent, lasts[::2], lasts[1::2]):
+                document, value = documents[key]
+                records = self._next_records(length, self._decode(last), None, document)
+                pipe.set(key, value)
+                pipe.rpush(self.key(key), *[encode_document(record, self.media_type) for record in records])
+                if on_change is not None:
+                    on_change(pipe, key)
+            return absent
+
+        history_keys = [self.key(key) for key in keys]
+        return self.client.transaction(write_versions, *keys, *history_keys, value_from_callable=True)
+
+    def _replay(self, records: List[dict]) -> Iterator[Tuple[int, Optional[dict]]]:
+        document = None
+        for record in records:
+            if "snapshot" in record:
+                document = record["snapshot"]
+            elif "patch" in record:
+                document = apply_patch(document, record["patch"])
+            else:
+                document = None
+            yield record["version"], document
+
+    def get_version(self, cd_id_base64url_encoded: str, version: int) -> Optional[dict]:
+        history_key = self.key(cd_id_base64url_encoded)
+        record = self._decode(self.client.lindex(history_key, version)) if version >= 0 else None
+        if record is None or record.get("deleted"):
+            return None
+        records = [self._decode(data) for data in self.client.lrange(history_key, record["base"], version)]
+        _, document = list(self._replay(records))[-1]
+        return document
+
+    def versions(self, cd_id_base64url_encoded: str, start: int, limit: int) -> Tuple[List[dict], Optional[int]]:
+        """Returns the records of a page of versions and the first version of the next page."""
+        history_key = self.key(cd_id_base64url_encoded)
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.lrange(history_key, start, start + limit - 1)
+            pipe.llen(history_key)
+            page, length = pipe.execute()
+        end = start + len(page)
+        return [self._decode(data) for data in page], end if end < length else None
+
+    def documents(
+        self, cd_id_base64url_encoded: str, start: int, limit: int
+    ) -> Tuple[List[Tuple[int, dict]], Optional[int]]:
+        """Rebuilds a page of versions, replaying the patches from the snapshot of the first version only once."""
+        page, next_start = self.versions(cd_id_base64url_encoded, start, limit)
+        if not page:
+            return [], next_start
+        records = page
+        if page[0]["base"] < start:
+            earlier = self.client.lrange(self.key(cd_id_base64url_encoded), page[0]["base"], start - 1)
+            records = [self._decode(data) for data in earlier] + page
+        documents = [
+            (version, document)
+            for version, document in self._replay(records)
+            if version >= start and document is not None
+        ]
+        return documents, next_start
@@ -0,0 +1,181 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+import redis
+from loguru import logger
+
+
+class LocalCache:
+    """Thread safe LRU cache of the representations of a concept description, keyed by its base64url id."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str, variant: str):
+        with self.lock:
+            variants = self.entries.get(key)
+            if variants is None:
+                return None
+            self.entries.move_to_end(key)
+            return variants.get(variant)
+
+    def put(self, key: str, variant: str, value):
+        with self.lock:
+            self.entries.setdefault(key, {})[variant] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class CacheInvalidator:
+    """
+    Keeps the local caches of all processes coherent. Every write increments a global epoch in Redis and publishes
+    the epoch together with the changed key. Subscribers evict the key, and if they see an epoch skipping ahead they
+    may have missed messages and drop their caches completely. The epoch in Redis is also compared every
+    `verify_interval` seconds, which bounds the staleness if the subscription itself was interrupted.
+    While the subscription is not running the caches are bypassed, and it is resubscribed with an exponential backoff.
+    """
+
+    channel = "cache-invalidation"
+    epoch_key = "cache:epoch"
+    max_retry_interval = 60.0
+
+    def __init__(self, client: redis.Redis, verify_interval: float = 5.0, retry_interval: float = 1.0):
+        self.client = client
+        self.verify_interval = verify_interval
+        self.retry_interval = retry_interval
+        self.retry_delay = retry_interval
+        # when to resubscribe after the subscription failed
+        self.retry_at: Optional[float] = None
+        self.caches: List[LocalCache] = []
+        self.epoch: Optional[int] = None
+        self.verified_at = 0.0
+        self.pubsub = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def register(self, cache: LocalCache) -> LocalCache:
+        self.caches.append(cache)
+        return cache
+
+    def clear(self):
+        for cache in self.caches:
+            cache.clear()
+
+    @property
+    def active(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.pubsub is not None:
+            self.pubsub.close()
+        self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.subscribe(**{self.channel: self.on_message})
+        self.synchronize(int(self.client.get(self.epoch_key) or 0))
+        self.thread = self.pubsub.run_in_thread(sleep_time=1.0, daemon=True, exception_handler=self.on_error)
+        self.retry_at = None
+        self.retry_delay = self.retry_interval
+
+    def stop(self):
+        self.retry_at = None
+        if self.thread is not None:
+            self.thread.stop()
+            self.thread = None
+        if self.pubsub is not None:
+            self.pubsub.close()
+            self.pubsub = None
+        self.clear()
+
+    def on_error(self, error, pubsub, thread):
+        logger.warning(f"Cache invalidation subscription failed, local caches are disabled: {error}")
+        thread.stop()
+        self.clear()
+        self._retry_later()
+
+    def _retry_later(self):
+        self.retry_at = time.monotonic() + self.retry_delay
+        self.retry_delay = min(self.retry_delay * 2, self.max_retry_interval)
+
+    def _resubscribe(self):
+        try:
+            self.start()
+            logger.info("Cache invalidation subscription resumed")
+        except redis.RedisError as error:
+            logger.warning(f"Cache invalidation resubscription failed: {error}")
+            self._retry_later()
+
+    def synchronize(self, epoch: int):
+        with self.lock:
+            if self.epoch != epoch:
+                self.clear()
+            self.epoch = epoch
+            self.verified_at = time.monotonic()
+
+    def on_message(self, message: dict):
+        epoch, _, key = message["data"].decode().partition(" ")
+        epoch = int(epoch)
+        with self.lock:
+            if self.epoch is not None and epoch > self.epoch + 1:
+                # a gap, or concurrent writers whose messages arrive out of order
+                self.clear()
+            else:
+                for cache in self.caches:
+                    cache.invalidate(key)
+            self.epoch = max(epoch, self.epoch or 0)
+
+    def verify(self) -> bool:
+        """Returns whether the local caches may be used, comparing the epoch with Redis if it is due."""
+        if not self.active:
+            if self.retry_at is None or time.monotonic() < self.retry_at:
+                return False
+            self._resubscribe()
+            return self.active
+        if time.monotonic() - self.verified_at >= self.verify_interval:
+            self.synchronize(max(int(self.client.get(self.epoch_key) or 0), self.epoch or 0))
+        return True
+
+    def publish(self, key: str):
+        for cache in self.caches:
+            cache.invalidate(key)
+        try:
+            epoch = self.client.incr(self.epoch_key)
+            self.client.publish(self.channel, f"{epoch} {key}")
+        except redis.RedisError as error:
+            # the write is committed already, other processes may serve the old value until their entry is evicted
+            logger.warning(f"Cache invalidation of {key} failed: {error}")
@@ -0,0 +1,126 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import importlib
+from importlib.metadata import entry_points
+from typing import Dict, List, Tuple, Type, Union
+
+from app.config import Config, RepositorySettings
+from app.repository.concept_description_repository import ConceptDescriptionRepository
+from app.repository.replicated_repository import Replica, ReplicatedConceptDescriptionRepository
+from app.repository.tiered_repository import Tier, TieredConceptDescriptionRepository
+
+# Other packages add backends with an entry point in this group, e.g. in their pyproject.toml
+# [project.entry-points."aasbrain.repository_backends"]
+# neo4j = "aasbrain_neo4j:Neo4jConceptDescriptionRepository"
+ENTRY_POINT_GROUP = "aasbrain.repository_backends"
+
+# backend name -> "module:class", the module is only imported when the backend is used
+BACKENDS: Dict[str, Union[str, Type[ConceptDescriptionRepository]]] = {
+    "redis": "app.repository.impl.redis_cd_repository:RedisConceptDescriptionRepository",
+    "graphdb": "app.repository.impl.graphdb_cd_repository:GraphDBConceptDescriptionRepository",
+}
+
+ROLES = ("primary", "cache", "mirror")
+
+
+def register_backend(name: str, backend: Union[str, Type[ConceptDescriptionRepository]]):
+    BACKENDS[name] = backend
+
+
+def _entry_points() -> dict:
+    return {entry_point.name: entry_point for entry_point in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def available_backends() -> List[str]:
+    return sorted(set(BACKENDS) | set(_entry_points()))
+
+
+def load_backend(name: str) -> Type[ConceptDescriptionRepository]:
+    if name in BACKENDS:
+        backend = BACKENDS[name]
+        if isinstance(backend, str):
+            module, _, attribute = backend.partition(":")
+            backend = getattr(importlib.import_module(module), attribute)
+        return backend
+    entry_point = _entry_points().get(name)
+    if entry_point is None:
+        raise ValueError(f"Invalid backend provided: {name}, available backends: {', '.join(available_backends())}")
+    return entry_point.load()
+
+
+def repository_settings(config: Config) -> Dict[str, RepositorySettings]:
+    """The named repositories of the config, the db_backend at db_uri if there are none."""
+    if not config.repositories:
+        replica_uris = [uri.strip() for uri in config.db_replica_uris.split(",") if uri.strip()]
+        return {
+            "primary": RepositorySettings(backend=config.db_backend, db_uri=config.db_uri, replica_uris=replica_uris)
+        }
+    return config.repositories
+
+
+def db_setting(settings: RepositorySettings, config: Config) -> dict:
+    return {"DB_URI": settings.db_uri or config.db_uri, **settings.settings}
+
+
+def has_replicas(config: Config) -> bool:
+    return any(settings.replica_uris for settings in repository_settings(config).values())
+
+
+def create_repository(settings: RepositorySettings, config: Config) -> ConceptDescriptionRepository:
+    backend = load_backend(settings.backend)
+    if not settings.replica_uris:
+        return backend()
+    replicas = [Replica(uri, backend()) for uri in settings.replica_uris]
+    return ReplicatedConceptDescriptionRepository(backend(), replicas, config.replica_retry_seconds)
+
+
+def primary_repository_settings(config: Config) -> Tuple[str, RepositorySettings]:
+    primaries = [
+        (name, settings) for name, settings in repository_settings(config).items() if settings.role == "primary"
+    ]
+    if len(primaries) != 1:
+        raise ValueError(f"Expected exactly one primary repository but got {len(primaries)}")
+    return primaries[0]
+
+
+def compose_repository(config: Config) -> ConceptDescriptionRepository:
+    """Creates the named repositories of the config, tiered around the primary if there are caches or mirrors."""
+    primary_name, primary_settings = primary_repository_settings(config)
+    primary_uri = db_setting(primary_settings, config)["DB_URI"]
+    primary = None
+    tiers = {"cache": [], "mirror": []}
+    for name, settings in repository_settings(config).items():
+        if settings.role not in ROLES:
+            raise ValueError(f"Invalid role of repository {name}: {settings.role}, expected one of {', '.join(ROLES)}")
+        if name != primary_name and settings.db_uri in (None, "", primary_uri):
+            # caches and mirrors delete their documents, they must not share the database of the primary
+            raise ValueError(f"Repository {name} with role {settings.role} needs a db_uri other than the primary's")
+        repository = create_repository(settings, config)
+        if name == primary_name:
+            primary = repository
+        else:
+            tiers[settings.role].append(
+                Tier(name, repository, db_setting(settings, config), settings.cache_ttl_seconds)
+            )
+    if not tiers["cache"] and not tiers["mirror"]:
+        return primary
+    return TieredConceptDescriptionRepository(primary, tiers["cache"], tiers["mirror"])
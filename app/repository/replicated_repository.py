@@ -0,0 +1,273 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import itertools
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import record_repository_read
+from app.models.concept_description import ConceptDescription
+from app.models.projection import Projection
+from app.models.response import (
+    APIException,
+    ConceptNotFoundException,
+    GetConceptDescriptionsResult,
+    GetConceptDescriptionVersionsResult,
+    GetProjectedConceptDescriptionsResult,
+)
+from app.repository.change_feed import ChangeFeed
+from app.repository.concept_description_repository import ConceptDescriptionRepository
+
+# set for a while after a client wrote, its reads go to the primary until the replicas caught up
+STICKY_COOKIE = "aasbrain-read-primary"
+# separates the database from the cursor of a listing, base64url encoded cursors never contain it
+PAGE_CURSOR_SEPARATOR = "."
+
+
+class ReadRouting:
+    def __init__(self, prefer_primary: bool = False):
+        self.prefer_primary = prefer_primary
+        self.wrote = False
+
+
+_routing: ContextVar[Optional[ReadRouting]] = ContextVar("read_routing", default=None)
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+
+@contextmanager
+def primary_reads():
+    """Sends the reads within the block to the primary, e.g. the fills of caches that a lagging replica would spoil."""
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+class Replica:
+    def __init__(self, uri: str, repository: ConceptDescriptionRepository):
+        self.uri = uri
+        self.repository = repository
+        self.down_until = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return self.down_until <= now
+
+
+class ReplicatedConceptDescriptionRepository(ConceptDescriptionRepository):
+    """
+    Sends the writes to the primary and balances the reads over the healthy replicas. A replica failing a read is
+    skipped for retry_seconds and the read is served by the primary, so is a concept the replica does not know yet.
+    After a write the reads of the same request, and of the client while its sticky cookie is set, go to the primary.
+    """
+
+    def __init__(self, primary: ConceptDescriptionRepository, replicas: List[Replica], retry_seconds: float = 10.0):
+        self.primary = primary
+        self.replicas = replicas
+        self.retry_seconds = retry_seconds
+        self._next = itertools.count()
+
+    async def connect_to_database(self, db_setting: dict):
+        await self.primary.connect_to_database(db_setting)
+        for replica in self.replicas:
+            try:
+                await replica.repository.connect_to_database({**db_setting, "DB_URI": replica.uri})
+            except Exception as e:
+                replica.down_until = time.monotonic() + self.retry_seconds
+                logger.warning(f"Connecting to the replica {replica.uri} failed: {e!r}")
+
+    async def close_database_connection(self):
+        for replica in self.replicas:
+            await replica.repository.close_database_connection()
+        await self.primary.close_database_connection()
+
+    def _replica(self) -> Optional[Replica]:
+        routing = _routing.get()
+        if _primary_reads.get() or (routing is not None and (routing.prefer_primary or routing.wrote)):
+            return None
+        now = time.monotonic()
+        healthy = [replica for replica in self.replicas if replica.healthy(now)]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    async def _read(self, read):
+        result, _ = await self._read_from(self._replica(), read)
+        return result
+
+    async def _read_from(self, replica: Optional[Replica], read):
+        """Returns the result and the replica that served it, None if it was the primary."""
+        if replica is not None:
+            try:
+                result = await read(replica.repository)
+                record_repository_read("replica")
+                return result, replica
+            except ConceptNotFoundException:
+                pass
+            except APIException:
+                raise
+            except Exception as e:
+                replica.down_until = time.monotonic() + self.retry_seconds
+                logger.warning(f"Reading from the replica {replica.uri} failed: {e!r}")
+        record_repository_read("primary")
+        return await read(self.primary), None
+
+    async def _read_page(self, read, cursor: Optional[str]):
+        """
+        Reads a page of a listing. Scan cursors are only valid on the database that returned them, so the returned
+        cursor names the replica, or "p" the primary, and the following pages are read from the same database.
+        """
+        replica = self._replica()
+        if cursor:
+            source, separator, cursor = cursor.rpartition(PAGE_CURSOR_SEPARATOR)
+            replica = None
+            if source.isdigit() and int(source) < len(self.replicas):
+                # a replica that went down meanwhile falls back to the primary, which may repeat or skip entries
+                replica = self.replicas[int(source)]
+                replica = replica if replica.healthy(time.monotonic()) else None
+        result, replica = await self._read_from(replica, lambda repository: read(repository, cursor))
+        if result.paging_metadata.cursor:
+            source = "p" if replica is None else str(self.replicas.index(replica))
+            result.paging_metadata.cursor = f"{source}{PAGE_CURSOR_SEPARATOR}{result.paging_metadata.cursor}"
+        return result
+
+    async def _write(self, write):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return await write(self.primary)
+
+    async def get_concept_descriptions(self, query: dict, cursor=None, limit=100) -> GetConceptDescriptionsResult:
+        return await self._read_page(
+            lambda repository, cursor: repository.get_concept_descriptions(query, cursor=cursor, limit=limit), cursor
+        )
+
+    async def get_concept_descriptions_projected(
+        self, query: dict, projection: Projection, cursor=None, limit=100
+    ) -> GetProjectedConceptDescriptionsResult:
+        return await self._read_page(
+            lambda repository, cursor: repository.get_concept_descriptions_projected(
+                query, projection, cursor=cursor, limit=limit
+            ),
+            cursor,
+        )
+
+    async def get_concept_description(self, cd_id_base64url_encoded: str) -> ConceptDescription:
+        return await self._read(lambda repository: repository.get_concept_description(cd_id_base64url_encoded))
+
+    async def get_concept_description_projected(self, cd_id_base64url_encoded: str, projection: Projection) -> dict:
+        return await self._read(
+            lambda repository: repository.get_concept_description_projected(cd_id_base64url_encoded, projection)
+        )
+
+    async def get_concept_description_encoded(self, cd_id_base64url_encoded: str, media_type: str) -> bytes:
+        return await self._read(
+            lambda repository: repository.get_concept_description_encoded(cd_id_base64url_encoded, media_type)
+        )
+
+    async def get_concept_description_history(
+        self, cd_id_base64url_encoded: str, cursor=None, limit=100
+    ) -> GetConceptDescriptionsResult:
+        return await self._read(
+            lambda repository: repository.get_concept_description_history(cd_id_base64url_encoded, cursor, limit)
+        )
+
+    async def get_concept_description_versions(
+        self, cd_id_base64url_encoded: str, cursor=None, limit=100
+    ) -> GetConceptDescriptionVersionsResult:
+        return await self._read(
+            lambda repository: repository.get_concept_description_versions(cd_id_base64url_encoded, cursor, limit)
+        )
+
+    async def get_concept_description_version(self, cd_id_base64url_encoded: str, version: int) -> ConceptDescription:
+        return await self._read(
+            lambda repository: repository.get_concept_description_version(cd_id_base64url_encoded, version)
+        )
+
+    async def add_concept_description(self, concept_description: ConceptDescription) -> ConceptDescription:
+        return await self._write(lambda repository: repository.add_concept_description(concept_description))
+
+    async def add_concept_descriptions(self, concept_descriptions: List[ConceptDescription]) -> List[str]:
+        return await self._write(lambda repository: repository.add_concept_descriptions(concept_descriptions))
+
+    async def update_concept_description(
+        self, cd_id_base64url_encoded: str, concept_description: ConceptDescription
+    ) -> bool:
+        return await self._write(
+            lambda repository: repository.update_concept_description(cd_id_base64url_encoded, concept_description)
+        )
+
+    async def delete_concept_description(self, cd_id_base64url_encoded: str) -> bool:
+        return await self._write(lambda repository: repository.delete_concept_description(cd_id_base64url_encoded))
+
+    async def ping(self, timeout: float):
+        return await self.primary.ping(timeout)
+
+    async def get_seed_version(self) -> Optional[str]:
+        return await self.primary.get_seed_version()
+
+    async def set_seed_version(self, version: str):
+        await self._write(lambda repository: repository.set_seed_version(version))
+
+    def get_change_feed(self) -> ChangeFeed:
+        return self.primary.get_change_feed()
+
+    def get_repository_metadata(self):
+        return self.primary.get_repository_metadata()
+
+
+class ReadRoutingMiddleware:
+    """Keeps the reads of a client on the primary for sticky_seconds after its last write with a cookie."""
+
+    def __init__(self, app: ASGIApp, sticky_seconds: float = 5.0):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cookies = {}
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                cookies.update(cookie_parser(value.decode("latin-1")))
+        routing = ReadRouting(prefer_primary=STICKY_COOKIE in cookies)
+        token = _routing.set(routing)
+
+        async def send_with_cookie(message: Message):
+            if message["type"] == "http.response.start" and routing.wrote:
+                cookie = f"{STICKY_COOKIE}=1; Max-Age={math.ceil(self.sticky_seconds)}; Path=/; HttpOnly; SameSite=Lax"
+                MutableHeaders(scope=message).append("Set-Cookie", cookie)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _routing.reset(token)
@@ -0,0 +1,196 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import hashlib
+import io
+import itertools
+import json
+import zipfile
+from typing import BinaryIO, Iterable, Iterator, List, Optional, TextIO
+
+from loguru import logger
+from pydantic import ValidationError
+
+from app.models.concept_description import ConceptDescription
+from app.models.xml_serializer import iter_concept_description_documents_from_xml
+from app.repository.concept_description_repository import ConceptDescriptionRepository
+
+
+class JSONStream:
+    """Decodes the values of a JSON document one after another, reading the text in chunks."""
+
+    def __init__(self, reader: TextIO, chunk_size: int = 64 * 1024):
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        chunk = self.reader.read(size)
+        if not chunk:
+            return False
+        # drop what was already decoded
+        if self.position > self.chunk_size:
+            self.buffer = self.buffer[self.position :]
+            self.position = 0
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position].isspace():
+                self.position += 1
+            if self.position < len(self.buffer) or not self._fill(self.chunk_size):
+                return self.buffer[self.position : self.position + 1]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at {self.peek()!r} in JSON seed data")
+        self.position += 1
+
+    def value(self):
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or not self._fill(size):
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                # the value continues in the next chunks, reading twice as much every time keeps the retries few
+                if not self._fill(size):
+                    raise
+            size *= 2
+
+    def items(self) -> Iterator:
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == "]":
+                self.position += 1
+                return
+            self.expect(",")
+
+    def members(self) -> Iterator:
+        """Yields the keys of an object, the caller reads their values."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == "}":
+                self.position += 1
+                return
+            self.expect(",")
+
+
+def iter_concept_description_documents_from_json(reader: TextIO) -> Iterator[dict]:
+    """Reads a JSON array of concept descriptions or the conceptDescriptions of an AAS environment."""
+    stream = JSONStream(reader)
+    if stream.peek() == "[":
+        yield from stream.items()
+        return
+    for key in stream.members():
+        if key == "conceptDescriptions":
+            yield from stream.items()
+        else:
+            stream.value()
+
+
+def _documents(source: BinaryIO, name: str) -> Iterator[dict]:
+    name = name.lower()
+    if name.endswith(".xml"):
+        yield from iter_concept_description_documents_from_xml(source)
+    elif name.endswith(".jsonl") or name.endswith(".ndjson"):
+        for line in io.TextIOWrapper(source, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
+    elif name.endswith(".json"):
+        yield from iter_concept_description_documents_from_json(io.TextIOWrapper(source, encoding="utf-8"))
+    else:
+        raise ValueError(f"Unsupported seed file {name}, expected .json, .jsonl, .xml or .aasx")
+
+
+def iter_seed_documents(path: str) -> Iterator[dict]:
+    """
+    Reads the concept description documents of a seed file: a JSON array, an AAS environment as JSON or XML,
+    JSON lines with one concept description per line, or an AASX package with JSON or XML environments.
+    """
+    if not path.lower().endswith(".aasx"):
+        with open(path, "rb") as source:
+            yield from _documents(source, path)
+        return
+    with zipfile.ZipFile(path) as package:
+        for name in package.namelist():
+            # the OPC parts describing the package itself
+            if name == "[Content_Types].xml" or "_rels/" in name or not name.lower().endswith((".json", ".xml")):
+                continue
+            with package.open(name) as source:
+                yield from _documents(source, name)
+
+
+def seed_file_version(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def _concept_descriptions(documents: Iterable[dict]) -> Iterator[ConceptDescription]:
+    for document in documents:
+        try:
+            yield ConceptDescription.model_validate(document)
+        except ValidationError as e:
+            logger.warning(f"Skipping invalid seed concept description {document.get('id')}: {e.error_count()} errors")
+
+
+def _batches(concepts: Iterator[ConceptDescription], size: int) -> Iterator[List[ConceptDescription]]:
+    while batch := list(itertools.islice(concepts, size)):
+        yield batch
+
+
+async def seed_repository(
+    repository: ConceptDescriptionRepository, path: str, version: Optional[str] = None, batch_size: int = 500
+) -> int:
+    """
+    Adds the concept descriptions of the seed file that do not exist yet in batches and returns how many were added.
+    Nothing is read if the backend already holds this version of the seed data, by default the hash of the file.
+    """
+    version = version or seed_file_version(path)
+    if await repository.get_seed_version() == version:
+        logger.info(f"Seed data {version} is already loaded")
+        return 0
+    added = 0
+    for batch in _batches(_concept_descriptions(iter_seed_documents(path)), max(1, batch_size)):
+        added += len(await repository.add_concept_descriptions(batch))
+    await repository.set_seed_version(version)
+    logger.info(f"Loaded seed data {version} from {path}, added {added} concept descriptions")
+    return added
@@ -0,0 +1,231 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import time
+from typing import List, Optional
+
+from loguru import logger
+
+from app.models import base_64_url_encode
+from app.models.codec import encode_model
+from app.models.concept_description import ConceptDescription
+from app.models.projection import Projection, project_document
+from app.models.response import (
+    ConceptNotFoundException,
+    DuplicateConceptException,
+    GetConceptDescriptionsResult,
+    GetConceptDescriptionVersionsResult,
+    GetProjectedConceptDescriptionsResult,
+)
+from app.repository.change_feed import ChangeFeed
+from app.repository.concept_description_repository import ConceptDescriptionRepository
+from app.repository.replicated_repository import primary_reads
+
+
+class Tier:
+    def __init__(self, name: str, repository: ConceptDescriptionRepository, db_setting: dict, ttl: float = 60.0):
+        self.name = name
+        self.repository = repository
+        self.db_setting = db_setting
+        # seconds a cache keeps an entry
+        self.ttl = ttl
+        # a cache that missed an invalidation is not read until its entries expired
+        self.bypass_until = 0.0
+
+
+class TieredConceptDescriptionRepository(ConceptDescriptionRepository):
+    """
+    Composes named repositories around a primary one. Caches are read before the primary, filled on a miss and
+    invalidated on every write. Their entries expire after the ttl of the tier, which bounds how long a fill racing
+    a write of another process serves the old value. Mirrors, e.g. a search index, receive the writes after the
+    primary succeeded. The primary is the source of truth, failures of caches and mirrors never fail a request.
+    """
+
+    def __init__(self, primary: ConceptDescriptionRepository, caches: List[Tier] = (), mirrors: List[Tier] = ()):
+        self.primary = primary
+        self.caches = list(caches)
+        self.mirrors = list(mirrors)
+
+    async def connect_to_database(self, db_setting: dict):
+        await self.primary.connect_to_database(db_setting)
+        for tier in self.caches:
+            await tier.repository.connect_as_cache(tier.db_setting, tier.ttl)
+        for tier in self.mirrors:
+            await tier.repository.connect_to_database(tier.db_setting)
+
+    async def close_database_connection(self):
+        for tier in self.caches + self.mirrors:
+            await tier.repository.close_database_connection()
+        await self.primary.close_database_connection()
+
+    async def _cached(self, read):
+        now = time.monotonic()
+        for tier in self.caches:
+            if tier.bypass_until > now:
+                continue
+            try:
+                return await read(tier.repository)
+            except ConceptNotFoundException:
+                pass
+            except Exception as e:
+                logger.warning(f"Reading from the {tier.name} repository failed: {e!r}")
+        return None
+
+    async def _load(self, cd_id_base64url_encoded: str) -> ConceptDescription:
+        with primary_reads():
+            concept = await self.primary.get_concept_description(cd_id_base64url_encoded)
+        now = time.monotonic()
+        for tier in self.caches:
+            if tier.bypass_until > now:
+                continue
+            try:
+                await tier.repository.add_concept_description(concept)
+            except DuplicateConceptException:
+                pass
+            except Exception as e:
+                logger.warning(f"Filling the {tier.name} repository failed: {e!r}")
+        return concept
+
+    async def _replicate(self, tiers: List[Tier], write):
+        for tier in tiers:
+            try:
+                await write(tier.repository)
+            except Exception as e:
+                logger.warning(f"Writing to the {tier.name} repository failed: {e!r}")
+
+    async def _written(self, cd_id_base64url_encoded: str):
+        for tier in self.caches:
+            try:
+                await tier.repository.delete_concept_description(cd_id_base64url_encoded)
+            except ConceptNotFoundException:
+                pass
+            except Exception as e:
+                tier.bypass_until = time.monotonic() + tier.ttl
+                logger.warning(f"Invalidating the {tier.name} repository failed, it is bypassed for {tier.ttl}s: {e!r}")
+
+    async def get_concept_description(self, cd_id_base64url_encoded: str) -> ConceptDescription:
+        concept = await self._cached(lambda repository: repository.get_concept_description(cd_id_base64url_encoded))
+        return concept if concept is not None else await self._load(cd_id_base64url_encoded)
+
+    async def get_concept_description_encoded(self, cd_id_base64url_encoded: str, media_type: str) -> bytes:
+        content = await self._cached(
+            lambda repository: repository.get_concept_description_encoded(cd_id_base64url_encoded, media_type)
+        )
+        if content is not None:
+            return content
+        return encode_model(await self._load(cd_id_base64url_encoded), media_type)
+
+    async def get_concept_description_projected(self, cd_id_base64url_encoded: str, projection: Projection) -> dict:
+        document = await self._cached(
+            lambda repository: repository.get_concept_description_projected(cd_id_base64url_encoded, projection)
+        )
+        if document is not None:
+            return document
+        concept = await self._load(cd_id_base64url_encoded)
+        return project_document(concept.model_dump(mode="json", exclude_none=True), projection)
+
+    async def add_concept_description(self, concept_description: ConceptDescription) -> ConceptDescription:
+        result = await self.primary.add_concept_description(concept_description)
+        await self._written(base_64_url_encode(concept_description.id))
+
+        async def add(repository: ConceptDescriptionRepository):
+            try:
+                await repository.add_concept_description(concept_description)
+            except DuplicateConceptException:
+                await repository.update_concept_description(
+                    base_64_url_encode(concept_description.id), concept_description
+                )
+
+        await self._replicate(self.mirrors, add)
+        return result
+
+    async def add_concept_descriptions(self, concept_descriptions: List[ConceptDescription]) -> List[str]:
+        added = await self.primary.add_concept_descriptions(concept_descriptions)
+        for cd_id_base64url_encoded in added:
+            await self._written(cd_id_base64url_encoded)
+        added_ids = set(added)
+        batch = [concept for concept in concept_descriptions if base_64_url_encode(concept.id) in added_ids]
+        await self._replicate(self.mirrors, lambda repository: repository.add_concept_descriptions(batch))
+        return added
+
+    async def update_concept_description(
+        self, cd_id_base64url_encoded: str, concept_description: ConceptDescription
+    ) -> bool:
+        result = await self.primary.update_concept_description(cd_id_base64url_encoded, concept_description)
+        await self._written(cd_id_base64url_encoded)
+
+        async def update(repository: ConceptDescriptionRepository):
+            try:
+                await repository.update_concept_description(cd_id_base64url_encoded, concept_description)
+            except ConceptNotFoundException:
+                await repository.add_concept_description(concept_description)
+
+        await self._replicate(self.mirrors, update)
+        return result
+
+    async def delete_concept_description(self, cd_id_base64url_encoded: str) -> bool:
+        result = await self.primary.delete_concept_description(cd_id_base64url_encoded)
+        await self._written(cd_id_base64url_encoded)
+
+        async def delete(repository: ConceptDescriptionRepository):
+            try:
+                await repository.delete_concept_description(cd_id_base64url_encoded)
+            except ConceptNotFoundException:
+                pass
+
+        await self._replicate(self.mirrors, delete)
+        return result
+
+    async def get_concept_descriptions(self, query: dict, cursor=None, limit=100) -> GetConceptDescriptionsResult:
+        return await self.primary.get_concept_descriptions(query, cursor=cursor, limit=limit)
+
+    async def get_concept_descriptions_projected(
+        self, query: dict, projection: Projection, cursor=None, limit=100
+    ) -> GetProjectedConceptDescriptionsResult:
+        return await self.primary.get_concept_descriptions_projected(query, projection, cursor=cursor, limit=limit)
+
+    async def get_concept_description_history(
+        self, cd_id_base64url_encoded: str, cursor=None, limit=100
+    ) -> GetConceptDescriptionsResult:
+        return await self.primary.get_concept_description_history(cd_id_base64url_encoded, cursor, limit)
+
+    async def get_concept_description_versions(
+        self, cd_id_base64url_encoded: str, cursor=None, limit=100
+    ) -> GetConceptDescriptionVersionsResult:
+        return await self.primary.get_concept_description_versions(cd_id_base64url_encoded, cursor, limit)
+
+    async def get_concept_description_version(self, cd_id_base64url_encoded: str, version: int) -> ConceptDescription:
+        return await self.primary.get_concept_description_version(cd_id_base64url_encoded, version)
+
+    async def ping(self, timeout: float):
+        return await self.primary.ping(timeout)
+
+    async def get_seed_version(self) -> Optional[str]:
+        return await self.primary.get_seed_version()
+
+    async def set_seed_version(self, version: str):
+        await self.primary.set_seed_version(version)
+
+    def get_change_feed(self) -> ChangeFeed:
+        return self.primary.get_change_feed()
+
+    def get_repository_metadata(self):
+        return self.primary.get_repository_metadata()
@@ -0,0 +1,174 @@
+#  MIT License
+#
+#  Copyright (c) 2024. Mohammad Hossein Rimaz
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of
+#  this software and associated documentation files (the “Software”), to deal in
+#  the Software without restriction, including without limitation the rights to use,
+#  copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the
+#  Software, and to permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+#  INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#  PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+#  HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#  CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE
+#  OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import functools
+import inspect
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import route_label
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # tracing is optional
+    propagate = trace = None
+
+TRACER_NAME = "aasbrain"
+
+# set by configure_tracing, spans are only created when tracing was configured
+_tracer = None
+
+
+def configure_tracing(exporter: str, service_name: str, file: str) -> bool:
+    """
+    Installs a tracer provider exporting to an OTLP collector ("otlp", configured by the OTEL_EXPORTER_OTLP_*
+    environment variables), to stdout ("console") or as JSON lines to a file ("file").
+    Returns whether tracing is enabled.
+    """
+    global _tracer
+    if not exporter or exporter == "none":
+        return False
+    if trace is None:
+        logger.warning("Tracing requires the packages of tracing-requirements.txt, tracing is disabled")
+        return False
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        span_exporter = OTLPSpanExporter()
+    elif exporter == "console":
+        span_exporter = ConsoleSpanExporter()
+    elif exporter == "file":
+        span_exporter = ConsoleSpanExporter(
+            out=open(file, "a", encoding="utf-8"), formatter=lambda span: span.to_json(indent=None) + os.linesep
+        )
+    else:
+        raise ValueError(f"Invalid tracing exporter provided: {exporter}, expected otlp, console, file or none")
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(TRACER_NAME)
+    _instrument_clients()
+    return True
+
+
+def _instrument_clients():
+    # Redis commands and the HTTP calls to GraphDB are traced by the instrumentations of the client libraries
+    for module, instrumentor in [
+        ("opentelemetry.instrumentation.redis", "RedisInstrumentor"),
+        ("opentelemetry.instrumentation.requests", "RequestsInstrumentor"),
+    ]:
+        try:
+            getattr(__import__(module, fromlist=[instrumentor]), instrumentor)().instrument()
+        except ImportError:
+            logger.info(f"{module} is not installed, its calls are not traced")
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+@contextmanager
+def span(name: str, **attributes):
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def current_trace_id() -> Optional[str]:
+    if _tracer is None:
+        return None
+    context = trace.get_current_span().get_span_context()
+    return trace.format_trace_id(context.trace_id) if context.is_valid else None
+
+
+def trace_repository(repository, backend: str):
+    """Wraps the coroutine methods of the repository instance in spans."""
+    for name, method in inspect.getmembers(repository, inspect.iscoroutinefunction):
+        if name.startswith("_"):
+            continue
+
+        def traced(method, name):
+            @functools.wraps(method)
+            async def call(*args, **kwargs):
+                with span(f"repository.{name}", **{"db.system": backend}):
+                    return await method(*args, **kwargs)
+
+            return call
+
+        setattr(repository, name, traced(method, name))
+    return repository
+
+
+def graphql_extensions(request, context) -> list:
+    # resolved per request, so the extension is only imported when tracing was configured
+    if _tracer is None:
+        return []
+    from ariadne.contrib.tracing.opentelemetry import OpenTelemetryExtension
+
+    return [OpenTelemetryExtension]
+
+
+class TracingMiddleware:
+    """
+    Starts a server span for every HTTP request, continuing the trace of the W3C traceparent header.
+    The trace id is kept in the request state, so error responses can return it as their correlationId.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if _tracer is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        with _tracer.start_as_current_span(
+            scope["method"],
+            context=propagate.extract(headers),
+            kind=trace.SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as server_span:
+            scope.setdefault("state", {})["trace_id"] = trace.format_trace_id(server_span.get_span_context().trace_id)
+
+            async def send_with_status(message: Message):
+                if message["type"] == "http.response.start":
+                    server_span.set_attribute("http.response.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = route_label(scope)
+                server_span.update_name(f"{scope['method']} {route}")
+                server_span.set_attribute("http.route", route)
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from tests.model_test import get_testdata_json
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-depth", type=int, default=3, help="Nesting depth of the synthetic submodels")
+    parser.addoption(
+        "--bench-width", type=int, default=10, help="Submodel elements per level of the synthetic submodels"
+    )
+
+
+def synthetic_submodel_document(depth: int, width: int) -> dict:
+    """A submodel with `width` properties and one collection per level, nested `depth` levels deep."""
+
+    def elements(level: int) -> list:
+        result = [
+            {
+                "idShort": f"Property{level}_{idx}",
+                "modelType": "Property",
+                "valueType": "xs:string",
+                "value": f"value {level} {idx}",
+                "semanticId": {
+                    "type": "ExternalReference",
+                    "keys": [{"type": "GlobalReference", "value": f"urn:p:{idx}"}],
+                },
+            }
+            for idx in range(width)
+        ]
+        if level < depth:
+            result.append(
+                {
+                    "idShort": f"Collection{level}",
+                    "modelType": "SubmodelElementCollection",
+                    "value": elements(level + 1),
+                }
+            )
+        return result
+
+    return {"id": "urn:example:submodel:synthetic", "modelType": "Submodel", "submodelElements": elements(1)}
+
+
+@pytest.fixture(scope="session")
+def concept_description_document() -> dict:
+    return json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+
+
+@pytest.fixture(scope="session")
+def submodel_document() -> dict:
+    return json.loads(get_testdata_json("Submodel", "maximal"))["submodels"][0]
+
+
+@pytest.fixture(scope="session")
+def synthetic_document(request) -> dict:
+    return synthetic_submodel_document(
+        request.config.getoption("--bench-depth"), request.config.getoption("--bench-width")
+    )
@@ -0,0 +1,244 @@
+"""
+Load generator for a running repository service.
+
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000 --concurrency 32 --duration 30 \
+        --mix get=60,list=15,graphql=10,write=10,rdf=5
+
+It seeds `--concepts` concept descriptions, drives the operation mix with `--concurrency` concurrent workers and
+reports the throughput and the latency percentiles and histogram per operation. `run_load_test` takes any
+httpx.AsyncClient, e.g. one with an ASGITransport to load an app in-process.
+"""
+
+import argparse
+import asyncio
+import base64
+import bisect
+import json
+import random
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+# upper bounds of the histogram buckets in milliseconds
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf")]
+
+DEFAULT_MIX = "get=60,list=15,graphql=10,write=10,rdf=5"
+
+GRAPHQL_QUERY = "query($id: String!) { conceptDescription(id: $id) { id idShort } }"
+
+
+def b64(identifier: str) -> str:
+    return base64.urlsafe_b64encode(identifier.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def concept_document(identifier: str, revision: int = 0) -> dict:
+    return {
+        "id": identifier,
+        "idShort": f"LoadTest{revision}",
+        "modelType": "ConceptDescription",
+        "displayName": [{"language": "en", "text": f"Load test concept {revision}"}],
+        "embeddedDataSpecifications": [
+            {
+                "dataSpecification": {
+                    "type": "ExternalReference",
+                    "keys": [
+                        {
+                            "type": "GlobalReference",
+                            "value": "https://admin-shell.io/DataSpecificationTemplates/DataSpecificationIEC61360/3/0",
+                        }
+                    ],
+                },
+                "dataSpecificationContent": {
+                    "modelType": "DataSpecificationIec61360",
+                    "preferredName": [{"language": "en", "text": "Load test"}, {"language": "de", "text": "Lasttest"}],
+                    "unit": "mm",
+                },
+            }
+        ],
+    }
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.samples: List[float] = []
+        self.errors = 0
+        self.histogram = [0] * len(HISTOGRAM_BUCKETS_MS)
+
+    def record(self, seconds: float, ok: bool):
+        self.samples.append(seconds)
+        self.histogram[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, seconds * 1000)] += 1
+        if not ok:
+            self.errors += 1
+
+    def percentile(self, percent: float) -> float:
+        """Nearest rank percentile in milliseconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(1, -(-len(ordered) * percent // 100))
+        return ordered[int(rank) - 1] * 1000
+
+    def summary(self, elapsed: float) -> dict:
+        return {
+            "requests": len(self.samples),
+            "errors": self.errors,
+            "throughput": len(self.samples) / elapsed if elapsed else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": max(self.samples, default=0.0) * 1000,
+            "histogram_ms": {str(bound): count for bound, count in zip(HISTOGRAM_BUCKETS_MS, self.histogram) if count},
+        }
+
+
+class Scenario:
+    """The operations of the mix, each sends one request and returns the response."""
+
+    def __init__(self, client: httpx.AsyncClient, identifiers: List[str]):
+        self.client = client
+        self.identifiers = identifiers
+        self.revision = 0
+
+    async def seed(self):
+        for identifier in self.identifiers:
+            response = await self.client.post("/concept-descriptions", json=concept_document(identifier))
+            if response.status_code not in (201, 400, 409):
+                response.raise_for_status()
+
+    async def cleanup(self):
+        for identifier in self.identifiers:
+            await self.client.delete(f"/concept-descriptions/{b64(identifier)}")
+
+    async def get(self) -> httpx.Response:
+        return await self.client.get(f"/concept-descriptions/{b64(random.choice(self.identifiers))}")
+
+    async def list(self) -> httpx.Response:
+        return await self.client.get("/concept-descriptions", params={"limit": 20})
+
+    async def graphql(self) -> httpx.Response:
+        variables = {"id": random.choice(self.identifiers)}
+        return await self.client.post("/graphql/", json={"query": GRAPHQL_QUERY, "variables": variables})
+
+    async def write(self) -> httpx.Response:
+        self.revision += 1
+        identifier = random.choice(self.identifiers)
+        return await self.client.put(
+            f"/concept-descriptions/{b64(identifier)}", json=concept_document(identifier, self.revision)
+        )
+
+    async def rdf(self) -> httpx.Response:
+        return await self.client.post(
+            "/concept-description:jsontordf", json=concept_document(random.choice(self.identifiers))
+        )
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if not hasattr(Scenario, name) or name in ("seed", "cleanup"):
+            raise ValueError(f"Unknown operation {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    concurrency: int = 16,
+    duration: Optional[float] = 10.0,
+    requests: Optional[int] = None,
+    concepts: int = 100,
+    cleanup: bool = True,
+) -> dict:
+    """Runs until `requests` were sent or `duration` seconds passed, whatever comes first."""
+    run_id = uuid.uuid4().hex[:8]
+    scenario = Scenario(client, [f"urn:loadtest:{run_id}:{idx}" for idx in range(concepts)])
+    await scenario.seed()
+
+    operations: List[Callable] = [getattr(scenario, name) for name in mix]
+    weights = list(mix.values())
+    recorders = {name: LatencyRecorder() for name in mix}
+    remaining = [requests if requests is not None else float("inf")]
+    started = time.perf_counter()
+    deadline = started + duration if duration else float("inf")
+
+    async def worker():
+        while remaining[0] > 0 and time.perf_counter() < deadline:
+            remaining[0] -= 1
+            operation = random.choices(operations, weights)[0]
+            begin = time.perf_counter()
+            try:
+                response = await operation()
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            recorders[operation.__name__].record(time.perf_counter() - begin, ok)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    if cleanup:
+        await scenario.cleanup()
+
+    total = LatencyRecorder()
+    for recorder in recorders.values():
+        for sample in recorder.samples:
+            total.record(sample, True)
+        total.errors += recorder.errors
+    return {
+        "elapsed_s": elapsed,
+        "concurrency": concurrency,
+        "operations": {name: recorder.summary(elapsed) for name, recorder in recorders.items()},
+        "total": total.summary(elapsed),
+    }
+
+
+def format_report(report: dict) -> str:
+    header = f"{'operation':<10}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    lines = [header, "-" * len(header)]
+    for name, summary in [*report["operations"].items(), ("total", report["total"])]:
+        lines.append(
+            f"{name:<10}{summary['requests']:>10}{summary['errors']:>8}{summary['throughput']:>10.1f}"
+            f"{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}{summary['p99_ms']:>10.2f}"
+        )
+    lines.append("")
+    lines.append("latency histogram (upper bound ms: requests)")
+    for name, summary in report["operations"].items():
+        buckets = ", ".join(f"<={bound}: {count}" for bound, count in summary["histogram_ms"].items())
+        lines.append(f"{name:<10}{buckets}")
+    return "\n".join(lines)
+
+
+async def main(args: argparse.Namespace):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        report = await run_load_test(
+            client,
+            parse_mix(args.mix),
+            concurrency=args.concurrency,
+            duration=args.duration,
+            requests=args.requests,
+            concepts=args.concepts,
+            cleanup=not args.keep,
+        )
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test of the concept description repository")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted operations, default {DEFAULT_MIX}")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after that many requests")
+    parser.add_argument("--concepts", type=int, default=100, help="Concept descriptions seeded for the run")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded concept descriptions")
+    parser.add_argument("--json", help="Also write the report to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,19 @@
+from app.models.concept_description import ConceptDescription
+from app.models.submodel import Submodel
+
+
+def test_validate_concept_description(benchmark, concept_description_document):
+    benchmark(ConceptDescription.model_validate, concept_description_document)
+
+
+def test_validate_submodel(benchmark, submodel_document):
+    benchmark(Submodel.model_validate, submodel_document)
+
+
+def test_validate_synthetic_submodel(benchmark, synthetic_document):
+    benchmark(Submodel.model_validate, synthetic_document)
+
+
+def test_dump_concept_description_json(benchmark, concept_description_document):
+    concept = ConceptDescription.model_validate(concept_description_document)
+    benchmark(concept.model_dump_json, exclude_none=True)
@@ -0,0 +1,53 @@
+import pytest
+
+from app.models.concept_description import ConceptDescription
+from app.models.indexed_graph import IndexedGraph
+from app.models.serializer import write_rdf
+from app.models.submodel import Submodel
+
+BASE_URI = "https://example.org/"
+
+
+@pytest.fixture(scope="module")
+def concept(concept_description_document):
+    return ConceptDescription.model_validate(concept_description_document)
+
+
+@pytest.fixture(scope="module")
+def synthetic_submodel(synthetic_document):
+    return Submodel.model_validate(synthetic_document)
+
+
+def test_concept_description_to_rdf(benchmark, concept):
+    benchmark(concept.to_rdf, base_uri=BASE_URI)
+
+
+def test_concept_description_rdf_round_trip(benchmark, concept):
+    def round_trip():
+        graph, node = concept.to_rdf(base_uri=BASE_URI)
+        return ConceptDescription.from_rdf(IndexedGraph(graph), node)
+
+    benchmark(round_trip)
+
+
+def test_synthetic_submodel_rdf_round_trip(benchmark, synthetic_submodel):
+    def round_trip():
+        graph, node = synthetic_submodel.to_rdf(base_uri=BASE_URI)
+        return Submodel.from_rdf(IndexedGraph(graph), node)
+
+    benchmark(round_trip)
+
+
+@pytest.mark.parametrize("rdf_format", ["turtle_custom", "nt", "json-ld"])
+def test_serialize_concept_description_rdflib(benchmark, concept, rdf_format):
+    graph, _ = concept.to_rdf(base_uri=BASE_URI)
+    benchmark(graph.serialize, format=rdf_format, encoding="utf-8")
+
+
+@pytest.mark.parametrize("rdf_format", ["turtle", "nt"])
+def test_write_concept_description_direct(benchmark, concept, rdf_format):
+    benchmark(write_rdf, concept, rdf_format, base_uri=BASE_URI)
+
+
+def test_write_synthetic_submodel_turtle(benchmark, synthetic_submodel):
+    benchmark(write_rdf, synthetic_submodel, "turtle", base_uri=BASE_URI)
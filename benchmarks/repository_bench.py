@@ -0,0 +1,80 @@
+import asyncio
+import itertools
+
+import fakeredis
+import pytest
+
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+from app.repository.impl.redis_history import RedisHistoryStore
+from tests.graphdb_backend_test import InMemoryGraphDBRepository
+
+
+def redis_repository(history: bool):
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    if history:
+        repository.history = RedisHistoryStore(repository.client)
+    return repository
+
+
+# local stand-ins of the backends, they measure the repository code rather than the database
+REPOSITORIES = {
+    "redis": lambda: redis_repository(history=False),
+    "redis-history": lambda: redis_repository(history=True),
+    "graphdb": InMemoryGraphDBRepository,
+}
+
+
+@pytest.fixture
+def run():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(params=list(REPOSITORIES))
+def repository(request):
+    return REPOSITORIES[request.param]()
+
+
+@pytest.fixture
+def concept(concept_description_document):
+    return ConceptDescription.model_validate(concept_description_document)
+
+
+def test_add_concept_description(benchmark, run, repository, concept):
+    ids = itertools.count()
+
+    def add():
+        run(repository.add_concept_description(concept.model_copy(update={"id": f"urn:bench:{next(ids)}"})))
+
+    benchmark(add)
+
+
+def test_get_concept_description(benchmark, run, repository, concept):
+    run(repository.add_concept_description(concept))
+    benchmark(lambda: run(repository.get_concept_description(base_64_url_encode(concept.id))))
+
+
+def test_update_concept_description(benchmark, run, repository, concept):
+    run(repository.add_concept_description(concept))
+    identifier = base_64_url_encode(concept.id)
+    versions = itertools.count()
+
+    def update():
+        changed = concept.model_copy(update={"idShort": f"Version{next(versions)}"})
+        run(repository.update_concept_description(identifier, changed))
+
+    benchmark(update)
+
+
+def test_add_and_delete_concept_description(benchmark, run, repository, concept):
+    identifier = base_64_url_encode(concept.id)
+
+    def add_and_delete():
+        run(repository.add_concept_description(concept))
+        run(repository.delete_concept_description(identifier))
+
+    benchmark(add_and_delete)
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code: str):
+    # every round is a fresh interpreter, imports cached in this process would hide the cold start
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
+def test_import_app(benchmark):
+    benchmark.pedantic(run_python, args=("import app.main",), rounds=5, warmup_rounds=1)
+
+
+def test_first_response(benchmark):
+    code = (
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "assert TestClient(app).get('/health').status_code == 200\n"
+    )
+    benchmark.pedantic(run_python, args=(code,), rounds=5, warmup_rounds=1)
+
+
+def test_first_graphql_response(benchmark):
+    # the GraphQL schema is built with the first GraphQL request
+    code = (
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "assert TestClient(app).post('/graphql/', json={'query': '{__typename}'}).status_code == 200\n"
+    )
+    benchmark.pedantic(run_python, args=(code,), rounds=5, warmup_rounds=1)
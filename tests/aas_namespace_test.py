@@ -0,0 +1,22 @@
+import rdflib
+
+from app.models.aas_namespace import AASNameSpace
+from app.models.data_type_def_xsd import DataTypeDefXsd
+from app.models.key_types import KeyTypes
+
+
+def test_namespace_terms_are_interned():
+    assert AASNameSpace.AAS["Reference/keys"] is AASNameSpace.AAS["Reference/keys"]
+    assert AASNameSpace.AAS["Reference/keys"] == rdflib.URIRef("https://admin-shell.io/aas/3/0/Reference/keys")
+    assert AASNameSpace.INDEX == rdflib.URIRef("https://admin-shell.io/aas/3/0/index")
+
+
+def test_enum_uri():
+    assert AASNameSpace.enum_uri(KeyTypes.Submodel) == AASNameSpace.AAS["KeyTypes/Submodel"]
+    assert AASNameSpace.enum_uri(DataTypeDefXsd.Boolean) == AASNameSpace.AAS["DataTypeDefXsd/Boolean"]
+
+
+def test_index_literal():
+    assert AASNameSpace.index_literal(3) is AASNameSpace.index_literal(3)
+    assert AASNameSpace.index_literal(3) == rdflib.Literal(3)
+    assert AASNameSpace.index_literal(1000) == rdflib.Literal(1000)
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.models.response import ChangeEventType, InvalidPayloadException
+from app.repository import get_repository
+from app.repository.change_feed import RedisChangeFeed
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+from app.repository.impl.redis_history import RedisHistoryStore
+
+
+def get_repository_with_feed():
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    repository.history = RedisHistoryStore(repository.client)
+    repository.change_feed = RedisChangeFeed(repository.client, poll_interval=0.01)
+    return repository
+
+
+def test_redis_change_feed_records_mutations():
+    repository = get_repository_with_feed()
+    concept = ConceptDescription(id="urn:example:concept:1")
+    identifier = base_64_url_encode(concept.id)
+    asyncio.run(repository.add_concept_description(concept))
+    asyncio.run(repository.update_concept_description(identifier, concept.model_copy(update={"idShort": "changed"})))
+    # unchanged, no event
+    asyncio.run(repository.update_concept_description(identifier, concept.model_copy(update={"idShort": "changed"})))
+    asyncio.run(repository.delete_concept_description(identifier))
+
+    events = repository.change_feed.read()
+    assert [(event.type, event.id) for event in events] == [
+        (ChangeEventType.Created, identifier),
+        (ChangeEventType.Updated, identifier),
+        (ChangeEventType.Deleted, identifier),
+    ]
+    assert [event.type for event in repository.change_feed.read(after=events[0].sequence)] == [
+        ChangeEventType.Updated,
+        ChangeEventType.Deleted,
+    ]
+
+
+def test_redis_change_feed_rejects_a_malformed_cursor():
+    repository = get_repository_with_feed()
+    with pytest.raises(InvalidPayloadException):
+        repository.change_feed.read(after="0) DROP")
+
+
+def test_change_feed_endpoints():
+    repository = get_repository_with_feed()
+    for idx in range(3):
+        asyncio.run(repository.add_concept_description(ConceptDescription(id=f"urn:example:concept:{idx}")))
+    app.dependency_overrides[get_repository] = lambda: repository
+    try:
+        client = TestClient(app)
+        page = client.get("/concept-descriptions:changes?limit=2").json()
+        rest = client.get(f"/concept-descriptions:changes?cursor={page['paging_metadata']['cursor']}").json()
+        with client.websocket_connect(f"/concept-descriptions:watch?cursor={page['result'][0]['sequence']}") as ws:
+            watched = [json.loads(ws.receive_text())["id"] for _ in range(2)]
+    finally:
+        app.dependency_overrides.clear()
+    assert len(page["result"]) == 2
+    assert [event["id"] for event in rest["result"]] == [base_64_url_encode("urn:example:concept:2")]
+    assert rest["paging_metadata"]["cursor"] == rest["result"][0]["sequence"]
+    assert watched == [base_64_url_encode(f"urn:example:concept:{idx}") for idx in (1, 2)]
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.codec import (
+    CBOR_MEDIA_TYPE,
+    CODECS,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    decode_document,
+    decode_stored_document,
+    encode_document,
+    encode_model,
+)
+from app.models.concept_description import ConceptDescription
+from app.repository import get_repository
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+from tests.model_test import get_testdata_json
+from tests.xml_serializer_test import RecordingRepository
+
+
+def get_maximal_concept():
+    return ConceptDescription(
+        **json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+    )
+
+
+@pytest.mark.parametrize("media_type", list(CODECS))
+def test_codec_round_trip(media_type):
+    concept = get_maximal_concept()
+    document = concept.model_dump(mode="json", exclude_none=True)
+    assert decode_document(encode_document(document, media_type), media_type) == document
+    assert ConceptDescription.model_validate(decode_document(encode_model(concept, media_type), media_type)) == concept
+
+
+def test_decode_stored_json_with_binary_storage_format():
+    data = encode_model(get_maximal_concept(), JSON_MEDIA_TYPE)
+    assert decode_stored_document(data, CBOR_MEDIA_TYPE) == json.loads(data)
+
+
+def test_redis_serves_stored_encoding():
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    repository.storage_media_type = MSGPACK_MEDIA_TYPE
+    concept = get_maximal_concept()
+    asyncio.run(repository.add_concept_description(concept))
+    key = next(iter(repository.client.scan_iter()))
+    stored = repository.client.get(key)
+    assert asyncio.run(repository.get_concept_description_encoded(key.decode(), MSGPACK_MEDIA_TYPE)) == stored
+    cbor = asyncio.run(repository.get_concept_description_encoded(key.decode(), CBOR_MEDIA_TYPE))
+    assert ConceptDescription.model_validate(decode_document(cbor, CBOR_MEDIA_TYPE)) == concept
+    assert asyncio.run(repository.get_concept_description(key.decode())) == concept
+
+
+def test_post_concept_description_as_cbor():
+    repository = RecordingRepository()
+    concept = ConceptDescription(id="urn:example:concept:1", idShort="Concept")
+    app.dependency_overrides[get_repository] = lambda: repository
+    try:
+        response = TestClient(app).post(
+            "/concept-descriptions",
+            content=encode_model(concept, CBOR_MEDIA_TYPE),
+            headers={"Content-Type": CBOR_MEDIA_TYPE, "Accept": MSGPACK_MEDIA_TYPE},
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 201
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert ConceptDescription.model_validate(decode_document(response.content, MSGPACK_MEDIA_TYPE)) == concept
+    assert repository.added == [concept]
@@ -0,0 +1,81 @@
+import gzip
+
+import brotli
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api.compression import CompressionCache, CompressionMiddleware, compress, select_content_encoding
+
+BODY = b"Definition of the concept in many languages. " * 100
+
+
+def get_client(cache_bytes=0):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=512, cache_bytes=cache_bytes)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse(b"small")
+
+    @app.get("/image")
+    async def image():
+        return PlainTextResponse(BODY, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([BODY[:100], BODY[100:]]), media_type="text/turtle")
+
+    return TestClient(app)
+
+
+def test_select_content_encoding():
+    encodings = ["br", "zstd", "gzip"]
+    assert select_content_encoding(None, encodings) is None
+    assert select_content_encoding("gzip, deflate, br", encodings) == "br"
+    assert select_content_encoding("gzip, br;q=0.5", encodings) == "gzip"
+    assert select_content_encoding("*", encodings) == "br"
+    assert select_content_encoding("br;q=0, *;q=0.1", encodings) == "zstd"
+    assert select_content_encoding("identity", encodings) is None
+
+
+def test_compression_round_trip():
+    assert gzip.decompress(compress(BODY, "gzip")) == BODY
+    assert brotli.decompress(compress(BODY, "br")) == BODY
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(compress(BODY, "zstd")) == BODY
+
+
+def test_compression_middleware():
+    client = get_client()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == BODY
+    response = client.get("/large", headers={"Accept-Encoding": "zstd"})
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(response.content) == BODY
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_compression_middleware_streams():
+    response = get_client().get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == BODY
+
+
+def test_compression_cache():
+    cache = CompressionCache(max_bytes=len(compress(BODY, "gzip")) * 2 + 16)
+    compressed = cache.get_or_compress(BODY, "gzip")
+    assert cache.get_or_compress(BODY, "gzip") is compressed
+    cache.get_or_compress(BODY + b"1", "gzip")
+    cache.get_or_compress(BODY + b"2", "gzip")
+    assert len(cache) == 2
+    assert cache.size <= cache.max_bytes
+    assert cache.get_or_compress(BODY, "gzip") is not compressed
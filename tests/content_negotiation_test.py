@@ -0,0 +1,73 @@
+import json
+
+import rdflib
+from fastapi.testclient import TestClient
+from rdflib.compare import isomorphic
+
+from app.api.rest.content_negotiation import parse_accept_header, serialize_rdf, stream_concept_descriptions_as_rdf
+from app.main import app
+from app.models.concept_description import ConceptDescription
+from app.models.response import GetConceptDescriptionsResult
+from app.repository import get_repository
+from tests.model_test import get_testdata_json
+
+
+def get_concepts():
+    maximal = json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+    return [ConceptDescription(**maximal), ConceptDescription(id="urn:example:concept:1")]
+
+
+class PageRepository:
+    def __init__(self, concepts, cursor=""):
+        self.concepts = concepts
+        self.cursor = cursor
+
+    async def get_concept_descriptions(self, query: dict, cursor=None, limit=100) -> GetConceptDescriptionsResult:
+        return GetConceptDescriptionsResult(paging_metadata={"cursor": self.cursor}, result=self.concepts)
+
+
+def test_parse_accept_header():
+    assert parse_accept_header(None) == []
+    assert parse_accept_header("text/turtle") == ["text/turtle"]
+    assert parse_accept_header("application/json;q=0.5, text/turtle, */*;q=0.1") == [
+        "text/turtle",
+        "application/json",
+        "*/*",
+    ]
+    assert parse_accept_header("text/turtle;q=0, application/ld+json") == ["application/ld+json"]
+
+
+def test_stream_concept_descriptions_as_turtle():
+    maximal = json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+    # two concepts with blank nodes, their nodes must not be merged
+    concepts = get_concepts() + [ConceptDescription(**{**maximal, "id": "urn:example:concept:2"})]
+    for media_type, rdf_format in [("text/turtle", "turtle"), ("application/n-triples", "nt")]:
+        expected = rdflib.Graph()
+        for concept in concepts:
+            expected += rdflib.Graph().parse(data=serialize_rdf(concept, media_type), format=rdf_format)
+        payload = b"".join(stream_concept_descriptions_as_rdf(concepts, media_type))
+        graph = rdflib.Graph().parse(data=payload, format=rdf_format)
+        assert len(graph) == len(expected)
+        assert isomorphic(graph, expected)
+
+
+def test_stream_concept_descriptions_as_json_ld():
+    concepts = get_concepts()
+    payload = b"".join(stream_concept_descriptions_as_rdf(concepts, "application/ld+json"))
+    graph = rdflib.Graph().parse(data=payload, format="json-ld")
+    identifiers = set(graph.objects(predicate=rdflib.URIRef("https://admin-shell.io/aas/3/0/Identifiable/id")))
+    assert identifiers == {rdflib.Literal(concept.id) for concept in concepts}
+
+
+def test_get_concept_descriptions_as_turtle():
+    app.dependency_overrides[get_repository] = lambda: PageRepository(get_concepts(), cursor="MTA")
+    try:
+        response = TestClient(app).get("/concept-descriptions?limit=2", headers={"Accept": "text/turtle"})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/turtle")
+    assert response.headers["link"] == '<http://testserver/concept-descriptions?limit=2&cursor=MTA>; rel="next"'
+    graph = rdflib.Graph().parse(data=response.content, format="turtle")
+    concept_type = rdflib.URIRef("https://admin-shell.io/aas/3/0/ConceptDescription")
+    assert len(set(graph.subjects(rdflib.RDF.type, concept_type))) == 2
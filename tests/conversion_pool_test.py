@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import pytest
+import rdflib
+from fastapi.testclient import TestClient
+from rdflib.compare import isomorphic
+
+from app.api.rest.conversion_pool import ConversionPool, get_conversion_pool
+from app.main import app
+from app.models.concept_description import ConceptDescription
+from app.models.serializer import write_rdf
+from app.models.submodel import Submodel
+from tests.model_test import get_testdata_json
+
+
+def get_large_submodel(count=7):
+    return {
+        "id": "urn:example:submodel:1",
+        "modelType": "Submodel",
+        "submodelElements": [
+            {"idShort": f"Property{idx}", "modelType": "Property", "valueType": "xs:int", "value": str(idx)}
+            for idx in range(count)
+        ],
+    }
+
+
+def test_chunked_submodel_conversion():
+    payload = get_large_submodel()
+    expected = rdflib.Graph().parse(data=write_rdf(Submodel(**payload)), format="turtle")
+    pool = ConversionPool(workers=2, chunk_size=3)
+    try:
+        content = asyncio.run(pool.to_turtle("submodel", payload))
+        documents = asyncio.run(pool.batch_to_json("submodel", [content.decode("utf-8")]))
+    finally:
+        pool.shutdown()
+    assert isomorphic(rdflib.Graph().parse(data=content, format="turtle"), expected)
+    # from_rdf does not restore the order of the submodel elements
+    assert sorted(element["idShort"] for element in documents[0]["submodelElements"]) == sorted(
+        element["idShort"] for element in payload["submodelElements"]
+    )
+
+
+def test_batch_conversion_endpoints():
+    concepts = [
+        json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0],
+        {"id": "urn:example:concept:1", "modelType": "ConceptDescription"},
+    ]
+    app.dependency_overrides[get_conversion_pool] = lambda: ConversionPool(workers=0)
+    try:
+        client = TestClient(app)
+        turtle = client.post("/concept-descriptions:jsontordf", json=concepts)
+        documents = client.post(
+            "/concept-descriptions:rdftojson",
+            json=[write_rdf(ConceptDescription(**concept)).decode("utf-8") for concept in concepts],
+        )
+    finally:
+        app.dependency_overrides.clear()
+    graph = rdflib.Graph().parse(data=turtle.content, format="turtle")
+    concept_type = rdflib.URIRef("https://admin-shell.io/aas/3/0/ConceptDescription")
+    assert len(set(graph.subjects(rdflib.RDF.type, concept_type))) == 2
+    assert [document["id"] for document in documents.json()] == [concept["id"] for concept in concepts]
+
+
+def test_invalid_payload_keeps_the_pool_usable():
+    pool = ConversionPool(workers=1)
+    app.dependency_overrides[get_conversion_pool] = lambda: pool
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        invalid = client.post("/concept-description:jsontordf", json={"idShort": 5})
+        valid = client.post("/concept-description:jsontordf", json={"id": "urn:example:concept:1"})
+    finally:
+        app.dependency_overrides.clear()
+        pool.shutdown()
+    assert invalid.json()["messages"][0]["code"] == "400"
+    assert valid.status_code == 200
+    assert b"urn:example:concept:1" in valid.content
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+@pytest.mark.parametrize(
+    "turtle",
+    [
+        "this is not turtle",
+        '<x> <y> """unterminated',
+        "@prefix aas: <https://admin-shell.io/aas/3/0/> . <x> a aas:ConceptDescription .",
+    ],
+)
+def test_invalid_turtle_is_an_invalid_payload(workers, turtle):
+    pool = ConversionPool(workers=workers)
+    app.dependency_overrides[get_conversion_pool] = lambda: pool
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        response = client.post(
+            "/concept-description:rdftojson", content=turtle, headers={"Content-Type": "text/turtle"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+        pool.shutdown()
+    assert response.json()["messages"][0]["code"] == "400"
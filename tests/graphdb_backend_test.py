@@ -0,0 +1,217 @@
+import asyncio
+import json
+
+import pytest
+import rdflib
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.models.response import ChangeEventType, ConceptNotFoundException, InvalidPayloadException
+from app.repository import get_repository
+from app.models.rdf_delta import RDFDelta, diff_triples, triples_from_text, triples_to_text
+from app.repository.impl.graphdb_cd_repository import GraphDBConceptDescriptionRepository
+from tests.model_test import get_testdata_json
+
+
+class InMemoryGraphDBRepository(GraphDBConceptDescriptionRepository):
+    """Runs the SPARQL requests against an rdflib dataset instead of a GraphDB server."""
+
+    def __init__(self):
+        self.dataset = rdflib.ConjunctiveGraph()
+        self.updates = []
+
+    def _construct(self, query: str) -> rdflib.Graph:
+        graph = rdflib.Graph()
+        for triple in self.dataset.query(query):
+            graph.add(triple)
+        return graph
+
+    def _select(self, query: str) -> list:
+        return [{name: str(value) for name, value in row.asdict().items()} for row in self.dataset.query(query)]
+
+    def _update(self, update: str):
+        self.updates.append(update)
+        self.dataset.update(update)
+
+    def if_exist(self, cd_identifier: str) -> bool:
+        return len(self.fetch_concept_graph(self._concept_uri(base_64_url_encode(cd_identifier)))) != 0
+
+
+def get_concept():
+    return ConceptDescription(
+        **json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+    )
+
+
+def test_rdf_delta():
+    s, p = rdflib.URIRef("https://x/s"), rdflib.URIRef("https://x/p")
+    old = {(s, p, rdflib.Literal("a")), (s, p, rdflib.Literal("b", lang="en"))}
+    new = {(s, p, rdflib.Literal("a")), (s, p, rdflib.Literal("line\nbreak"))}
+    delta = diff_triples(old, new)
+    assert delta.added == {(s, p, rdflib.Literal("line\nbreak"))}
+    assert delta.apply(old) == new
+    assert delta.inverted().apply(new) == old
+    assert triples_from_text(triples_to_text(old)) == old
+    assert not diff_triples(old, old)
+    assert delta.to_sparql_update().startswith("DELETE DATA {")
+
+
+def test_update_sends_only_the_changed_triples():
+    repository = InMemoryGraphDBRepository()
+    concept = get_concept()
+    asyncio.run(repository.add_concept_description(concept))
+    assert asyncio.run(repository.get_concept_description(base_64_url_encode(concept.id))).id == concept.id
+
+    changed = concept.model_copy(update={"category": "changed"})
+    asyncio.run(repository.update_concept_description(base_64_url_encode(concept.id), changed))
+    assert len(repository.updates) == 2
+    assert "INSERT DATA {\n<" in repository.updates[1] and '"changed"' in repository.updates[1]
+    assert repository.updates[1].count("ConceptDescription") < 5
+    assert asyncio.run(repository.get_concept_description(base_64_url_encode(concept.id))).category == "changed"
+
+    # an unchanged concept is not written at all
+    asyncio.run(repository.update_concept_description(base_64_url_encode(concept.id), changed))
+    assert len(repository.updates) == 2
+
+
+def test_fetch_concept_graph_walks_the_nested_nodes():
+    repository = InMemoryGraphDBRepository()
+    concept = get_concept()
+    other = concept.model_copy(update={"id": f"{concept.id}/other"})
+    for stored in [concept, other]:
+        asyncio.run(repository.add_concept_description(stored))
+    graph, uri = concept.to_rdf(base_uri=f"{repository.base_prefix}/", id_strategy="skolem")
+    assert set(repository.fetch_concept_graph(uri)) == set(graph)
+
+
+def test_concept_stored_with_blank_nodes_is_replaced_by_the_skolemized_graph():
+    repository = InMemoryGraphDBRepository()
+    concept = get_concept()
+    identifier = base_64_url_encode(concept.id)
+    graph, uri = concept.to_rdf(base_uri=f"{repository.base_prefix}/", id_strategy="base64-url-encode")
+    assert any(isinstance(triple[0], rdflib.BNode) for triple in graph)
+    for triple in graph:
+        repository.dataset.add(triple)
+    assert len(repository.fetch_concept_graph(uri)) == len(graph)
+
+    asyncio.run(repository.update_concept_description(identifier, concept.model_copy(update={"category": "first"})))
+    assert not any(isinstance(term, rdflib.BNode) for triple in repository.dataset for term in triple)
+    assert asyncio.run(repository.get_concept_description(identifier)).category == "first"
+    assert asyncio.run(repository.get_concept_description_version(identifier, 0)).category == "first"
+
+
+def test_history_replays_the_recorded_deltas():
+    repository = InMemoryGraphDBRepository()
+    concept = get_concept()
+    identifier = base_64_url_encode(concept.id)
+    asyncio.run(repository.add_concept_description(concept))
+    for category in ["first", "second"]:
+        asyncio.run(
+            repository.update_concept_description(identifier, concept.model_copy(update={"category": category}))
+        )
+
+    history = asyncio.run(repository.get_concept_description_history(identifier))
+    assert [version.category for version in history.result] == [concept.category, "first", "second"]
+    assert history.paging_metadata.cursor == ""
+
+    # the same order and cursors as the Redis history
+    page = asyncio.run(repository.get_concept_description_history(identifier, limit=1))
+    assert [version.category for version in page.result] == [concept.category]
+    assert page.paging_metadata.cursor == base_64_url_encode("1")
+    rest = asyncio.run(repository.get_concept_description_history(identifier, cursor=page.paging_metadata.cursor))
+    assert [version.category for version in rest.result] == ["first", "second"]
+
+    asyncio.run(repository.delete_concept_description(identifier))
+    assert len(repository.fetch_concept_graph(repository._concept_uri(identifier))) == 0
+    versions = asyncio.run(repository.get_concept_description_versions(identifier))
+    assert [(entry.version, entry.deleted) for entry in versions.result] == [(0, None), (1, None), (2, None), (3, True)]
+    assert asyncio.run(repository.get_concept_description_version(identifier, 1)).category == "first"
+    with pytest.raises(ConceptNotFoundException):
+        asyncio.run(repository.get_concept_description_version(identifier, 3))
+
+
+def test_history_replays_only_the_requested_versions():
+    repository = InMemoryGraphDBRepository()
+    concept = get_concept()
+    identifier = base_64_url_encode(concept.id)
+    asyncio.run(repository.add_concept_description(concept))
+    for category in ["first", "second"]:
+        asyncio.run(
+            repository.update_concept_description(identifier, concept.model_copy(update={"category": category}))
+        )
+    repository.fetch_concept_graph = None
+
+    _, versions, more = repository._history(identifier, 2)
+    assert len(versions) == 2 and more
+    assert asyncio.run(repository.get_concept_description_version(identifier, 1)).category == "first"
+
+
+def test_history_of_a_concept_stored_before_the_history():
+    repository = InMemoryGraphDBRepository()
+    concept = get_concept()
+    identifier = base_64_url_encode(concept.id)
+    graph, _ = concept.to_rdf(base_uri=f"{repository.base_prefix}/", id_strategy="skolem")
+    for triple in graph:
+        repository.dataset.add(triple)
+    asyncio.run(repository.update_concept_description(identifier, concept.model_copy(update={"category": "first"})))
+    asyncio.run(repository.update_concept_description(identifier, concept.model_copy(update={"category": "second"})))
+
+    assert asyncio.run(repository.get_concept_description_version(identifier, 0)).category == "first"
+    versions = asyncio.run(repository.get_concept_description_versions(identifier, limit=1))
+    assert [entry.version for entry in versions.result] == [0]
+    assert versions.paging_metadata.cursor == base_64_url_encode("1")
+
+
+def test_history_endpoints():
+    repository = InMemoryGraphDBRepository()
+    concept = get_concept()
+    identifier = base_64_url_encode(concept.id)
+    asyncio.run(repository.add_concept_description(concept))
+    asyncio.run(repository.update_concept_description(identifier, concept.model_copy(update={"category": "first"})))
+
+    app.dependency_overrides[get_repository] = lambda: repository
+    try:
+        client = TestClient(app)
+        versions = client.get(f"/concept-descriptions/{identifier}/history").json()
+        first = client.get(f"/concept-descriptions/{identifier}/history/1").json()
+    finally:
+        app.dependency_overrides.clear()
+    assert [entry["version"] for entry in versions["result"]] == [0, 1]
+    assert first["category"] == "first"
+
+
+def test_change_feed_is_read_from_the_history():
+    repository = InMemoryGraphDBRepository()
+    concept = get_concept()
+    identifier = base_64_url_encode(concept.id)
+    asyncio.run(repository.add_concept_description(concept))
+    asyncio.run(repository.update_concept_description(identifier, concept.model_copy(update={"category": "first"})))
+    asyncio.run(repository.delete_concept_description(identifier))
+
+    # another process sees the same events and cursors
+    other = InMemoryGraphDBRepository()
+    other.dataset = repository.dataset
+    feed = other.get_change_feed()
+    assert feed.read() == []
+    feed.settle_seconds = 0
+    events = feed.read()
+    assert [(event.type, event.id) for event in events] == [
+        (ChangeEventType.Created, identifier),
+        (ChangeEventType.Updated, identifier),
+        (ChangeEventType.Deleted, identifier),
+    ]
+    assert feed.read(after=events[0].sequence, limit=1) == [events[1]]
+    assert feed.last() == events[-1]
+
+
+@pytest.mark.parametrize("cursor", ['1-x") || true) #', "1-x> } DROP ALL #", "abc", "1-"])
+def test_change_feed_rejects_a_malformed_cursor(cursor):
+    repository = InMemoryGraphDBRepository()
+    asyncio.run(repository.add_concept_description(get_concept()))
+    feed = repository.get_change_feed()
+    feed.settle_seconds = 0
+    with pytest.raises(InvalidPayloadException):
+        feed.read(after=cursor)
+    assert len(feed.read()) == 1
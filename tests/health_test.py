@@ -0,0 +1,83 @@
+import asyncio
+
+import fakeredis
+import redis
+from fastapi.testclient import TestClient
+
+from app.config import get_config
+from app.health import ReadinessCheck
+from app.main import app
+from app.models.concept_description import ConceptDescription
+from app.repository import get_repository
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+
+
+class DeadRepository(RedisConceptDescriptionRepository):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.pings = 0
+
+    async def ping(self, timeout: float):
+        self.pings += 1
+        await asyncio.sleep(self.delay)
+        raise ConnectionError("Connection refused")
+
+
+def get_redis_repository():
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    return repository
+
+
+def test_readiness_reports_pool_and_last_write():
+    repository = get_redis_repository()
+    readiness = asyncio.run(ReadinessCheck("redis", 1.0, 0).check(repository))
+    assert readiness.status == "UP"
+    assert readiness.last_write is None
+    assert readiness.pool.max_connections > 0
+    assert 0 <= readiness.pool.saturation <= 1
+
+    asyncio.run(repository.add_concept_description(ConceptDescription(id="urn:example:concept:1")))
+    readiness = asyncio.run(ReadinessCheck("redis", 1.0, 0).check(repository))
+    assert readiness.last_write == repository.get_change_feed().last().timestamp
+
+
+def test_pool_saturation_is_reported_against_the_configured_limit(monkeypatch):
+    monkeypatch.setattr(redis.Redis, "from_url", lambda url, **kwargs: fakeredis.FakeRedis(**kwargs))
+    repository = RedisConceptDescriptionRepository()
+    asyncio.run(repository.connect_to_database({"DB_URI": "redis://localhost"}))
+    connections = [repository.client.connection_pool.get_connection() for _ in range(5)]
+    status = asyncio.run(repository.ping(1.0))
+    assert status.max_connections == get_config().redis_max_connections
+    assert status.in_use == 5
+    assert status.saturation == 5 / get_config().redis_max_connections
+    for connection in connections:
+        repository.client.connection_pool.release(connection)
+
+
+def test_readiness_is_cached():
+    repository = DeadRepository()
+    check = ReadinessCheck("redis", 1.0, 60)
+    assert asyncio.run(check.check(repository)).status == "DOWN"
+    assert asyncio.run(check.check(repository)).error == "Connection refused"
+    assert repository.pings == 1
+
+
+def test_readiness_times_out():
+    readiness = asyncio.run(ReadinessCheck("redis", 0.05, 0).check(DeadRepository(delay=1.0)))
+    assert readiness.status == "DOWN"
+    assert "0.05s" in readiness.error
+
+
+def test_health_endpoints():
+    app.dependency_overrides[get_repository] = lambda: DeadRepository()
+    try:
+        client = TestClient(app)
+        live = client.get("/health")
+        ready = client.get("/health/ready")
+    finally:
+        app.dependency_overrides.clear()
+    assert live.status_code == 200
+    assert live.json()["status"] == "UP"
+    assert ready.status_code == 503
+    assert ready.json()["status"] == "DOWN"
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import fakeredis
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.models.json_patch import apply_patch, diff_documents
+from app.repository import get_repository
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+from app.repository.impl.redis_history import RedisHistoryStore
+from tests.model_test import get_testdata_json
+
+
+def get_repository_with_history(snapshot_interval=3):
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    repository.history = RedisHistoryStore(repository.client, snapshot_interval)
+    return repository
+
+
+def test_json_patch_round_trip():
+    old = json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+    new = json.loads(json.dumps(old))
+    new["idShort"] = "changed"
+    new["displayName"].append({"language": "de", "text": "neu"})
+    del new["category"]
+    new["embeddedDataSpecifications"][0]["dataSpecificationContent"]["preferredName"][0]["text"] = "changed"
+    patch = diff_documents(old, new)
+    assert apply_patch(old, patch) == new
+    assert apply_patch(new, diff_documents(new, old)) == old
+    assert diff_documents(old, json.loads(json.dumps(old))) == []
+    assert {"op": "add", "path": "/displayName/1", "value": {"language": "de", "text": "neu"}} in patch
+
+
+def test_redis_history_replays_from_the_last_snapshot():
+    repository = get_repository_with_history()
+    concept = ConceptDescription(id="urn:example:concept:1", idShort="v0")
+    identifier = base_64_url_encode(concept.id)
+    asyncio.run(repository.add_concept_description(concept))
+    for version in range(1, 8):
+        asyncio.run(
+            repository.update_concept_description(identifier, concept.model_copy(update={"idShort": f"v{version}"}))
+        )
+    # unchanged concepts add no version
+    asyncio.run(repository.update_concept_description(identifier, concept.model_copy(update={"idShort": "v7"})))
+
+    records = [json.loads(data) for data in repository.client.lrange(RedisHistoryStore.key(identifier), 0, -1)]
+    assert ["snapshot" in record for record in records] == [True, False, False, True, False, False, True, False]
+    for version in range(8):
+        assert asyncio.run(repository.get_concept_description_version(identifier, version)).idShort == f"v{version}"
+
+    page = asyncio.run(repository.get_concept_description_versions(identifier, limit=5))
+    assert [entry.version for entry in page.result] == [0, 1, 2, 3, 4]
+    rest = asyncio.run(repository.get_concept_description_history(identifier, cursor=page.paging_metadata.cursor))
+    assert [concept.idShort for concept in rest.result] == ["v5", "v6", "v7"]
+    assert rest.paging_metadata.cursor == ""
+
+    # the history is not listed as a concept description
+    assert len(asyncio.run(repository.get_concept_descriptions({})).result) == 1
+
+
+def test_history_endpoints():
+    repository = get_repository_with_history()
+    concept = ConceptDescription(id="urn:example:concept:1", idShort="first")
+    identifier = base_64_url_encode(concept.id)
+    asyncio.run(repository.add_concept_description(concept))
+    asyncio.run(repository.update_concept_description(identifier, concept.model_copy(update={"idShort": "second"})))
+    asyncio.run(repository.delete_concept_description(identifier))
+
+    app.dependency_overrides[get_repository] = lambda: repository
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        versions = client.get(f"/concept-descriptions/{identifier}/history").json()
+        first = client.get(f"/concept-descriptions/{identifier}/history/0").json()
+        deleted = client.get(f"/concept-descriptions/{identifier}/history/2")
+    finally:
+        app.dependency_overrides.clear()
+    assert [entry.get("deleted", False) for entry in versions["result"]] == [False, False, True]
+    assert first["idShort"] == "first"
+    assert deleted.json()["messages"][0]["code"] == "404"
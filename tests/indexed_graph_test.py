@@ -0,0 +1,39 @@
+import json
+
+import rdflib
+
+from app.models.concept_description import ConceptDescription
+from app.models.indexed_graph import IndexedGraph
+from app.models.submodel import Submodel
+from tests.model_test import get_testdata_json
+
+
+def test_indexed_graph_lookups():
+    graph = rdflib.Graph()
+    subject, predicate = rdflib.URIRef("urn:s"), rdflib.URIRef("urn:p")
+    graph.add((subject, predicate, rdflib.Literal(1)))
+    graph.add((subject, predicate, rdflib.Literal(2)))
+    graph.add((subject, rdflib.RDF.type, rdflib.URIRef("urn:T")))
+    indexed = IndexedGraph(graph)
+    assert len(indexed) == 3
+    assert set(indexed.objects(subject=subject, predicate=predicate)) == {rdflib.Literal(1), rdflib.Literal(2)}
+    assert list(indexed.objects(subject=rdflib.URIRef("urn:other"), predicate=predicate)) == []
+    assert list(indexed.subjects(predicate=rdflib.RDF.type, object=rdflib.URIRef("urn:T"))) == [subject]
+
+
+def normalized(document):
+    # from_rdf does not restore the order of language strings, so lists are compared as multisets
+    if isinstance(document, dict):
+        return {key: normalized(value) for key, value in document.items()}
+    if isinstance(document, list):
+        return sorted((normalized(item) for item in document), key=json.dumps)
+    return document
+
+
+def test_from_rdf_with_indexed_graph():
+    for model, collection in [(Submodel, "submodels"), (ConceptDescription, "conceptDescriptions")]:
+        payload = json.loads(get_testdata_json(model.__name__, "maximal"))[collection][0]
+        graph, node = model(**payload).to_rdf()
+        indexed = model.from_rdf(IndexedGraph(graph), node).model_dump(mode="json", exclude_none=True)
+        expected = model.from_rdf(graph, node).model_dump(mode="json", exclude_none=True)
+        assert normalized(indexed) == normalized(expected)
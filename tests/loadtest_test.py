@@ -0,0 +1,43 @@
+import asyncio
+
+import fakeredis
+import httpx
+
+from app.main import app
+from app.repository import get_repository
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+from benchmarks.loadtest import LatencyRecorder, format_report, parse_mix, run_load_test
+
+
+def test_latency_recorder_percentiles():
+    recorder = LatencyRecorder()
+    for millis in range(1, 101):
+        recorder.record(millis / 1000, ok=millis != 100)
+    summary = recorder.summary(elapsed=2.0)
+    assert (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]) == (50, 95, 99)
+    assert summary["errors"] == 1
+    assert summary["throughput"] == 50
+    assert sum(summary["histogram_ms"].values()) == 100
+
+
+def test_run_load_test_in_process():
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    app.dependency_overrides[get_repository] = lambda: repository
+
+    async def load():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await run_load_test(
+                client, parse_mix("get=3,list=1,write=1"), concurrency=4, requests=50, concepts=5
+            )
+
+    try:
+        report = asyncio.run(load())
+    finally:
+        app.dependency_overrides.clear()
+    assert report["total"]["requests"] == 50
+    assert report["total"]["errors"] == 0
+    assert set(report["operations"]) == {"get", "list", "write"}
+    assert "p99 ms" in format_report(report)
+    # the seeded concepts are removed again, auxiliary keys such as the change feed contain a ":"
+    assert [key for key in repository.client.keys() if b":" not in key] == []
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import fakeredis
+import redis
+
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.repository.caching_repository import CachingConceptDescriptionRepository
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+from app.repository.local_cache import CacheInvalidator, LocalCache
+
+
+def get_process(server):
+    backend = RedisConceptDescriptionRepository()
+    backend.client = fakeredis.FakeRedis(server=server)
+    repository = CachingConceptDescriptionRepository(backend, max_entries=10)
+    repository.start_invalidation(fakeredis.FakeRedis(server=server))
+    return repository
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_entries=2)
+    cache.put("a", "model", 1)
+    cache.put("b", "model", 2)
+    cache.get("a", "model")
+    cache.put("c", "model", 3)
+    assert (cache.get("a", "model"), cache.get("b", "model"), cache.get("c", "model")) == (1, None, 3)
+
+
+def test_epoch_gap_clears_the_caches():
+    invalidator = CacheInvalidator(fakeredis.FakeRedis())
+    cache = invalidator.register(LocalCache())
+    invalidator.synchronize(1)
+    for key in ["a", "b"]:
+        cache.put(key, "model", key)
+    invalidator.on_message({"data": b"2 a"})
+    assert (cache.get("a", "model"), cache.get("b", "model")) == (None, "b")
+    invalidator.on_message({"data": b"4 c"})
+    assert len(cache) == 0
+    assert invalidator.epoch == 4
+
+
+def test_writes_invalidate_other_processes():
+    server = fakeredis.FakeServer()
+    writer, reader = get_process(server), get_process(server)
+    try:
+        concept = ConceptDescription(id="urn:example:concept:1", idShort="first")
+        identifier = base_64_url_encode(concept.id)
+        asyncio.run(writer.add_concept_description(concept))
+        assert wait_for(lambda: reader.invalidator.epoch == 1)
+        assert asyncio.run(reader.get_concept_description(identifier)).idShort == "first"
+        assert reader.cache.get(identifier, "model") is not None
+
+        asyncio.run(writer.update_concept_description(identifier, concept.model_copy(update={"idShort": "second"})))
+        assert wait_for(lambda: reader.cache.get(identifier, "model") is None)
+        assert asyncio.run(reader.get_concept_description(identifier)).idShort == "second"
+    finally:
+        asyncio.run(writer.close_database_connection())
+        asyncio.run(reader.close_database_connection())
+
+
+def test_failed_subscription_is_resubscribed():
+    server = fakeredis.FakeServer()
+    writer, reader = get_process(server), get_process(server)
+    try:
+        invalidator = reader.invalidator
+        invalidator.retry_delay = 60
+        invalidator.on_error(redis.ConnectionError("connection lost"), invalidator.pubsub, invalidator.thread)
+        assert wait_for(lambda: not invalidator.active)
+        assert not invalidator.verify()
+
+        invalidator.retry_at = 0
+        assert invalidator.verify()
+        concept = ConceptDescription(id="urn:example:concept:1", idShort="first")
+        asyncio.run(writer.add_concept_description(concept))
+        assert wait_for(lambda: invalidator.epoch == 1)
+    finally:
+        asyncio.run(writer.close_database_connection())
+        asyncio.run(reader.close_database_connection())
+
+
+def test_failed_invalidation_does_not_fail_the_write():
+    server = fakeredis.FakeServer()
+    writer = get_process(server)
+    try:
+        broken = fakeredis.FakeServer()
+        broken.connected = False
+        writer.invalidator.client = fakeredis.FakeRedis(server=broken)
+        concept = ConceptDescription(id="urn:example:concept:1", idShort="first")
+        asyncio.run(writer.add_concept_description(concept))
+        assert asyncio.run(writer.get_concept_description(base_64_url_encode(concept.id))) == concept
+    finally:
+        asyncio.run(writer.close_database_connection())
@@ -0,0 +1,60 @@
+import asyncio
+
+import fakeredis
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.main import app
+from app.metrics import instrument_repository
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.repository import get_repository
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def get_instrumented_repository():
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    return instrument_repository(repository, "test")
+
+
+def test_instrument_repository_records_calls_and_errors():
+    repository = get_instrumented_repository()
+    labels = {"backend": "test", "method": "get_concept_description"}
+    before_ok = sample("repository_call_duration_seconds_count", outcome="ok", **labels)
+    before_error = sample("repository_call_duration_seconds_count", outcome="error", **labels)
+    concept = ConceptDescription(id="urn:example:concept:1")
+    asyncio.run(repository.add_concept_description(concept))
+    asyncio.run(repository.get_concept_description(base_64_url_encode(concept.id)))
+    try:
+        asyncio.run(repository.get_concept_description("bWlzc2luZw"))
+    except Exception:
+        pass
+    assert sample("repository_call_duration_seconds_count", outcome="ok", **labels) == before_ok + 1
+    assert sample("repository_call_duration_seconds_count", outcome="error", **labels) == before_error + 1
+
+
+def test_metrics_endpoint_reports_route_templates():
+    repository = get_instrumented_repository()
+    concept = ConceptDescription(id="urn:example:concept:1")
+    asyncio.run(repository.add_concept_description(concept))
+    route = "/concept-descriptions/{cdIdentifier}"
+    before = sample("http_requests_total", method="GET", route=route, status="200")
+    before_turtle = sample("serialization_duration_seconds_count", media_type="text/turtle")
+    app.dependency_overrides[get_repository] = lambda: repository
+    try:
+        client = TestClient(app)
+        client.get(f"/concept-descriptions/{base_64_url_encode(concept.id)}")
+        client.get(f"/concept-descriptions/{base_64_url_encode(concept.id)}", headers={"Accept": "text/turtle"})
+        response = client.get("/metrics")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert sample("http_requests_total", method="GET", route=route, status="200") == before + 2
+    assert sample("serialization_duration_seconds_count", media_type="text/turtle") == before_turtle + 1
+    assert 'route="/concept-descriptions/{cdIdentifier}"' in response.text
+    assert "http_requests_in_progress" in response.text
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import fakeredis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.rest.conceptdescription import concept_description_repository_rest
+from app.config import get_config
+from app.main import app
+from app.metrics import instrument_repository
+from app.profiler import SamplingProfiler, ServerTimingMiddleware
+from app.repository import get_repository
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+
+
+def busy_function(stopped: threading.Event):
+    while not stopped.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_collapses_stacks():
+    stopped = threading.Event()
+    worker = threading.Thread(target=busy_function, args=(stopped,))
+    worker.start()
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    time.sleep(0.1)
+    collapsed = profiler.stop()
+    stopped.set()
+    worker.join()
+
+    assert profiler.samples > 0
+    stacks = dict(line.rsplit(" ", 1) for line in collapsed.splitlines())
+    busy = [stack for stack in stacks if "busy_function (profiler_test.py:" in stack]
+    assert busy
+    assert busy[0].startswith("_bootstrap (threading.py:")
+    assert not any("SamplingProfiler" in stack or "_run (profiler.py:" in stack for stack in stacks)
+
+
+def test_profile_endpoint_requires_admin_token(monkeypatch):
+    client = TestClient(app, raise_server_exceptions=False)
+    monkeypatch.setattr(get_config(), "admin_token", None)
+    assert client.get("/admin/profile?seconds=0.01").json()["messages"][0]["code"] == "403"
+
+    monkeypatch.setattr(get_config(), "admin_token", "secret")
+    forbidden = client.get("/admin/profile?seconds=0.01", headers={"Authorization": "Bearer wrong"})
+    assert forbidden.json()["messages"][0]["code"] == "403"
+    response = client.get("/admin/profile?seconds=0.05", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert int(response.headers["x-profile-samples"]) > 0
+
+
+def test_server_timing_header():
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    instrument_repository(repository, "test")
+    timed_app = FastAPI()
+    timed_app.add_middleware(ServerTimingMiddleware)
+    timed_app.include_router(concept_description_repository_rest.router)
+    timed_app.dependency_overrides[get_repository] = lambda: repository
+    client = TestClient(timed_app)
+
+    created = client.post("/concept-descriptions", json={"id": "urn:example:concept:1"})
+    fetched = client.get("/concept-descriptions/dXJuOmV4YW1wbGU6Y29uY2VwdDox")
+    assert created.status_code == 201 and fetched.status_code == 200
+    for response in [created, fetched]:
+        metrics = dict(entry.split(";dur=") for entry in response.headers["server-timing"].split(", "))
+        assert set(metrics) == {"validation", "repository", "serialization", "total"}
+        assert float(metrics["repository"]) <= float(metrics["total"])
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import fakeredis
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.models.projection import parse_fields, project_document
+from app.repository import get_repository
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+from tests.model_test import get_testdata_json
+
+
+def get_maximal_document():
+    return json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+
+
+def test_parse_fields():
+    assert parse_fields("id, /idShort") == {"id": None, "idShort": None}
+    assert parse_fields("administration/version,administration") == {"administration": None}
+    assert parse_fields("administration,administration/version") == {"administration": None}
+    assert parse_fields("a~1b/c~0d") == {"a/b": {"c~d": None}}
+
+
+def test_project_document():
+    document = {
+        "id": "urn:example:concept:1",
+        "embeddedDataSpecifications": [
+            {"dataSpecification": {"type": "ExternalReference"}, "dataSpecificationContent": {"unit": "mm"}},
+            {"dataSpecificationContent": {"symbol": "l"}},
+        ],
+    }
+    projected = project_document(document, parse_fields("id,embeddedDataSpecifications/dataSpecificationContent/unit"))
+    assert projected == {
+        "id": "urn:example:concept:1",
+        "embeddedDataSpecifications": [{"dataSpecificationContent": {"unit": "mm"}}, {}],
+    }
+    projected = project_document(document, parse_fields("embeddedDataSpecifications/dataSpecificationContent/symbol"))
+    assert projected == {"embeddedDataSpecifications": [{}, {"dataSpecificationContent": {"symbol": "l"}}]}
+    assert project_document(document, parse_fields("id/nested,unknown")) == {}
+
+
+def test_get_concept_descriptions_with_fields():
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    document = get_maximal_document()
+    asyncio.run(repository.add_concept_description(ConceptDescription(**document)))
+    app.dependency_overrides[get_repository] = lambda: repository
+    try:
+        client = TestClient(app)
+        single = client.get(f"/concept-descriptions/{base_64_url_encode(document['id'])}?fields=id,idShort")
+        listing = client.get("/concept-descriptions?fields=id")
+    finally:
+        app.dependency_overrides.clear()
+    assert single.json() == {"id": document["id"], "idShort": document["idShort"]}
+    assert listing.json() == {"paging_metadata": {"cursor": ""}, "result": [{"id": document["id"]}]}
@@ -0,0 +1,27 @@
+import json
+
+import rdflib
+from rdflib.compare import isomorphic
+
+from app.models.concept_description import ConceptDescription
+from app.models.serializer import write_rdf
+from tests.model_test import get_testdata_json
+
+
+def test_write_rdf_matches_graph():
+    for test_type in ["minimal", "maximal"]:
+        payload = json.loads(get_testdata_json("ConceptDescription", test_type))["conceptDescriptions"][0]
+        concept = ConceptDescription(**payload)
+        expected, _ = concept.to_rdf(base_uri="https://aasbrain/")
+        for rdf_format in ["turtle", "nt"]:
+            written = write_rdf(concept, rdf_format, base_uri="https://aasbrain/")
+            assert isomorphic(rdflib.Graph().parse(data=written, format=rdf_format), expected)
+
+
+def test_write_rdf_is_deterministic():
+    payload = json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+    concept = ConceptDescription(**payload)
+    assert write_rdf(concept, "turtle") == write_rdf(concept, "turtle")
+    assert write_rdf(concept, "nt", base_uri="https://aasbrain/") == write_rdf(
+        concept, "nt", base_uri="https://aasbrain/"
+    )
@@ -0,0 +1,22 @@
+import rdflib
+
+from app.models.aas_namespace import AASNameSpace
+from app.models.data_specification_iec_61360 import DataSpecificationIec61360
+from app.models.property import Property
+from app.models.rdfiable import RDF_TYPES, from_typed_rdf
+from app.models.util import from_unknown_rdf
+
+
+def test_rdf_type_registry():
+    assert RDF_TYPES[AASNameSpace.AAS["Property"]] is Property
+    assert RDF_TYPES[AASNameSpace.AAS["DataSpecificationIec61360"]] is DataSpecificationIec61360
+
+
+def test_from_unknown_rdf():
+    prop = Property(idShort="MyProperty", valueType="xs:string", value="42")
+    graph, node = prop.to_rdf()
+    assert from_unknown_rdf(graph, node) == Property.from_rdf(graph, node)
+    # registered, but not a submodel element
+    assert from_typed_rdf(graph, node, DataSpecificationIec61360) is None
+    graph.set((node, rdflib.RDF.type, AASNameSpace.AAS["Unknown"]))
+    assert from_unknown_rdf(graph, node) is None
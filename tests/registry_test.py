@@ -0,0 +1,125 @@
+import asyncio
+from importlib.metadata import EntryPoint
+
+import fakeredis
+import pytest
+import redis
+
+from app.config import Config
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.repository import registry
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+from app.repository.registry import compose_repository, db_setting, load_backend, register_backend
+from app.repository.tiered_repository import TieredConceptDescriptionRepository
+
+
+class FakeRedisRepository(RedisConceptDescriptionRepository):
+    servers = {}
+
+    async def connect_to_database(self, db_setting: dict, history=False):
+        server = self.servers.setdefault(db_setting["DB_URI"], fakeredis.FakeServer())
+        self.client = fakeredis.FakeRedis(server=server)
+
+
+def get_config(**repositories):
+    return Config(repositories={name: settings for name, settings in repositories.items()})
+
+
+def test_load_backend():
+    assert load_backend("redis") is RedisConceptDescriptionRepository
+    with pytest.raises(ValueError, match="available backends: graphdb, redis"):
+        load_backend("neo4j")
+
+
+def test_load_backend_from_entry_point(monkeypatch):
+    entry_point = EntryPoint(
+        name="fake", value="tests.registry_test:FakeRedisRepository", group=registry.ENTRY_POINT_GROUP
+    )
+    monkeypatch.setattr(registry, "entry_points", lambda group: [entry_point] if group == entry_point.group else [])
+    assert "fake" in registry.available_backends()
+    assert load_backend("fake") is FakeRedisRepository
+
+
+def test_compose_single_repository():
+    config = Config(db_backend="redis", db_uri="redis://db:6379", repositories={})
+    assert type(compose_repository(config)) is RedisConceptDescriptionRepository
+    with pytest.raises(ValueError, match="exactly one primary"):
+        compose_repository(get_config(cache={"backend": "redis", "role": "cache"}))
+
+
+@pytest.mark.parametrize("db_uri", [None, "redis://primary"])
+def test_tiers_need_their_own_database(db_uri):
+    config = get_config(
+        primary={"backend": "redis", "db_uri": "redis://primary"},
+        cache={"backend": "redis", "db_uri": db_uri, "role": "cache"},
+    )
+    with pytest.raises(ValueError, match="cache with role cache needs a db_uri"):
+        compose_repository(config)
+
+
+def connect_redis_by_uri(monkeypatch):
+    servers = {}
+    monkeypatch.setattr(
+        redis.Redis,
+        "from_url",
+        lambda url, **kwargs: fakeredis.FakeRedis(server=servers.setdefault(url, fakeredis.FakeServer()), **kwargs),
+    )
+
+
+def test_tiered_repository(monkeypatch):
+    connect_redis_by_uri(monkeypatch)
+    config = get_config(
+        primary={"backend": "redis", "db_uri": "redis://primary"},
+        cache={"backend": "redis", "db_uri": "redis://cache", "role": "cache", "cache_ttl_seconds": 30},
+        search={"backend": "redis", "db_uri": "redis://search", "role": "mirror"},
+    )
+    repository = compose_repository(config)
+    assert isinstance(repository, TieredConceptDescriptionRepository)
+    _, primary = registry.primary_repository_settings(config)
+    asyncio.run(repository.connect_to_database(db_setting(primary, config)))
+    cache, search = repository.caches[0].repository, repository.mirrors[0].repository
+
+    concept = ConceptDescription(id="urn:example:concept:1", idShort="first")
+    identifier = base_64_url_encode(concept.id)
+    asyncio.run(repository.add_concept_description(concept))
+    assert asyncio.run(search.get_concept_description(identifier)) == concept
+    assert cache.client.get(identifier) is None
+
+    for version in range(5):
+        assert asyncio.run(repository.get_concept_description(identifier)).idShort == concept.idShort
+        assert 0 < cache.client.ttl(identifier) <= 30
+        concept = concept.model_copy(update={"idShort": f"v{version}"})
+        asyncio.run(repository.update_concept_description(identifier, concept))
+        assert cache.client.get(identifier) is None
+    assert asyncio.run(search.get_concept_description(identifier)) == concept
+    # the cache is a plain key value store without history or change feed
+    assert cache.client.keys() == []
+
+    asyncio.run(repository.delete_concept_description(identifier))
+    assert search.client.get(identifier) is None
+
+
+def test_failed_invalidation_bypasses_the_cache(monkeypatch):
+    connect_redis_by_uri(monkeypatch)
+    config = get_config(
+        primary={"backend": "redis", "db_uri": "redis://primary"},
+        cache={"backend": "redis", "db_uri": "redis://cache", "role": "cache"},
+    )
+    repository = compose_repository(config)
+    asyncio.run(repository.connect_to_database({"DB_URI": "redis://primary"}))
+    concept = ConceptDescription(id="urn:example:concept:1", idShort="first")
+    identifier = base_64_url_encode(concept.id)
+    asyncio.run(repository.add_concept_description(concept))
+    asyncio.run(repository.get_concept_description(identifier))
+
+    tier = repository.caches[0]
+    monkeypatch.setattr(tier.repository, "delete_concept_description", broken_delete)
+    changed = concept.model_copy(update={"idShort": "second"})
+    asyncio.run(repository.update_concept_description(identifier, changed))
+    assert tier.bypass_until > 0
+    assert asyncio.run(repository.get_concept_description(identifier)) == changed
+
+
+async def broken_delete(cd_id_base64url_encoded: str) -> bool:
+    raise ConnectionError("cache is down")
@@ -0,0 +1,125 @@
+import asyncio
+
+import fakeredis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.repository.caching_repository import CachingConceptDescriptionRepository
+from app.repository.replicated_repository import (
+    STICKY_COOKIE,
+    ReadRoutingMiddleware,
+    Replica,
+    ReplicatedConceptDescriptionRepository,
+)
+from tests.local_cache_test import wait_for
+from tests.registry_test import FakeRedisRepository
+
+
+class BrokenRepository(FakeRedisRepository):
+    async def get_concept_description(self, cd_id_base64url_encoded: str) -> ConceptDescription:
+        raise ConnectionError("replica is down")
+
+
+def get_repository(*replicas):
+    FakeRedisRepository.servers.clear()
+    repository = ReplicatedConceptDescriptionRepository(
+        FakeRedisRepository(), [Replica(f"fake://replica{i}", replica) for i, replica in enumerate(replicas)]
+    )
+    asyncio.run(repository.connect_to_database({"DB_URI": "fake://primary"}))
+    return repository
+
+
+def get_concepts():
+    return ConceptDescription(id="urn:example:concept:1", idShort="primary"), ConceptDescription(
+        id="urn:example:concept:1", idShort="replica"
+    )
+
+
+def test_reads_are_balanced_over_the_replicas():
+    repository = get_repository(FakeRedisRepository(), FakeRedisRepository())
+    on_primary, on_replica = get_concepts()
+    asyncio.run(repository.primary.add_concept_description(on_primary))
+    asyncio.run(repository.replicas[0].repository.add_concept_description(on_replica))
+    identifier = base_64_url_encode(on_primary.id)
+    # the second replica did not catch up yet, so the primary serves its reads
+    reads = [asyncio.run(repository.get_concept_description(identifier)).idShort for _ in range(4)]
+    assert reads == ["replica", "primary", "replica", "primary"]
+
+
+def test_failing_replica_is_skipped():
+    replica = BrokenRepository()
+    repository = get_repository(replica)
+    on_primary, _ = get_concepts()
+    asyncio.run(repository.add_concept_description(on_primary))
+    identifier = base_64_url_encode(on_primary.id)
+    assert asyncio.run(repository.get_concept_description(identifier)) == on_primary
+    assert repository._replica() is None
+    repository.replicas[0].down_until = 0
+    assert repository._replica() is repository.replicas[0]
+
+
+def test_pages_of_a_listing_are_read_from_the_same_database():
+    repository = get_repository(FakeRedisRepository(), FakeRedisRepository())
+    databases = [repository.primary] + [replica.repository for replica in repository.replicas]
+    for database, offset in zip(databases, [0, 100, 200]):
+        for idx in range(offset, offset + 12):
+            asyncio.run(database.add_concept_description(ConceptDescription(id=f"urn:example:concept:{idx}")))
+
+    for _ in range(2):
+        identifiers, cursor = [], None
+        while cursor != "":
+            page = asyncio.run(repository.get_concept_descriptions({}, cursor=cursor, limit=5))
+            identifiers.extend(int(concept.id.rpartition(":")[2]) for concept in page.result)
+            cursor = page.paging_metadata.cursor
+        assert len(set(identifiers)) == 12
+        assert max(identifiers) - min(identifiers) == 11
+    # a cursor without a database is one of the primary
+    page = asyncio.run(repository.get_concept_descriptions({}, cursor=base_64_url_encode("0"), limit=50))
+    assert sorted(int(concept.id.rpartition(":")[2]) for concept in page.result) == list(range(12))
+
+
+def test_clients_read_their_own_writes():
+    repository = get_repository(FakeRedisRepository())
+    on_primary, on_replica = get_concepts()
+    asyncio.run(repository.replicas[0].repository.add_concept_description(on_replica))
+    identifier = base_64_url_encode(on_primary.id)
+
+    app = FastAPI()
+    app.add_middleware(ReadRoutingMiddleware, sticky_seconds=5)
+
+    @app.post("/concepts")
+    async def write():
+        await repository.add_concept_description(on_primary)
+        return (await repository.get_concept_description(identifier)).idShort
+
+    @app.get("/concepts")
+    async def read():
+        return (await repository.get_concept_description(identifier)).idShort
+
+    writer, reader = TestClient(app), TestClient(app)
+    response = writer.post("/concepts")
+    assert response.json() == "primary"
+    assert f"{STICKY_COOKIE}=1; Max-Age=5" in response.headers["set-cookie"]
+    assert writer.get("/concepts").json() == "primary"
+    assert reader.get("/concepts").json() == "replica"
+
+
+def test_local_cache_is_filled_from_the_primary():
+    replica = FakeRedisRepository()
+    repository = get_repository(replica)
+    cached = CachingConceptDescriptionRepository(repository, max_entries=10)
+    cached.start_invalidation(fakeredis.FakeRedis())
+    assert wait_for(lambda: cached.invalidator.verify())
+    try:
+        on_primary, on_replica = get_concepts()
+        identifier = base_64_url_encode(on_primary.id)
+        asyncio.run(replica.add_concept_description(on_replica))
+        asyncio.run(cached.add_concept_description(on_primary))
+        # the replica lags behind, but the cache miss reads the primary and keeps its value
+        assert asyncio.run(repository.get_concept_description(identifier)).idShort == "replica"
+        assert asyncio.run(cached.get_concept_description(identifier)).idShort == "primary"
+        assert cached.cache.get(identifier, "model").idShort == "primary"
+    finally:
+        cached.invalidator.stop()
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import zipfile
+
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.repository.seed import iter_seed_documents, seed_repository
+from tests.change_feed_test import get_repository_with_feed
+from tests.graphdb_backend_test import InMemoryGraphDBRepository
+from tests.model_test import get_testdata_json
+from tests.xml_serializer_test import get_testdata_xml
+
+
+def sorted_lang_strings(document):
+    # lang strings have no order in RDF, all other lists keep theirs
+    if isinstance(document, dict):
+        return {key: sorted_lang_strings(value) for key, value in document.items()}
+    if isinstance(document, list):
+        items = [sorted_lang_strings(item) for item in document]
+        if all(isinstance(item, dict) and "language" in item for item in items):
+            return sorted(items, key=lambda item: (item["language"], item.get("text")))
+        return items
+    return document
+
+
+def get_maximal_document():
+    return json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+
+
+def test_iter_seed_documents(tmp_path):
+    maximal = get_maximal_document()
+    documents = [maximal, {"id": "urn:example:concept:1"}]
+    environment = {
+        "submodels": [{"id": "urn:example:submodel", "values": [1, 2.5, None]}],
+        "conceptDescriptions": documents,
+    }
+    (tmp_path / "array.json").write_text(json.dumps(documents))
+    (tmp_path / "environment.json").write_text(json.dumps(environment, indent=2))
+    (tmp_path / "concepts.jsonl").write_text("\n".join(json.dumps(document) for document in documents) + "\n")
+    (tmp_path / "environment.xml").write_bytes(get_testdata_xml("conceptDescription", "maximal"))
+    with zipfile.ZipFile(tmp_path / "package.aasx", "w") as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        package.writestr("_rels/.rels", "<Relationships/>")
+        package.writestr("aasx/environment.json", json.dumps(environment))
+        package.writestr("aasx/environment.xml", get_testdata_xml("conceptDescription", "maximal"))
+
+    for name in ["array.json", "environment.json", "concepts.jsonl"]:
+        assert list(iter_seed_documents(str(tmp_path / name))) == documents
+    assert list(iter_seed_documents(str(tmp_path / "environment.xml"))) == [maximal]
+    assert list(iter_seed_documents(str(tmp_path / "package.aasx"))) == documents + [maximal]
+
+
+def test_seed_repository_adds_missing_concepts_once(tmp_path):
+    repository = get_repository_with_feed()
+    existing = ConceptDescription(id="urn:example:concept:1", idShort="existing")
+    asyncio.run(repository.add_concept_description(existing))
+    seed_file = tmp_path / "seed.json"
+    seed_file.write_text(
+        json.dumps([{"id": "urn:example:concept:1"}, {"id": "urn:example:concept:2"}, {"idShort": "invalid"}])
+    )
+
+    assert asyncio.run(seed_repository(repository, str(seed_file), batch_size=1)) == 1
+    assert asyncio.run(repository.get_concept_description(base_64_url_encode(existing.id))) == existing
+    added = base_64_url_encode("urn:example:concept:2")
+    assert asyncio.run(repository.get_concept_description(added)).id == "urn:example:concept:2"
+    assert [event.id for event in repository.get_change_feed().read()][-1] == added
+    assert [record["version"] for record in repository.history.versions(added, 0, 10)[0]] == [0]
+
+    # the seed version is recorded, so restarts skip the file
+    events = len(repository.get_change_feed().read())
+    assert asyncio.run(repository.get_seed_version()).startswith("sha256:")
+    assert asyncio.run(seed_repository(repository, str(seed_file))) == 0
+    assert asyncio.run(seed_repository(repository, str(seed_file), version="v1")) == 0
+    seed_file.write_text("not json")
+    assert asyncio.run(seed_repository(repository, str(seed_file), version="v1")) == 0
+    assert len(repository.get_change_feed().read()) == events
+
+
+def test_graphdb_adds_a_batch_in_one_update():
+    repository = InMemoryGraphDBRepository()
+    asyncio.run(repository.add_concept_description(ConceptDescription(id="urn:example:concept:1")))
+    batch = [ConceptDescription(id="urn:example:concept:1"), ConceptDescription(**get_maximal_document())]
+    assert asyncio.run(repository.add_concept_descriptions(batch)) == [base_64_url_encode(batch[1].id)]
+    assert len(repository.updates) == 2
+    stored = asyncio.run(repository.get_concept_description(base_64_url_encode(batch[1].id)))
+    assert sorted_lang_strings(stored.model_dump(mode="json", exclude_none=True)) == sorted_lang_strings(
+        batch[1].model_dump(mode="json", exclude_none=True)
+    )
+
+    asyncio.run(repository.set_seed_version("v1"))
+    asyncio.run(repository.set_seed_version("v2"))
+    assert asyncio.run(repository.get_seed_version()) == "v2"
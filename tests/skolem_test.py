@@ -0,0 +1,44 @@
+import json
+
+import rdflib
+
+from app.models.concept_description import ConceptDescription
+from app.models.skolem import skolemize
+from tests.model_test import get_testdata_json
+
+
+def get_concept():
+    return ConceptDescription(
+        **json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+    )
+
+
+def test_skolem_id_strategy_is_deterministic():
+    concept = get_concept()
+    graph, node = concept.to_rdf(base_uri="https://x/", id_strategy="skolem")
+    again, _ = concept.to_rdf(base_uri="https://x/", id_strategy="skolem")
+    assert set(graph) == set(again)
+    assert not any(isinstance(term, rdflib.BNode) for triple in graph for term in triple)
+    assert all(str(subject).startswith(str(node)) for subject in graph.subjects())
+    assert len(graph) == len(concept.to_rdf(base_uri="https://x/", id_strategy="base64-url-encode")[0])
+
+
+def test_skolem_id_strategy_round_trip():
+    concept = get_concept()
+    graph, node = concept.to_rdf(base_uri="https://x/", id_strategy="skolem")
+    decoded = ConceptDescription.from_rdf(graph, node)
+    assert decoded.id == concept.id
+    assert len(decoded.embeddedDataSpecifications) == len(concept.embeddedDataSpecifications)
+    assert sorted(ls.text for ls in decoded.displayName) == sorted(ls.text for ls in concept.displayName)
+
+
+def test_skolemize_names_list_members_by_index():
+    root = rdflib.URIRef("https://x/root")
+    predicate = rdflib.URIRef("https://admin-shell.io/aas/3/0/Reference/keys")
+    graph = rdflib.Graph()
+    for idx in range(2):
+        key = rdflib.BNode()
+        graph.add((root, predicate, key))
+        graph.add((key, rdflib.URIRef("https://admin-shell.io/aas/3/0/index"), rdflib.Literal(idx)))
+    subjects = set(skolemize(graph, root).subjects())
+    assert subjects == {root, rdflib.URIRef("https://x/root/keys/0"), rdflib.URIRef("https://x/root/keys/1")}
@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from app.api.lazy import LazyApp
+
+
+def test_app_import_skips_lazily_loaded_modules():
+    lazy = ["ariadne", "requests", "app.models.submodel", "app.models.asset_administraion_shell", "pyshacl"]
+    code = f"import sys\nimport app.main\nprint(','.join(module for module in {lazy!r} if module in sys.modules))"
+    loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+    assert loaded == ""
+
+
+def test_lazy_app_imports_on_first_request():
+    lazy = LazyApp("app.api.graphql.concept_description_repository_graphql:router")
+    assert lazy.app is None
+    response = TestClient(lazy).post("/", json={"query": "{__typename}"})
+    assert response.json() == {"data": {"__typename": "Query"}}
+    assert lazy.app is not None
@@ -0,0 +1,75 @@
+import asyncio
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app import tracing
+from app.api.rest.content_negotiation import serialize_rdf
+from app.main import exception_handler
+from app.models import base_64_url_encode
+from app.models.concept_description import ConceptDescription
+from app.models.response import ConceptNotFoundException
+from app.repository.impl.redis_cd_repository import RedisConceptDescriptionRepository
+from app.tracing import TracingMiddleware, configure_tracing, trace_repository
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "_tracer", provider.get_tracer(tracing.TRACER_NAME))
+    return exporter
+
+
+def test_configure_tracing_without_exporter():
+    assert not configure_tracing("none", "test", "traces.jsonl")
+    with pytest.raises(ValueError):
+        configure_tracing("zipkin", "test", "traces.jsonl")
+    assert not tracing.tracing_enabled()
+
+
+def test_trace_repository_and_serialization(spans):
+    repository = RedisConceptDescriptionRepository()
+    repository.client = fakeredis.FakeRedis()
+    trace_repository(repository, "redis")
+    concept = ConceptDescription(id="urn:example:concept:1")
+    asyncio.run(repository.add_concept_description(concept))
+    with tracing.span("request") as request_span:
+        fetched = asyncio.run(repository.get_concept_description(base_64_url_encode(concept.id)))
+        serialize_rdf(fetched, "application/ld+json")
+
+    finished = {span.name: span for span in spans.get_finished_spans()}
+    assert {"repository.add_concept_description", "repository.get_concept_description", "to_rdf"} <= set(finished)
+    assert finished["repository.get_concept_description"].attributes["db.system"] == "redis"
+    assert finished["serialize"].parent.span_id == request_span.get_span_context().span_id
+    assert finished["to_rdf"].parent.span_id == finished["serialize"].context.span_id
+
+
+def test_error_response_carries_trace_id(spans):
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+    app.add_exception_handler(Exception, exception_handler)
+
+    @app.get("/concepts/{cdIdentifier}")
+    async def get_concept(cdIdentifier: str):
+        raise ConceptNotFoundException()
+
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    response = TestClient(app, raise_server_exceptions=False).get(
+        "/concepts/abc", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"}
+    )
+    assert response.json()["messages"][0]["correlationId"] == trace_id
+    (server_span,) = spans.get_finished_spans()
+    assert server_span.name == "GET /concepts/{cdIdentifier}"
+    # the error response is sent by the exception handler outside of the middleware
+    assert not server_span.status.is_ok
+    assert server_span.events[0].name == "exception"
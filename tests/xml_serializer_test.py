@@ -0,0 +1,83 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.concept_description import ConceptDescription
+from app.models.xml_serializer import (
+    AAS_XML_NAMESPACE,
+    concept_description_from_xml,
+    concept_description_to_xml,
+    stream_concept_descriptions_as_xml,
+)
+from app.repository import get_repository
+from tests.model_test import get_testdata_json
+
+
+def get_testdata_xml(element: str, type="minimal"):
+    with open(
+        os.path.join(
+            os.path.dirname(__file__), "schemas", "schemas", "xml", "examples", "generated", element, f"{type}.xml"
+        ),
+        "rb",
+    ) as f:
+        return f.read()
+
+
+class RecordingRepository:
+    def __init__(self):
+        self.added = []
+
+    async def add_concept_description(self, concept_description: ConceptDescription) -> ConceptDescription:
+        self.added.append(concept_description)
+        return concept_description
+
+
+def test_concept_description_from_xml_examples():
+    for test_type in ["minimal", "maximal"]:
+        environment = ET.fromstring(get_testdata_xml("conceptDescription", test_type))
+        element = environment.find(f".//{{{AAS_XML_NAMESPACE}}}conceptDescription")
+        concept = concept_description_from_xml(ET.tostring(element))
+        expected = json.loads(get_testdata_json("ConceptDescription", test_type))["conceptDescriptions"][0]
+        assert json.loads(concept.model_dump_json(exclude_none=True)) == expected
+
+
+def test_concept_description_xml_round_trip():
+    payload_json = json.loads(get_testdata_json("ConceptDescription", "maximal"))["conceptDescriptions"][0]
+    payload = ConceptDescription(**payload_json)
+    assert concept_description_from_xml(concept_description_to_xml(payload)) == payload
+
+
+def test_stream_concept_descriptions_as_xml():
+    concepts = [ConceptDescription(id="urn:example:concept:1"), ConceptDescription(id="urn:example:concept:<2>")]
+    chunks = list(stream_concept_descriptions_as_xml(concepts))
+    assert len(chunks) == len(concepts) + 2
+    environment = ET.fromstring(b"".join(chunks))
+    identifiers = [element.text for element in environment.iter(f"{{{AAS_XML_NAMESPACE}}}id")]
+    assert identifiers == [concept.id for concept in concepts]
+
+
+def test_post_concept_description_as_xml():
+    repository = RecordingRepository()
+    app.dependency_overrides[get_repository] = lambda: repository
+    try:
+        response = TestClient(app).post(
+            "/concept-descriptions",
+            content=concept_description_to_xml(ConceptDescription(id="urn:example:concept:1", idShort="Concept")),
+            headers={"Content-Type": "application/xml"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 201
+    assert repository.added == [ConceptDescription(id="urn:example:concept:1", idShort="Concept")]
+
+
+def test_concept_description_xml_keeps_text_whitespace():
+    payload = ConceptDescription(
+        id="urn:example:concept:1",
+        description=[{"language": "en", "text": "  indented\n text "}],
+    )
+    data = concept_description_to_xml(payload).replace(b"<language>en</language>", b"<language>\n  en\n</language>")
+    assert concept_description_from_xml(data) == payload